@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+RepoHunter - Pipeline Benchmark
+End-to-end timing of search and install against a local stub server.
+
+Usage:
+    python benchmarks/bench_pipeline.py                           # default matrix
+    python benchmarks/bench_pipeline.py --pools 5,15 --concurrency 1,4,8 --out report.json
+    python benchmarks/bench_pipeline.py --modes two-call,fused   # compare the two pipelines
+    python benchmarks/bench_pipeline.py --deep 1000               # page deep into the main search
+    python benchmarks/bench_pipeline.py --baseline old.json        # diff against a previous report
+    python benchmarks/bench_pipeline.py --record https://api.github.com   # record GitHub fixtures
+    
+GitHub and the LLM are served by benchmarks/stub_server.py with simulated
+latency, so results are repeatable offline. Every run uses fresh cache,
+index and vector directories. The report holds per-stage p50/p95 for cold
+and warm interactive searches in each pipeline mode, install latency,
+memory allocations, requests per query and batch throughput at each
+concurrency level.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from stub_server import StubServer  # noqa: E402  (benchmarks/ is on sys.path)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def summarize(values: list[float]) -> dict:
+    """p50/p95/mean of a list of milliseconds."""
+    from modules.metrics import percentile
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "mean": 0.0}
+    return {
+        "p50": round(percentile(values, 50), 1),
+        "p95": round(percentile(values, 95), 1),
+        "mean": round(sum(values) / len(values), 1)
+    }
+
+
+def per_query(counts: dict, queries: int) -> dict:
+    """Average request counts per query."""
+    return {endpoint: round(count / max(queries, 1), 2) for endpoint, count in sorted(counts.items())}
+
+
+def run_interactive(hunter, stub, queries: list[str]) -> dict:
+    """Run search + install for every query, once cold and once warm."""
+    from modules import cache
+    
+    result = {}
+    for phase in ("cold", "warm"):
+        if phase == "cold":
+            cache.clear_all()
+        stub.reset_counts()
+        stages: dict[str, list[float]] = {}
+        for query in queries:
+            with contextlib.redirect_stdout(io.StringIO()):
+                hunter.search(query)
+                if hunter.last_ranked:
+                    hunter.install(1)
+            for stage, ms in hunter.last_timings.items():
+                stages.setdefault(stage, []).append(ms)
+        result[phase] = {
+            "stages": {stage: summarize(times) for stage, times in sorted(stages.items())},
+            "requests_per_query": per_query(stub.reset_counts(), len(queries))
+        }
+    
+    # Allocations in a separate cold pass - tracemalloc slows everything down
+    cache.clear_all()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for query in queries:
+            hunter.search(query)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result["memory"] = {
+        "peak_kb": round((peak - before) / 1024, 1),
+        "retained_kb": round((current - before) / 1024, 1)
+    }
+    stub.reset_counts()
+    return result
+
+
+def run_concurrent(hunter, stub, queries: list[str], concurrency: int) -> dict:
+    """Run the headless pipeline over all queries with a worker pool (cold caches)."""
+    from modules import cache
+    
+    cache.clear_all()
+    stub.reset_counts()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        records = list(pool.map(hunter.hunt, queries))
+    wall = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "wall_s": round(wall, 2),
+        "queries_per_s": round(len(queries) / wall, 2) if wall else 0.0,
+        "errors": sum(1 for record in records if "error" in record),
+        "total": summarize([record["timings"]["total"] for record in records]),
+        "requests_per_query": per_query(stub.reset_counts(), len(queries))
+    }
+
+
+def flatten(value, prefix: str = "") -> dict:
+    """Flatten a report into {"path.to.number": number}."""
+    flat = {}
+    if isinstance(value, dict):
+        for key, item in value.items():
+            flat.update(flatten(item, f"{prefix}.{key}" if prefix else str(key)))
+    elif isinstance(value, list):
+        for item in value:
+            key = "/".join(
+                str(item[name]) for name in ("pool", "mode", "concurrency") if name in item
+            ) if isinstance(item, dict) else None
+            flat.update(flatten(item, f"{prefix}[{key}]"))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        flat[prefix] = value
+    return flat
+
+
+def compare(report: dict, baseline: dict, threshold: float = 0.1):
+    """Print metrics that moved more than ``threshold`` relative to a baseline report."""
+    current, previous = flatten(report["results"]), flatten(baseline.get("results", {}))
+    print(f"\nChanges vs baseline (>{threshold:.0%}):")
+    changed = 0
+    for key in sorted(current.keys() & previous.keys()):
+        old, new = previous[key], current[key]
+        if old and abs(new - old) / abs(old) > threshold:
+            changed += 1
+            print(f"  {key:<60} {old:>10} -> {new:<10} ({(new - old) / abs(old):+.0%})")
+    if not changed:
+        print("  none")
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end RepoHunter pipeline benchmark")
+    parser.add_argument("--queries", default=os.path.join(FIXTURES, "queries.txt"),
+                        help="text file with one query per line")
+    parser.add_argument("--pools", default="5,15", help="search results per sub-query (default: 5,15)")
+    parser.add_argument("--concurrency", default="1,4,8", help="batch worker counts (default: 1,4,8)")
+    parser.add_argument("--modes", default="two-call",
+                        help="interactive pipelines to time: two-call, fused (default: two-call)")
+    parser.add_argument("--github-latency-ms", type=float, default=80, help="simulated GitHub latency")
+    parser.add_argument("--llm-latency-ms", type=float, default=300, help="simulated time to first token")
+    parser.add_argument("--llm-tps", type=float, default=250, help="simulated tokens per second")
+    parser.add_argument("--llm-replay", help="replay JSONL of recorded completions")
+    parser.add_argument("--deep", type=int, default=0,
+                        help="deep scan depth (REPOHUNTER_DEEP_SEARCH); the stub then serves 1500 paged results")
+    parser.add_argument("--tokens", type=int, default=16, help="fake GitHub tokens in the pool")
+    parser.add_argument("--record", metavar="API_URL", help="record missing GitHub fixtures from this API")
+    parser.add_argument("--out", default="benchmark-report.json", help="JSON report path")
+    parser.add_argument("--baseline", help="previous report to compare against")
+    args = parser.parse_args()
+    
+    stub = StubServer(
+        fixtures_dir=FIXTURES,
+        pool_size=15,
+        search_depth=1500 if args.deep else 0,
+        github_latency_ms=args.github_latency_ms,
+        llm_latency_ms=args.llm_latency_ms,
+        llm_tokens_per_second=args.llm_tps,
+        llm_replay=args.llm_replay,
+        record_upstream=args.record,
+        record_token=os.getenv("GITHUB_TOKEN", "")
+    ).start()
+    
+    scratch = tempfile.TemporaryDirectory(prefix="repohunter-bench-")
+    # Configuration is read at import time, so it must be in place first
+    os.environ.update({
+        "REPOHUNTER_GITHUB_API_URL": stub.url,
+        "REPOHUNTER_LLM_BACKEND": "openai",
+        "REPOHUNTER_LLM_BASE_URL": stub.url,
+        "REPOHUNTER_LLM_RECORD": "0",
+        "GITHUB_TOKEN": "",
+        "GITHUB_TOKENS": ",".join(f"bench-{i}" for i in range(max(1, args.tokens))),
+        "REPOHUNTER_CACHE_DIR": os.path.join(scratch.name, "cache"),
+        "REPOHUNTER_INDEX": "0",
+        "REPOHUNTER_VECTORS": "0",
+        "REPOHUNTER_DEEP_SEARCH": str(args.deep)
+    })
+    
+    from modules import __version__
+    from modules.batch import read_queries
+    from modules.config import config
+    from repohunter import RepoHunter
+    
+    queries = read_queries(args.queries)
+    hunter = RepoHunter()
+    results = {"interactive": [], "concurrency": []}
+    
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip() in RepoHunter.PIPELINES]
+    for pool in [int(size) for size in args.pools.split(",") if size.strip()]:
+        stub.pool_size = pool
+        for mode in modes or ["two-call"]:
+            hunter.pipeline = mode
+            print(f"pool {pool:>3} {mode:<8}: interactive search + install over {len(queries)} queries...")
+            results["interactive"].append({"pool": pool, "mode": mode, **run_interactive(hunter, stub, queries)})
+    
+    hunter.pipeline = "two-call"
+    stub.pool_size = 15
+    for workers in [int(level) for level in args.concurrency.split(",") if level.strip()]:
+        print(f"concurrency {workers:>2}: batch over {len(queries)} queries...")
+        results["concurrency"].append(run_concurrent(hunter, stub, queries, workers))
+    
+    hunter.prefetcher.shutdown()
+    stub.stop()
+    scratch.cleanup()
+    
+    report = {
+        "version": __version__,
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "settings": {
+            "queries": len(queries),
+            "github_latency_ms": args.github_latency_ms,
+            "llm_latency_ms": args.llm_latency_ms,
+            "llm_tokens_per_second": args.llm_tps,
+            "search_fanout": config.search_fanout,
+            "deep_search": config.deep_search,
+            "rank_top_k": config.rank_top_k,
+            "models": config.models
+        },
+        "results": results
+    }
+    with open(args.out, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    
+    for entry in results["interactive"]:
+        cold, warm = entry["cold"]["stages"], entry["warm"]["stages"]
+        print(f"\npool {entry['pool']} {entry['mode']}: cold total p50 {cold['total']['p50']} ms, "
+              f"first result {cold.get('first_result', {}).get('p50', 0)} ms, "
+              f"install {cold.get('install', {}).get('p50', 0)} ms; "
+              f"warm total p50 {warm['total']['p50']} ms; peak {entry['memory']['peak_kb']} KB")
+        print(f"  requests/query (cold): {entry['cold']['requests_per_query']}")
+    for entry in results["concurrency"]:
+        print(f"concurrency {entry['concurrency']}: {entry['queries_per_s']} queries/s, "
+              f"p50 {entry['total']['p50']} ms, p95 {entry['total']['p95']} ms, errors {entry['errors']}")
+    print(f"\nReport written to {args.out}")
+    
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            compare(report, json.load(handle))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+RepoHunter - Startup Benchmark
+Wall time of short CLI invocations plus a `python -X importtime` breakdown.
+
+Usage:
+    python benchmarks/bench_startup.py                        # default runs
+    python benchmarks/bench_startup.py --runs 30 --top 25 --out startup.json
+    python benchmarks/bench_startup.py --baseline old.json      # diff against a previous report
+    python benchmarks/bench_startup.py --max-ms 250 --check     # fail on regressions (CI)
+    
+Each scenario runs in a fresh interpreter, the way scripts call the CLI:
+`--version`, `--help`, and the REPL started and left with `exit` (mock
+LLM backend, scratch cache and index directories). Bytecode is compiled
+by an untimed first run. The import report lists the slowest imports of
+`--version` and any heavy library it loads eagerly - those belong behind
+modules/lazy.py.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_pipeline import compare, git_revision, summarize  # noqa: E402  (benchmarks/ is on sys.path)
+
+ENTRY = os.path.join(ROOT, "repohunter.py")
+
+SCENARIOS = {
+    "version": (["--version"], None),
+    "help": (["--help"], None),
+    "repl_exit": ([], "exit\n"),
+}
+
+# Libraries that a --version run must not import (they load on first use)
+HEAVY = ("requests", "httpx", "numpy", "groq", "asyncio", "http.server")
+
+
+def child_env(scratch: str) -> dict:
+    """Environment for the timed runs: offline, isolated, bytecode cached."""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env.update({
+        "REPOHUNTER_LLM_BACKEND": "mock",
+        "REPOHUNTER_CACHE_DIR": os.path.join(scratch, "cache"),
+        "REPOHUNTER_INDEX_PATH": os.path.join(scratch, "index.sqlite3"),
+        "REPOHUNTER_VECTOR_DIR": os.path.join(scratch, "vectors"),
+        "REPOHUNTER_METRICS_PORT": "0",
+        "REPOHUNTER_TRACE_FILE": "",
+    })
+    return env
+
+
+def time_run(command: list[str], stdin: str, env: dict) -> float:
+    """Run a command once and return its wall time in milliseconds."""
+    started = time.perf_counter()
+    subprocess.run(
+        command, input=stdin, text=True, env=env, cwd=ROOT,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60
+    )
+    return (time.perf_counter() - started) * 1000
+
+
+def import_times(args: list[str], env: dict) -> list[dict]:
+    """
+    Run the CLI under ``python -X importtime`` and parse the report.
+    
+    Returns:
+        One record per imported module: name, depth, self_ms, cumulative_ms
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", ENTRY, *args], env=env, cwd=ROOT,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=60
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append({
+            "name": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": round(int(self_us) / 1000, 2),
+            "cumulative_ms": round(int(cumulative_us) / 1000, 2)
+        })
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RepoHunter CLI startup benchmark")
+    parser.add_argument("--runs", type=int, default=15, help="timed runs per scenario (default: 15)")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list (default: 15)")
+    parser.add_argument("--out", default="startup-report.json", help="JSON report path")
+    parser.add_argument("--baseline", help="previous report to compare against")
+    parser.add_argument("--max-ms", type=float, help="p50 budget for the version scenario")
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 if the budget is exceeded or a heavy library is imported eagerly")
+    args = parser.parse_args()
+    
+    scratch = tempfile.TemporaryDirectory(prefix="repohunter-startup-")
+    env = child_env(scratch.name)
+    
+    results = {"wall_ms": {}}
+    for name, (cli_args, stdin) in SCENARIOS.items():
+        command = [sys.executable, ENTRY, *cli_args]
+        time_run(command, stdin, env)  # compiles bytecode, warms the OS file cache
+        results["wall_ms"][name] = summarize([time_run(command, stdin, env) for _ in range(args.runs)])
+        print(f"{name:<10} p50 {results['wall_ms'][name]['p50']:>7} ms  p95 {results['wall_ms'][name]['p95']:>7} ms")
+    
+    # A bare interpreter, for reference
+    interpreter = [sys.executable, "-c", "pass"]
+    results["wall_ms"]["interpreter"] = summarize([time_run(interpreter, None, env) for _ in range(args.runs)])
+    print(f"{'python':<10} p50 {results['wall_ms']['interpreter']['p50']:>7} ms  (bare interpreter)")
+    
+    modules = import_times(["--version"], env)
+    ours = [module for module in modules if module["name"].split(".")[0] == "modules"]
+    eager = sorted({module["name"] for module in modules if module["name"] in HEAVY})
+    results["imports"] = {
+        "modules": len(modules),
+        "total_ms": round(sum(module["self_ms"] for module in modules), 1),
+        "repohunter_ms": round(sum(module["self_ms"] for module in ours), 1)
+    }
+    slowest = sorted(modules, key=lambda module: module["cumulative_ms"], reverse=True)[:args.top]
+    scratch.cleanup()
+    
+    from modules import __version__
+    report = {
+        "version": __version__,
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "settings": {"runs": args.runs, "scenarios": {name: spec[0] for name, spec in SCENARIOS.items()}},
+        "results": results,
+        "slowest_imports": slowest,
+        "eager_heavy_imports": eager
+    }
+    with open(args.out, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    
+    print(f"\n--version imports {results['imports']['modules']} modules in "
+          f"{results['imports']['total_ms']} ms ({results['imports']['repohunter_ms']} ms in RepoHunter's own)")
+    print(f"{'cumulative':>11} {'self':>8}  module")
+    for module in slowest:
+        print(f"{module['cumulative_ms']:>8.1f} ms {module['self_ms']:>5.1f} ms  "
+              f"{'  ' * module['depth']}{module['name']}")
+    print(f"\nHeavy libraries imported eagerly: {', '.join(eager) or 'none'}")
+    print(f"Report written to {args.out}")
+    
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            compare(report, json.load(handle))
+    
+    if args.check:
+        over = args.max_ms is not None and results["wall_ms"]["version"]["p50"] > args.max_ms
+        if over:
+            print(f"FAIL: --version p50 {results['wall_ms']['version']['p50']} ms > {args.max_ms} ms")
+        if eager:
+            print(f"FAIL: eager imports of {', '.join(eager)}")
+        if over or eager:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+RepoHunter - Vector Index Benchmark
+Query latency of the semantic index versus index size.
+
+Usage:
+    python benchmarks/bench_vectors.py                     # 10k, 100k, 1M vectors
+    python benchmarks/bench_vectors.py --sizes 10000,50000 --queries 200
+    
+Synthetic vectors (same sparsity as encoded READMEs) are written straight
+into a temporary store, so the numbers measure search only. Needs NumPy
+and about 256 MB of free disk per million vectors at 256 dimensions.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.metrics import percentile
+from modules.vectors import VectorIndex, np
+
+SAMPLE_QUERIES = [
+    "osint for telegram without api",
+    "web vulnerability scanner",
+    "red team c2 framework",
+    "memory forensics volatility plugin",
+    "android malware analysis sandbox",
+    "kubernetes security audit",
+]
+
+SAMPLE_DOCUMENT = (
+    "sherlock-project/sherlock Hunt down social media accounts by username across "
+    "social networks osint reconnaissance python cli information-gathering"
+)
+
+
+def fill(index: VectorIndex, size: int, nonzero: int, batch: int = 100_000):
+    """Append random sparse unit vectors until the index holds ``size`` rows."""
+    rng = np.random.default_rng(42)
+    while len(index) < size:
+        count = min(batch, size - len(index))
+        vectors = np.zeros((count, index.dim), dtype=np.float32)
+        columns = rng.integers(0, index.dim, size=(count, nonzero))
+        np.put_along_axis(vectors, columns, rng.standard_normal((count, nonzero)), axis=1)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        start = len(index)
+        index.add_vectors([f"bench/repo{row}" for row in range(start, start + count)], vectors)
+
+
+def run(sizes: list[int], queries: int, directory: str) -> list[dict]:
+    """Measure encoding throughput once and query latency at each size."""
+    index = VectorIndex(path=directory)
+    nonzero = int((index.encode(SAMPLE_DOCUMENT) != 0).sum())
+    
+    started = time.perf_counter()
+    for _ in range(200):
+        index.encode(SAMPLE_DOCUMENT)
+    encode_ms = (time.perf_counter() - started) * 1000 / 200
+    print(f"encode: {encode_ms:.3f} ms/document, {nonzero} non-zero buckets of {index.dim}")
+    
+    report = []
+    for size in sorted(sizes):
+        fill(index, size, nonzero)
+        index.search(SAMPLE_QUERIES[0])  # Warm the page cache
+        latencies = []
+        for i in range(queries):
+            started = time.perf_counter()
+            index.search(SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)], k=20)
+            latencies.append((time.perf_counter() - started) * 1000)
+        row = {
+            "vectors": size,
+            "mb": round(index.stats()["bytes"] / 1024 / 1024, 1),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "encode_ms": round(encode_ms, 3)
+        }
+        report.append(row)
+        print(f"{size:>10,} vectors  {row['mb']:>8.1f} MB  p50 {row['p50_ms']:>8.2f} ms  "
+              f"p95 {row['p95_ms']:>8.2f} ms")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Semantic index latency vs size")
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="comma-separated index sizes (default: 10000,100000,1000000)")
+    parser.add_argument("--queries", type=int, default=100, help="queries per size (default: 100)")
+    parser.add_argument("--dir", default=None, help="scratch directory (default: a temp dir)")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this file")
+    args = parser.parse_args()
+    
+    if np is None:
+        sys.exit("NumPy is required: pip install numpy")
+    
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    with tempfile.TemporaryDirectory(dir=args.dir, prefix="repohunter-vectors-") as directory:
+        report = run(sizes, args.queries, directory)
+    
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
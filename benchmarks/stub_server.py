@@ -0,0 +1,400 @@
+"""
+RepoHunter - Benchmark Stub Server
+Local stand-in for the GitHub REST/GraphQL API and an OpenAI-compatible LLM.
+
+Responses come from recorded fixtures when available and are otherwise
+generated deterministically, so benchmark runs are repeatable offline:
+
+- GitHub requests are looked up in ``<fixtures>/github/<key>.json``; with
+  ``record_upstream`` set, misses are forwarded to the real API and saved.
+- Chat completions are looked up in a replay file written with
+  ``REPOHUNTER_LLM_RECORD=1``; misses get the mock backend's answer.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import random
+import re
+import socket
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import requests
+
+LANGUAGES = ["Python", "Go", "Rust", "JavaScript", "C", "TypeScript"]
+TOPICS = ["osint", "red-team", "forensics", "network-security", "web-security", "malware-analysis"]
+WORDS = ["scanner", "framework", "recon", "exploit", "fuzzer", "proxy", "crawler", "parser",
+         "sandbox", "monitor", "toolkit", "agent", "collector", "analyzer", "bruteforce"]
+
+# Size of the synthetic repository universe queries draw from
+UNIVERSE = 2000
+
+# Rate limits reported per token: (requests, window seconds)
+RATE_LIMITS = {"search": (30, 60), "core": (5000, 3600), "graphql": (5000, 3600)}
+
+
+def synthetic_repo(index: int) -> dict:
+    """Deterministic GitHub search item number ``index``."""
+    rng = random.Random(index)
+    words = rng.sample(WORDS, 3)
+    stars = int(10 ** rng.uniform(0, 4.5))
+    return {
+        "full_name": f"stub-{index % 97}/{words[0]}-{words[1]}-{index}",
+        "name": f"{words[0]}-{words[1]}-{index}",
+        "owner": {"login": f"stub-{index % 97}"},
+        "description": f"A {words[0]} {words[1]} {words[2]} for {rng.choice(TOPICS)} work",
+        "html_url": f"https://github.com/stub-{index % 97}/{words[0]}-{words[1]}-{index}",
+        "language": rng.choice(LANGUAGES),
+        "topics": rng.sample(TOPICS, 2),
+        "stargazers_count": stars,
+        "forks_count": stars // rng.randint(3, 12),
+        "open_issues_count": rng.randint(0, 200),
+        "archived": rng.random() < 0.05,
+        "fork": rng.random() < 0.05,
+        "license": {"spdx_id": rng.choice(["MIT", "GPL-3.0", "Apache-2.0"])},
+        "pushed_at": f"202{rng.randint(3, 6)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T00:00:00Z",
+        "updated_at": f"202{rng.randint(3, 6)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T00:00:00Z"
+    }
+
+
+def synthetic_readme(full_name: str) -> str:
+    """Deterministic README of about 2 KB."""
+    rng = random.Random(full_name)
+    lines = [f"# {full_name.split('/')[-1]}", "", "## Installation", "", "```", "pip install -r requirements.txt", "```"]
+    while sum(len(line) + 1 for line in lines) < 2048:
+        lines.append(" ".join(rng.choice(WORDS) for _ in range(12)))
+    return "\n".join(lines)
+
+
+class StubServer:
+    """
+    Threaded HTTP server with per-endpoint request counters.
+    
+    Args:
+        fixtures_dir: Directory with recorded GitHub responses
+        pool_size: Search results per query when generating responses
+        search_depth: Results per generated search, paged with Link headers
+            like GitHub's (0 = a single page of pool_size results)
+        github_latency_ms: Simulated GitHub latency per request
+        llm_latency_ms: Simulated time to first token
+        llm_tokens_per_second: Simulated generation speed (0 = instant)
+        llm_replay: Replay JSONL with recorded completions
+        record_upstream: Real GitHub API root to record missing fixtures from
+        record_token: Token used when recording
+    """
+    
+    def __init__(
+        self,
+        fixtures_dir: Optional[str] = None,
+        pool_size: int = 15,
+        search_depth: int = 0,
+        github_latency_ms: float = 0.0,
+        llm_latency_ms: float = 0.0,
+        llm_tokens_per_second: float = 0.0,
+        llm_replay: Optional[str] = None,
+        record_upstream: Optional[str] = None,
+        record_token: str = ""
+    ):
+        self.fixtures_dir = fixtures_dir
+        self.pool_size = pool_size
+        self.search_depth = min(search_depth, UNIVERSE)
+        self.github_latency = github_latency_ms / 1000
+        self.llm_latency_ms = llm_latency_ms
+        self.llm_tokens_per_second = llm_tokens_per_second
+        self.llm_replay = llm_replay
+        self.record_upstream = record_upstream.rstrip("/") if record_upstream else None
+        self.record_token = record_token
+        self.counts = Counter()
+        self._quota: dict[tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+        self._mock = None
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+    
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+    
+    def start(self) -> "StubServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+    
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def reset_counts(self) -> dict:
+        """Return the request counters and start new ones."""
+        with self._lock:
+            counts = dict(self.counts)
+            self.counts.clear()
+        return counts
+    
+    def _count(self, endpoint: str):
+        with self._lock:
+            self.counts[endpoint] += 1
+    
+    def _rate_headers(self, token: str, resource: str) -> dict:
+        """Spend one call of a token's quota and describe it like GitHub does."""
+        limit, window = RATE_LIMITS[resource]
+        now = time.time()
+        with self._lock:
+            quota = self._quota.get((token, resource))
+            if quota is None or now >= quota[1]:
+                quota = self._quota[(token, resource)] = [limit, now + window]
+            quota[0] = max(quota[0] - 1, 0)
+            remaining, reset = quota
+        return {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(int(reset)),
+            "X-RateLimit-Resource": resource
+        }
+    
+    def _link_header(self, path: str, total_count: int) -> dict:
+        """Link header of a search page, as GitHub sends it (first 1000 results only)."""
+        parsed = urlparse(path)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        per_page = int(params.get("per_page", 30))
+        page = int(params.get("page", 1))
+        last = max(1, -(-min(total_count, 1000) // per_page))
+        pages = {"prev": page - 1, "next": page + 1, "last": last, "first": 1}
+        links = [
+            f'<{self.url}{parsed.path}?{urlencode({**params, "page": number})}>; rel="{rel}"'
+            for rel, number in pages.items()
+            if 1 <= number <= last and number != page
+        ]
+        return {"Link": ", ".join(links)} if links else {}
+    
+    def _fixture_path(self, method: str, path: str, body: bytes) -> Optional[str]:
+        if not self.fixtures_dir:
+            return None
+        if body and urlparse(path).path == "/graphql":
+            # The activity window start changes every run - keep it out of the key
+            request = json.loads(body)
+            request.get("variables", {}).pop("since", None)
+            body = json.dumps(request, sort_keys=True).encode()
+        key = hashlib.sha1(method.encode() + b" " + path.encode() + b"\n" + body).hexdigest()
+        return os.path.join(self.fixtures_dir, "github", f"{key}.json")
+    
+    def _github(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        """Answer a GitHub request from fixtures, the upstream API or the generator."""
+        fixture = self._fixture_path(method, path, body)
+        if fixture and os.path.exists(fixture):
+            with open(fixture, encoding="utf-8") as handle:
+                recorded = json.load(handle)
+            return recorded["status"], recorded["body"]
+        
+        if self.record_upstream and fixture:
+            headers = {"Accept": "application/vnd.github.v3+json", "User-Agent": "RepoHunter-bench"}
+            if self.record_token:
+                headers["Authorization"] = f"token {self.record_token}"
+            response = requests.request(
+                method, self.record_upstream + path, data=body or None, headers=headers, timeout=30
+            )
+            recorded = {"status": response.status_code, "body": response.json()}
+            os.makedirs(os.path.dirname(fixture), exist_ok=True)
+            with open(fixture, "w", encoding="utf-8") as handle:
+                json.dump(recorded, handle)
+            return recorded["status"], recorded["body"]
+        
+        return 200, self._generate(method, path, body)
+    
+    def _generate(self, method: str, path: str, body: bytes) -> dict:
+        """Build a synthetic GitHub response."""
+        parsed = urlparse(path)
+        if parsed.path == "/graphql":
+            variables = json.loads(body).get("variables", {})
+            data = {"rateLimit": {"cost": 1, "remaining": 4999, "limit": 5000, "resetAt": ""}}
+            for key, owner in variables.items():
+                match = re.fullmatch(r"o(\d+)", key)
+                if match:
+                    full_name = f"{owner}/{variables['n' + match.group(1)]}"
+                    data[f"r{match.group(1)}"] = self._graphql_node(full_name)
+            return {"data": data}
+        
+        if parsed.path == "/search/repositories":
+            params = parse_qs(parsed.query)
+            query = params.get("q", [""])[0]
+            per_page = int(params.get("per_page", ["10"])[0])
+            if self.search_depth:
+                # A deep result set sorted by stars, served page by page
+                page = int(params.get("page", ["1"])[0])
+                picks = random.Random(zlib.crc32(query.encode())).sample(range(UNIVERSE), self.search_depth)
+                items = sorted((synthetic_repo(index) for index in picks),
+                               key=lambda item: item["stargazers_count"], reverse=True)
+                return {"total_count": len(items), "items": items[(page - 1) * per_page:page * per_page]}
+            rng = random.Random(zlib.crc32(query.encode()))
+            # Variants of one query share their first words, so results overlap
+            base = random.Random(zlib.crc32(query.split()[0].encode() if query.split() else b""))
+            picks = base.sample(range(UNIVERSE), self.pool_size // 2) + rng.sample(range(UNIVERSE), self.pool_size)
+            items = [synthetic_repo(index) for index in dict.fromkeys(picks)]
+            return {"total_count": len(items), "items": items[:min(per_page, self.pool_size)]}
+        
+        if parsed.path.endswith("/readme"):
+            full_name = "/".join(parsed.path.split("/")[2:4])
+            content = base64.b64encode(synthetic_readme(full_name).encode()).decode()
+            return {"content": content, "encoding": "base64"}
+        
+        full_name = "/".join(parsed.path.split("/")[2:4])
+        return {**synthetic_repo(zlib.crc32(full_name.encode()) % UNIVERSE), "full_name": full_name}
+    
+    @staticmethod
+    def _graphql_node(full_name: str) -> dict:
+        repo = synthetic_repo(zlib.crc32(full_name.encode()) % UNIVERSE)
+        return {
+            "nameWithOwner": full_name,
+            "description": repo["description"],
+            "url": f"https://github.com/{full_name}",
+            "stargazerCount": repo["stargazers_count"],
+            "forkCount": repo["forks_count"],
+            "isArchived": repo["archived"],
+            "isFork": repo["fork"],
+            "pushedAt": repo["pushed_at"],
+            "primaryLanguage": {"name": repo["language"]},
+            "licenseInfo": {"spdxId": repo["license"]["spdx_id"]},
+            "repositoryTopics": {"nodes": [{"topic": {"name": topic}} for topic in repo["topics"]]},
+            "latestRelease": {"tagName": "v1.0.0", "publishedAt": repo["pushed_at"]},
+            "defaultBranchRef": {"target": {"history": {"totalCount": len(full_name)}}},
+            "readme0": {
+                "oid": hashlib.sha1(synthetic_readme(full_name).encode()).hexdigest(),
+                "text": synthetic_readme(full_name)
+            }
+        }
+    
+    def _mock_backend(self):
+        """Replay/mock backend used to answer chat completions (imported lazily)."""
+        if self._mock is None:
+            from modules.llm import MockBackend, ReplayBackend
+            mock = MockBackend(self.llm_latency_ms, self.llm_tokens_per_second)
+            self._mock = ReplayBackend(self.llm_replay, mock=mock) if self.llm_replay else mock
+        return self._mock
+    
+    @staticmethod
+    def _task(system_prompt: str) -> str:
+        """Recognize the pipeline step from its system prompt."""
+        if "malformed JSON" in system_prompt:
+            return "repair"
+        if '"profile"' in system_prompt:
+            return "fused"
+        if "ranked_repos" in system_prompt:
+            return "rank"
+        if "search_terms" in system_prompt:
+            return "analyze"
+        return "install"
+    
+    def _handler(self):
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def setup(self):
+                super().setup()
+                # Headers and body are written separately - don't let Nagle delay the body
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            
+            def log_message(self, *args):
+                pass
+            
+            def _send_json(self, status: int, payload, headers: Optional[dict] = None):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def _github(self, method: str, body: bytes = b""):
+                path = urlparse(self.path).path
+                endpoint = (
+                    "graphql" if path == "/graphql"
+                    else "search" if path.startswith("/search/")
+                    else "readme" if path.endswith("/readme")
+                    else "repo"
+                )
+                stub._count(endpoint)
+                time.sleep(stub.github_latency)
+                status, payload = stub._github(method, self.path, body)
+                resource = "graphql" if endpoint == "graphql" else "search" if endpoint == "search" else "core"
+                token = self.headers.get("Authorization", "")
+                if endpoint == "readme" and status == 200 and "raw" in self.headers.get("Accept", ""):
+                    self._send_raw(base64.b64decode(payload.get("content", "")), stub._rate_headers(token, resource))
+                    return
+                headers = stub._rate_headers(token, resource)
+                if endpoint == "search" and status == 200:
+                    headers.update(stub._link_header(self.path, payload.get("total_count", 0)))
+                self._send_json(status, payload, headers)
+            
+            def _send_raw(self, data: bytes, headers: dict):
+                """Answer a raw media type request, honoring If-None-Match."""
+                etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                else:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/vnd.github.raw")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.send_header("ETag", etag)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if self.headers.get("If-None-Match") != etag:
+                    self.wfile.write(data)
+            
+            def do_GET(self):
+                self._github("GET")
+            
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if not self.path.endswith("/chat/completions"):
+                    self._github("POST", body)
+                    return
+                
+                stub._count("llm")
+                request = json.loads(body)
+                system_prompt = request["messages"][0]["content"]
+                user_prompt = request["messages"][-1]["content"]
+                task = stub._task(system_prompt)
+                backend = stub._mock_backend()
+                usage = {"prompt_tokens": (len(system_prompt) + len(user_prompt)) // 4}
+                
+                if not request.get("stream"):
+                    text = backend.complete(system_prompt, user_prompt, request.get("model", ""), task)
+                    usage["completion_tokens"] = len(text) // 4
+                    self._send_json(200, {
+                        "model": request.get("model", ""),
+                        "choices": [{"message": {"role": "assistant", "content": text}}],
+                        "usage": usage
+                    })
+                    return
+                
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                completion = 0
+                for chunk in backend.stream(system_prompt, user_prompt, request.get("model", ""), task):
+                    completion += len(chunk)
+                    event = {"choices": [{"delta": {"content": chunk}}]}
+                    self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+                    self.wfile.flush()
+                if (request.get("stream_options") or {}).get("include_usage"):
+                    usage["completion_tokens"] = completion // 4
+                    event = {"choices": [], "usage": usage}
+                    self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.close_connection = True
+        
+        return Handler
@@ -0,0 +1,141 @@
+"""
+RepoHunter - Batch Mode
+Runs a file of queries through the pipeline with bounded parallelism.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable
+
+from .metrics import percentile
+
+
+def read_queries(path: str) -> list[str]:
+    """
+    Read queries from a text file.
+    
+    One query per line; blank lines and lines starting with # are skipped,
+    duplicates are dropped.
+    """
+    queries = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            query = line.strip()
+            if query and not query.startswith("#") and query not in queries:
+                queries.append(query[:500])
+    return queries
+
+
+def completed_queries(path: str) -> set[str]:
+    """
+    Read the queries already answered in a JSONL results file.
+    
+    The results file doubles as the checkpoint: a crash can at worst leave
+    a truncated last line, which is ignored (and the query re-run).
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and "query" in record and "error" not in record:
+                done.add(record["query"])
+    return done
+
+
+class BatchRunner:
+    """
+    Executes queries concurrently and streams results to a JSONL file.
+    
+    Workers share the process-wide GitHub session, rate limiters and caches,
+    so concurrency mostly overlaps network waits.
+    """
+    
+    def __init__(self, hunt: Callable[[str], dict], out_path: str, concurrency: int = 4):
+        self.hunt = hunt
+        self.out_path = out_path
+        self.concurrency = max(1, concurrency)
+        self._write_lock = threading.Lock()
+    
+    def _write(self, handle, record: dict):
+        """Append one result line and flush it to disk."""
+        line = json.dumps(record, ensure_ascii=False)
+        with self._write_lock:
+            handle.write(line + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+    
+    def _run_one(self, query: str) -> dict:
+        """Run a single query, turning crashes into error records."""
+        try:
+            return self.hunt(query)
+        except Exception:
+            # Security: Don't expose internal error details
+            return {"query": query, "error": "Unexpected error while processing query", "timings": {}}
+    
+    def run(self, queries: list[str], on_result: Callable[[dict, int, int], None] = None) -> dict:
+        """
+        Run every query not already present in the results file.
+        
+        Args:
+            queries: Queries to run
+            on_result: Optional callback(record, finished, pending) invoked
+                after each result is written
+                
+        Returns:
+            Summary dict with counts, wall time and per-stage p50/p95 (ms)
+        """
+        done = completed_queries(self.out_path)
+        pending = [query for query in queries if query not in done]
+        
+        # Repair a truncated last line left by a crash before appending
+        if os.path.exists(self.out_path) and os.path.getsize(self.out_path) > 0:
+            with open(self.out_path, "rb") as handle:
+                handle.seek(-1, os.SEEK_END)
+                needs_newline = handle.read(1) != b"\n"
+        else:
+            needs_newline = False
+        
+        stage_times: dict[str, list[float]] = {}
+        failed = 0
+        started = time.perf_counter()
+        
+        with open(self.out_path, "a", encoding="utf-8") as handle:
+            if needs_newline:
+                handle.write("\n")
+            
+            with ThreadPoolExecutor(max_workers=self.concurrency,
+                                    thread_name_prefix="repohunter-batch") as pool:
+                futures = [pool.submit(self._run_one, query) for query in pending]
+                for finished, future in enumerate(as_completed(futures), 1):
+                    record = future.result()
+                    self._write(handle, record)
+                    if "error" in record:
+                        failed += 1
+                    for stage, ms in record.get("timings", {}).items():
+                        stage_times.setdefault(stage, []).append(ms)
+                    if on_result:
+                        on_result(record, finished, len(pending))
+        
+        return {
+            "total": len(queries),
+            "skipped": len(queries) - len(pending),
+            "completed": len(pending) - failed,
+            "failed": failed,
+            "wall_seconds": round(time.perf_counter() - started, 2),
+            "stages": {
+                stage: {
+                    "p50": round(percentile(times, 50), 1),
+                    "p95": round(percentile(times, 95), 1)
+                }
+                for stage, times in stage_times.items()
+            }
+        }
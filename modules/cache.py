@@ -0,0 +1,305 @@
+"""
+RepoHunter - Persistent Cache
+SQLite-backed key/value store with TTL, LRU eviction and hit counters.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional
+
+from .config import config
+
+
+class CacheEntry(NamedTuple):
+    """A cached value with its HTTP validators."""
+    value: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+    
+    @property
+    def fresh(self) -> bool:
+        """Check if the entry is still within its TTL."""
+        return time.time() < self.expires_at
+
+
+class DiskCache:
+    """
+    Persistent cache stored in a single SQLite file per namespace.
+    
+    Entries carry an expiry time and optional ETag/Last-Modified validators.
+    Stale entries are kept (so callers can revalidate them) until the store
+    grows past ``max_bytes``, at which point the least recently used entries
+    are evicted first. With ``memory_entries`` set, a bounded in-memory LRU
+    sits in front of the database for hot keys.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            expires_at REAL NOT NULL,
+            accessed_at REAL NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at);
+    """
+    
+    def __init__(self, name: str, max_bytes: Optional[int] = None, memory_entries: int = 0):
+        self.name = name
+        self.max_bytes = max_bytes or config.cache_max_mb * 1024 * 1024
+        self.memory_entries = memory_entries if config.cache_enabled else 0
+        self.counters = {"hits": 0, "misses": 0, "stale": 0, "revalidated": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._conn = None
+        self._bytes = 0  # Running total of entry sizes, so a put never sums the table
+        
+        if config.cache_enabled:
+            try:
+                os.makedirs(config.cache_dir, exist_ok=True)
+                path = os.path.join(config.cache_dir, f"{name}.sqlite3")
+                self._conn = sqlite3.connect(path, check_same_thread=False)
+                self._conn.executescript(self.SCHEMA)
+                self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            except (OSError, sqlite3.Error):
+                # Cache is an optimization - run without it if the disk is unusable
+                self._conn = None
+        
+        _registry.append(self)
+    
+    @property
+    def enabled(self) -> bool:
+        """Check if the cache has a usable backing store."""
+        return self._conn is not None
+    
+    def count(self, counter: str):
+        """Increment a named counter."""
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + 1
+    
+    def get(self, key: str, allow_stale: bool = False) -> Optional[CacheEntry]:
+        """
+        Look up a cache entry.
+        
+        Args:
+            key: Cache key
+            allow_stale: Return expired entries too (for revalidation)
+            
+        Returns:
+            CacheEntry or None
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry.fresh:
+                self._memory.move_to_end(key)
+                self.counters["hits"] += 1
+                return entry
+        
+        if not self._conn:
+            with self._lock:
+                self.counters["misses"] += 1
+            return None
+        
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value, etag, last_modified, expires_at FROM entries WHERE key = ?",
+                    (key,)
+                ).fetchone()
+                if row is None:
+                    self.counters["misses"] += 1
+                    return None
+                
+                entry = CacheEntry(json.loads(row[0]), row[1], row[2], row[3])
+                if not entry.fresh and not allow_stale:
+                    self.counters["misses"] += 1
+                    return None
+                
+                self.counters["hits" if entry.fresh else "stale"] += 1
+                if entry.fresh:
+                    self._remember(key, entry)
+                self._conn.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key)
+                )
+                self._conn.commit()
+                return entry
+            except (sqlite3.Error, ValueError):
+                return None
+    
+    def put(self, key: str, value: Any, ttl: float,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Store a value.
+        
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            ttl: Time to live in seconds
+            etag: Optional ETag validator
+            last_modified: Optional Last-Modified validator
+        """
+        now = time.time()
+        if self.memory_entries:
+            with self._lock:
+                self._remember(key, CacheEntry(value, etag, last_modified, now + ttl))
+        
+        if not self._conn:
+            return
+        
+        payload = json.dumps(value, separators=(",", ":"))
+        with self._lock:
+            try:
+                row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, payload, etag, last_modified, now + ttl, now, len(payload))
+                )
+                total, evicted = self._evict(self._bytes + len(payload) - (row[0] if row else 0))
+                self._conn.commit()
+            except sqlite3.Error:
+                return
+            # Only once committed: a failed write leaves both tiers and the total as they were
+            self._bytes = total
+            for evicted_key in evicted:
+                self._memory.pop(evicted_key, None)
+            self.counters["evictions"] += len(evicted)
+    
+    def _remember(self, key: str, entry: CacheEntry):
+        """Insert into the in-memory LRU tier (caller holds the lock)."""
+        if not self.memory_entries:
+            return
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+    
+    def refresh(self, key: str, ttl: float):
+        """Extend the lifetime of an entry (e.g. after a 304 Not Modified)."""
+        if not self._conn:
+            return
+        
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "UPDATE entries SET expires_at = ? WHERE key = ?", (time.time() + ttl, key)
+                )
+                self._conn.commit()
+            except sqlite3.Error:
+                pass
+    
+    def recent_keys(self, limit: int = 500) -> list[str]:
+        """
+        Get keys of fresh entries, most recently used first.
+        
+        Args:
+            limit: Maximum number of keys
+            
+        Returns:
+            List of keys
+        """
+        if not self._conn:
+            return []
+        
+        with self._lock:
+            try:
+                rows = self._conn.execute(
+                    "SELECT key FROM entries WHERE expires_at > ? ORDER BY accessed_at DESC LIMIT ?",
+                    (time.time(), limit)
+                ).fetchall()
+                return [row[0] for row in rows]
+            except sqlite3.Error:
+                return []
+    
+    def _evict(self, total: int) -> tuple[int, list[str]]:
+        """
+        Drop least recently used entries until the store fits max_bytes
+        (caller holds the lock and commits).
+        
+        Args:
+            total: Size of the store in bytes, including the entry just written
+            
+        Returns:
+            (size after eviction, evicted keys)
+        """
+        evicted = []
+        while total > self.max_bytes:
+            # Oldest entries a few at a time, rather than reading the whole table
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                evicted.append(key)
+        return max(total, 0), evicted
+    
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._memory.clear()
+        
+        if not self._conn:
+            return
+        
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM entries")
+                self._conn.commit()
+                self._bytes = 0
+            except sqlite3.Error:
+                pass
+    
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+        
+        Returns:
+            dict with counters, entry count, size in bytes and hit rate
+        """
+        entries, size = 0, 0
+        if self._conn:
+            with self._lock:
+                try:
+                    entries, size = self._conn.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                    ).fetchone()
+                except sqlite3.Error:
+                    pass
+        
+        # "similar" counts near-duplicate hits served after an exact-key miss
+        served = self.counters["hits"] + self.counters["revalidated"] + self.counters.get("similar", 0)
+        lookups = self.counters["hits"] + self.counters["stale"] + self.counters["misses"]
+        return {
+            "name": self.name,
+            "enabled": self.enabled,
+            "entries": entries,
+            "bytes": size,
+            "hit_rate": served / lookups if lookups else 0.0,
+            **self.counters
+        }
+
+
+# Every cache created in this process, for reporting
+_registry: list[DiskCache] = []
+
+
+def all_stats() -> list[dict]:
+    """Get statistics for every cache in this process."""
+    return [cache.stats() for cache in _registry]
+
+
+def clear_all():
+    """Clear every cache in this process."""
+    for cache in _registry:
+        cache.clear()
@@ -0,0 +1,93 @@
+"""
+RepoHunter - Service Client
+Thin client for a running `repohunter serve` instance.
+"""
+
+from typing import Optional
+
+from .config import config
+from .lazy import lazy_import
+
+requests = lazy_import("requests")
+
+
+class ServiceClient:
+    """Calls the service-mode HTTP API; errors come back as {"error": ...} dicts."""
+    
+    def __init__(self, base_url: str, token: Optional[str] = None):
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "RepoHunter-CLI"
+        token = config.server_token if token is None else token
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+    
+    def _call(self, method: str, path: str, timeout: float, **params) -> dict:
+        """Send one request and decode the JSON answer."""
+        try:
+            response = self.session.request(
+                method, f"{self.base_url}{path}",
+                json=params if method == "POST" else None,
+                params=params if method == "GET" else None,
+                timeout=timeout
+            )
+            data = response.json()
+        except requests.exceptions.Timeout:
+            return {"error": "RepoHunter service timed out. Try again."}
+        except requests.exceptions.RequestException:
+            return {"error": f"Cannot reach the RepoHunter service at {self.base_url}."}
+        except ValueError:
+            return {"error": "RepoHunter service sent an invalid response."}
+        if not isinstance(data, dict):
+            return {"error": "RepoHunter service sent an invalid response."}
+        if response.status_code != 200 and "error" not in data:
+            data["error"] = f"RepoHunter service error ({response.status_code})."
+        return data
+    
+    def search(self, query: str) -> dict:
+        """
+        Run a search on the service.
+        
+        Args:
+            query: User's search query
+            
+        Returns:
+            hunt() record (profile, subqueries, ranked, timings, coalesced) or {"error"}
+        """
+        return self._call("POST", "/search", timeout=180, query=query)
+    
+    def install_steps(self, full_name: str, language: str) -> dict:
+        """
+        Get install steps from the service.
+        
+        Args:
+            full_name: owner/repo name
+            language: Primary language
+            
+        Returns:
+            dict with "steps" or {"error"}
+        """
+        return self._call("POST", "/install-steps", timeout=90, repo=full_name, language=language)
+    
+    def stats(self) -> dict:
+        """
+        Get the service statistics, with the tracer summary in its in-process shape.
+        
+        Returns:
+            dict with "trace" (as tracer.summary()), caches, rate_limits,
+            transport and coalescing, or {"error"}
+        """
+        data = self._call("GET", "/stats", timeout=10)
+        if "trace" in data:
+            data["trace"] = {
+                "spans": data["trace"].get("spans", {}),
+                "tokens": {
+                    (usage.pop("task", ""), usage.pop("model", "")): usage
+                    for usage in data["trace"].get("tokens", [])
+                }
+            }
+        return data
+    
+    def reset_stats(self) -> dict:
+        """Clear the service's latency statistics."""
+        return self._call("POST", "/stats/reset", timeout=10)
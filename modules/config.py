@@ -10,23 +10,150 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable, falling back on bad values."""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float environment variable, falling back on bad values."""
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
 class Config:
     """Configuration manager for RepoHunter."""
     
     def __init__(self):
         self.groq_api_key = os.getenv("GROQ_API_KEY", "")
         self.github_token = os.getenv("GITHUB_TOKEN", "")  # Optional
+        # Optional pool of extra tokens (comma-separated) to spread rate limits
+        self.github_tokens = [self.github_token] if self.github_token else []
+        for token in os.getenv("GITHUB_TOKENS", "").split(","):
+            token = token.strip()
+            if token and token not in self.github_tokens:
+                self.github_tokens.append(token)
+        # API root (GitHub Enterprise, or a local stub for benchmarks)
+        self.github_api_url = os.getenv("REPOHUNTER_GITHUB_API_URL", "https://api.github.com").rstrip("/")
+        # Longest we'll wait for a rate limit to reset before reporting an error
+        self.rate_limit_max_wait = _env_int("REPOHUNTER_RATE_LIMIT_MAX_WAIT", 60)
+        # GitHub connection pool: httpx async client (0 = pooled requests.Session),
+        # HTTP/2 when the h2 package is installed, idle connections kept this many seconds
+        self.http_async = os.getenv("REPOHUNTER_HTTP_ASYNC", "1") != "0"
+        self.http_pool_size = max(1, _env_int("REPOHUNTER_HTTP_POOL", 20))
+        self.http2 = os.getenv("REPOHUNTER_HTTP2", "1") != "0"
+        self.http_keepalive = _env_float("REPOHUNTER_HTTP_KEEPALIVE", 30)
+        
+        # Local cache (GitHub responses, AI results)
+        self.cache_enabled = os.getenv("REPOHUNTER_CACHE", "1") != "0"
+        self.cache_dir = os.path.expanduser(
+            os.getenv("REPOHUNTER_CACHE_DIR", "~/.repohunter/cache")
+        )
+        self.cache_max_mb = _env_int("REPOHUNTER_CACHE_MAX_MB", 64)
+        # Minimum similarity for reusing the profile of a near-duplicate query (1.0 = exact only)
+        self.query_similarity = _env_float("REPOHUNTER_QUERY_SIMILARITY", 0.8)
+        
+        # Background work (README prefetch, speculative install steps)
+        self.max_workers = max(1, _env_int("REPOHUNTER_WORKERS", 4))
+        self.prefetch_readmes = _env_int("REPOHUNTER_PREFETCH_READMES", 5)
+        self.speculative_installs = _env_int("REPOHUNTER_SPECULATIVE_INSTALLS", 3)
+        
+        # Number of GitHub search variants run per query (1 = single search)
+        self.search_fanout = _env_int("REPOHUNTER_SEARCH_FANOUT", 4)
+        # Deep scan: results paged through for the main search (0 = off, max 1000)
+        self.deep_search = min(max(0, _env_int("REPOHUNTER_DEEP_SEARCH", 0)), 1000)
+        # Candidates passed to the AI ranker after local pre-ranking
+        self.rank_top_k = max(1, _env_int("REPOHUNTER_RANK_TOP_K", 10))
+        # Prompt token budgets: candidate table for ranking, README excerpt for install steps
+        self.rank_token_budget = max(200, _env_int("REPOHUNTER_RANK_TOKEN_BUDGET", 1200))
+        self.install_token_budget = max(50, _env_int("REPOHUNTER_INSTALL_TOKEN_BUDGET", 300))
+        
+        # Local repository index (searched before GitHub)
+        self.index_enabled = os.getenv("REPOHUNTER_INDEX", "1") != "0"
+        self.index_path = os.path.expanduser(
+            os.getenv("REPOHUNTER_INDEX_PATH", "~/.repohunter/index.sqlite3")
+        )
+        # Local hits needed to skip the live GitHub search
+        self.index_min_results = _env_int("REPOHUNTER_INDEX_MIN_RESULTS", 10)
+        
+        # Semantic vector index (needs NumPy)
+        self.vectors_enabled = os.getenv("REPOHUNTER_VECTORS", "1") != "0"
+        self.vector_dir = os.path.expanduser(
+            os.getenv("REPOHUNTER_VECTOR_DIR", "~/.repohunter/vectors")
+        )
+        self.vector_dim = _env_int("REPOHUNTER_VECTOR_DIM", 256)
+        # Cosine similarity a semantic match needs to count as a local hit
+        self.vector_min_score = _env_float("REPOHUNTER_VECTOR_MIN_SCORE", 0.35)
+        
+        # Saved queries refreshed by `watch run`
+        self.watch_path = os.path.expanduser(
+            os.getenv("REPOHUNTER_WATCH_FILE", "~/.repohunter/watchlist.json")
+        )
+        
+        # Show ranked repositories as the AI streams them
+        self.stream_ranking = os.getenv("REPOHUNTER_STREAM", "1") != "0"
+        # Pipeline: "two-call" (analyze, search, rank) or "fused" (search the raw
+        # query, then one call returns the profile and the ranking)
+        self.pipeline = "fused" if os.getenv("REPOHUNTER_PIPELINE", "two-call").lower() == "fused" else "two-call"
+        
+        # LLM backend: groq, openai (any OpenAI-compatible server), mock or replay
+        self.llm_backend = os.getenv("REPOHUNTER_LLM_BACKEND", "groq").lower()
+        self.llm_base_url = os.getenv("REPOHUNTER_LLM_BASE_URL", "https://api.openai.com/v1")
+        self.llm_api_key = os.getenv("REPOHUNTER_LLM_API_KEY", "") or os.getenv("OPENAI_API_KEY", "")
+        # Model per pipeline step: small and fast for the cheap steps
+        default_model = os.getenv("REPOHUNTER_MODEL", "llama-3.3-70b-versatile")
+        self.models = {
+            "analyze": os.getenv("REPOHUNTER_MODEL_ANALYZE", "llama-3.1-8b-instant"),
+            "rank": os.getenv("REPOHUNTER_MODEL_RANK", default_model),
+            "install": os.getenv("REPOHUNTER_MODEL_INSTALL", "llama-3.1-8b-instant"),
+            "repair": os.getenv("REPOHUNTER_MODEL_REPAIR", "llama-3.1-8b-instant"),
+            "fused": os.getenv("REPOHUNTER_MODEL_FUSED", default_model)
+        }
+        # Ask the backend for JSON output, and fix unparseable answers with one small repair call
+        self.json_mode = os.getenv("REPOHUNTER_JSON_MODE", "1") != "0"
+        self.json_repair = os.getenv("REPOHUNTER_JSON_REPAIR", "1") != "0"
+        # Record live completions to the replay file (for offline benchmarks)
+        self.llm_record = os.getenv("REPOHUNTER_LLM_RECORD", "0") == "1"
+        self.replay_path = os.path.expanduser(
+            os.getenv("REPOHUNTER_REPLAY_FILE", "~/.repohunter/replay.jsonl")
+        )
+        # Simulated latency of the mock/replay backends
+        self.mock_latency_ms = _env_float("REPOHUNTER_MOCK_LATENCY_MS", 300)
+        self.mock_tokens_per_second = _env_float("REPOHUNTER_MOCK_TOKENS_PER_SEC", 250)
+        
+        # Tracing: append every span to a JSONL file ("" = off)
+        trace_file = os.getenv("REPOHUNTER_TRACE_FILE", "")
+        self.trace_path = os.path.expanduser(trace_file) if trace_file else ""
+        # Prometheus /metrics endpoint (0 = off)
+        self.metrics_port = _env_int("REPOHUNTER_METRICS_PORT", 0)
+        self.metrics_host = os.getenv("REPOHUNTER_METRICS_HOST", "127.0.0.1")
+        
+        # Service mode (`repohunter serve`): bind address and optional shared token
+        self.server_host = os.getenv("REPOHUNTER_SERVER_HOST", "127.0.0.1")
+        self.server_port = _env_int("REPOHUNTER_SERVER_PORT", 8765)
+        self.server_token = os.getenv("REPOHUNTER_SERVER_TOKEN", "")
+        # Run the REPL as a thin client of this service URL ("" = local pipeline)
+        self.server_url = os.getenv("REPOHUNTER_SERVER_URL", "").rstrip("/")
     
     def validate(self) -> tuple[bool, str]:
         """Validate required configuration."""
-        if not self.groq_api_key:
+        if self.llm_backend not in ("groq", "openai", "mock", "replay"):
+            return False, f"Unknown REPOHUNTER_LLM_BACKEND: {self.llm_backend}"
+        if self.llm_backend == "groq" and not self.groq_api_key:
             return False, "GROQ_API_KEY not found. Get one free at https://console.groq.com"
+        if self.llm_backend == "openai" and not self.llm_base_url:
+            return False, "REPOHUNTER_LLM_BASE_URL not set for the openai backend"
         return True, "Configuration OK"
     
     @property
     def has_github_token(self) -> bool:
         """Check if GitHub token is configured."""
-        return bool(self.github_token)
+        return bool(self.github_tokens)
 
 
 # Global config instance
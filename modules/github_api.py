@@ -3,33 +3,419 @@ RepoHunter - GitHub API Integration
 Search and fetch repository metadata from GitHub.
 """
 
-import requests
-from typing import Optional
+import codecs
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterator, Optional
+from urllib.parse import parse_qs, urlparse
+from .cache import DiskCache
 from .config import config
+from .lazy import LazyObject, lazy_import
+from .metrics import tracer
+from .models import Repo
+from .prompts import readme_excerpt
+from .transport import Response, Transport
+
+asyncio = lazy_import("asyncio")
+requests = lazy_import("requests")
+
+
+class RateLimiter:
+    """Sliding-window limiter: at most `limit` calls per `period` seconds."""
+    
+    def __init__(self, limit: int, period: float = 60.0):
+        self.limit = limit
+        self.period = period
+        self._calls = deque()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a call is allowed, then record it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.limit:
+                    self._calls.append(now)
+                    return
+                wait = self.period - (now - self._calls[0])
+            time.sleep(wait)
+
+
+def parse_link_header(value: Optional[str]) -> dict:
+    """
+    Parse an RFC 8288 Link header.
+    
+    Args:
+        value: Header value, e.g. '<https://...&page=2>; rel="next", <...>; rel="last"'
+        
+    Returns:
+        dict of rel -> URL
+    """
+    links = {}
+    for match in re.finditer(r'<([^>]*)>\s*;([^,]*)', value or ""):
+        rel = re.search(r'rel="?([^";]+)"?', match.group(2))
+        if rel:
+            for name in rel.group(1).split():
+                links[name] = match.group(1)
+    return links
+
+
+class RateLimitExceeded(Exception):
+    """Raised when no token has budget left within the allowed wait."""
+    
+    def __init__(self, resource: str, reset_at: float):
+        super().__init__(f"GitHub {resource} rate limit exhausted")
+        self.resource = resource
+        self.reset_at = reset_at
+
+
+class RateLimitScheduler:
+    """
+    Tracks GitHub rate-limit buckets per token and resource (core, search,
+    graphql) from response headers, and picks which token to use next.
+    
+    Requests are delayed before a bucket runs dry instead of failing on it:
+    the last RESERVE_FRACTION of a bucket is never spent, and once a bucket
+    drops below PACE_FRACTION the remaining calls are spread evenly until
+    its reset time.
+    """
+    
+    RESERVE_FRACTION = 0.02
+    PACE_FRACTION = 0.2
+    
+    # Assumed limits until the first response reports the real ones
+    DEFAULT_LIMITS = {"core": 5000, "search": 30, "graphql": 5000}
+    ANONYMOUS_LIMITS = {"core": 60, "search": 10, "graphql": 0}
+    
+    def __init__(self, tokens: list[str]):
+        self.tokens = tokens or [""]
+        self._buckets: dict[tuple[str, str], dict] = {}
+        # Local sliding windows guard concurrent search calls before headers arrive
+        self._search_windows = {
+            token: RateLimiter(self.DEFAULT_LIMITS["search"] if token else self.ANONYMOUS_LIMITS["search"])
+            for token in self.tokens
+        }
+        self._lock = threading.Lock()
+    
+    def _bucket(self, token: str, resource: str) -> dict:
+        """Get (and refill after reset) the bucket for a token (caller holds the lock)."""
+        bucket = self._buckets.get((token, resource))
+        now = time.time()
+        if bucket is None or now >= bucket["reset"]:
+            limits = self.DEFAULT_LIMITS if token else self.ANONYMOUS_LIMITS
+            limit = bucket["limit"] if bucket else limits.get(resource, limits["core"])
+            period = 60 if resource == "search" else 3600
+            bucket = {"limit": limit, "remaining": limit, "reset": now + period}
+            self._buckets[(token, resource)] = bucket
+        return bucket
+    
+    def acquire(self, resource: str = "core") -> str:
+        """
+        Reserve one call, waiting if every token is close to its limit.
+        
+        Args:
+            resource: Rate-limit resource (core, search, graphql)
+            
+        Returns:
+            Token to use ("" for anonymous)
+            
+        Raises:
+            RateLimitExceeded if the wait would exceed config.rate_limit_max_wait
+        """
+        while True:
+            with self._lock:
+                best, best_spare, earliest_reset = None, 0.0, float("inf")
+                for token in self.tokens:
+                    bucket = self._bucket(token, resource)
+                    reserve = max(1, int(bucket["limit"] * self.RESERVE_FRACTION)) if bucket["limit"] > 1 else 0
+                    spare = bucket["remaining"] - reserve
+                    if spare > best_spare:
+                        best, best_spare = token, spare
+                    earliest_reset = min(earliest_reset, bucket["reset"])
+                
+                if best is not None:
+                    bucket = self._bucket(best, resource)
+                    bucket["remaining"] -= 1
+                    pace = 0.0
+                    if bucket["remaining"] < bucket["limit"] * self.PACE_FRACTION:
+                        pace = max(bucket["reset"] - time.time(), 0) / max(bucket["remaining"], 1)
+                    break
+                
+                wait = earliest_reset - time.time()
+            
+            if wait > config.rate_limit_max_wait:
+                raise RateLimitExceeded(resource, earliest_reset)
+            time.sleep(max(wait, 0) + 1)
+        
+        if resource == "search":
+            self._search_windows[best].acquire()
+        if pace > 0:
+            time.sleep(min(pace, config.rate_limit_max_wait))
+        return best
+    
+    def update(self, token: str, response: Response):
+        """Record the rate-limit headers of a response."""
+        headers = response.headers
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        resource = headers.get("X-RateLimit-Resource", "core")
+        try:
+            limit = int(headers.get("X-RateLimit-Limit", 0))
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset = float(headers.get("X-RateLimit-Reset", 0))
+        except ValueError:
+            return
+        with self._lock:
+            self._buckets[(token, resource)] = {"limit": limit, "remaining": remaining, "reset": reset}
+    
+    def retry_delay(self, token: str, response: Response, attempt: int) -> Optional[float]:
+        """
+        Decide whether a rate-limited response should be retried.
+        
+        Args:
+            token: Token used for the request
+            response: 403/429 response
+            attempt: Zero-based attempt number
+            
+        Returns:
+            Seconds to wait before retrying, or None to give up
+        """
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+            return delay if delay <= config.rate_limit_max_wait else None
+        
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            # Primary limit: another token may still have budget
+            return 0.0 if len(self.tokens) > 1 else None
+        
+        if "secondary rate limit" in response.text.lower() or response.status_code == 429:
+            # Exponential backoff with full jitter
+            return min(random.uniform(0, 2 ** (attempt + 1)), config.rate_limit_max_wait)
+        return None
+    
+    def budget(self) -> dict:
+        """
+        Get the remaining budget summed over all tokens.
+        
+        Returns:
+            dict of resource -> {"remaining", "limit", "reset", "tokens"}
+        """
+        summary = {}
+        with self._lock:
+            for resource in ("core", "search", "graphql"):
+                buckets = [self._bucket(token, resource) for token in self.tokens]
+                summary[resource] = {
+                    "remaining": sum(bucket["remaining"] for bucket in buckets),
+                    "limit": sum(bucket["limit"] for bucket in buckets),
+                    "reset": min(bucket["reset"] for bucket in buckets),
+                    "tokens": len(buckets)
+                }
+        return summary
 
 
 class GitHubAPI:
-    """GitHub API client for repository search."""
+    """
+    GitHub API client for repository search.
+    
+    Requests go through a pooled async transport (see transport.Transport).
+    The ``a``-prefixed coroutines are the implementation and can be awaited
+    together for concurrent fetches; the plain methods are blocking wrappers
+    for the REPL and worker threads.
+    """
+    
+    # Cache lifetime per endpoint (seconds). Stale entries are revalidated
+    # with If-None-Match, and 304 responses don't count against the rate limit.
+    CACHE_TTL = {
+        "search": 15 * 60,
+        "repo": 6 * 60 * 60,
+        "readme": 24 * 60 * 60
+    }
+    
+    # Retries for secondary rate limits and token rotation
+    MAX_RETRIES = 3
+    
+    # Repositories per GraphQL query (each one is an aliased field)
+    GRAPHQL_BATCH = 25
+    README_PATHS = ("README.md", "readme.md", "README.rst", "README")
+    # READMEs are kept as a cleaned excerpt (install/usage sections first) of this many tokens
+    README_TOKENS = 1500
+    # Raw README bytes read at most - the excerpt never needs more
+    README_MAX_BYTES = 128 * 1024
+    # Excerpts are stored by content (blob SHA), which never changes
+    BLOB_TTL = 30 * 24 * 60 * 60
+    # Window for the recent commit count used as an activity signal
+    ACTIVITY_DAYS = 90
     
-    BASE_URL = "https://api.github.com"
+    GRAPHQL_FIELDS = """
+        nameWithOwner
+        description
+        url
+        stargazerCount
+        forkCount
+        isArchived
+        isFork
+        pushedAt
+        primaryLanguage { name }
+        licenseInfo { spdxId }
+        repositoryTopics(first: 10) { nodes { topic { name } } }
+        latestRelease { tagName publishedAt }
+        defaultBranchRef { target { ... on Commit { history(since: $since) { totalCount } } } }
+    """
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.base_url = config.github_api_url
+        self.http = Transport(headers={
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "RepoHunter-CLI"
         })
         
-        # Add auth token if available
-        if config.has_github_token:
-            self.session.headers["Authorization"] = f"token {config.github_token}"
+        # Auth tokens are attached per request, rotating across the pool
+        self.scheduler = RateLimitScheduler(config.github_tokens)
+        self.cache = DiskCache("github")
+        self.readme_cache = DiskCache("readmes", max_bytes=16 * 1024 * 1024)
+        self.graphql_stats = {"queries": 0, "repos": 0, "cost": 0}
+    
+    async def _arequest(self, url: str, params: Optional[dict] = None, headers: Optional[dict] = None,
+                        resource: str = "core", body: Optional[dict] = None,
+                        max_bytes: Optional[int] = None,
+                        read_if: Optional[Callable[[int, dict], bool]] = None) -> Response:
+        """
+        Send a request through the rate-limit scheduler (GET, or POST when
+        a JSON body is given).
+        
+        Retries secondary rate limits with jittered backoff and rotates to
+        another token when one runs out.
+        
+        Args:
+            url: Full API URL
+            params: Query parameters
+            headers: Extra request headers
+            resource: Rate-limit resource (core, search, graphql)
+            body: JSON body to POST
+            max_bytes: Read at most this many body bytes
+            read_if: Decides from (status, headers) whether to read the body
+            
+        Returns:
+            The final response (may still be an error status)
+        """
+        waited = 0.0
+        for attempt in range(self.MAX_RETRIES + 1):
+            started = time.perf_counter()
+            # The scheduler may sleep to pace a bucket - keep that off the loop
+            token = await asyncio.to_thread(self.scheduler.acquire, resource)
+            waited += time.perf_counter() - started
+            request_headers = dict(headers or {})
+            if token:
+                request_headers["Authorization"] = f"token {token}"
+            
+            if body is None:
+                response = await self.http.request(
+                    "GET", url, params=params, headers=request_headers, timeout=10,
+                    max_bytes=max_bytes, read_if=read_if
+                )
+            else:
+                response = await self.http.request("POST", url, json=body, headers=request_headers, timeout=30)
+            self.scheduler.update(token, response)
+            tracer.annotate(
+                status=response.status_code, attempts=attempt + 1,
+                wait_ms=round(waited * 1000, 1), bytes=len(response.content)
+            )
+            
+            if response.status_code not in (403, 429) or attempt == self.MAX_RETRIES:
+                return response
+            delay = self.scheduler.retry_delay(token, response, attempt)
+            if delay is None:
+                return response
+            started = time.perf_counter()
+            await asyncio.sleep(delay)
+            waited += time.perf_counter() - started
+        return response
+    
+    def _request(self, url: str, params: Optional[dict] = None, headers: Optional[dict] = None,
+                 resource: str = "core", body: Optional[dict] = None) -> Response:
+        """Blocking version of _arequest()."""
+        return self.http.run(self._arequest(url, params, headers, resource, body))
+    
+    def budget(self) -> dict:
+        """Get the remaining rate-limit budget per resource."""
+        return self.scheduler.budget()
+    
+    def warm(self):
+        """Prepare the connection pool before the first request."""
+        self.http.warm()
+    
+    async def _aget_json(self, url: str, params: Optional[dict] = None, endpoint: str = "repo",
+                         links: bool = False):
+        """
+        GET a JSON resource through the response cache.
+        
+        Fresh entries are served without a request. Stale entries are
+        revalidated with their ETag/Last-Modified validators. Each call is
+        traced as a "github.<endpoint>" span with its cache outcome.
+        
+        Args:
+            url: Full API URL
+            params: Query parameters
+            endpoint: Endpoint name used to pick the TTL
+            links: Also return the response's Link relations
+            
+        Returns:
+            Decoded JSON body, or (body, {rel: URL}) with ``links`` - the
+            relations are empty when the body came from the cache
+            
+        Raises:
+            requests.exceptions.RequestException on network or HTTP errors
+            RateLimitExceeded when the rate limit would need a long wait
+        """
+        ttl = self.CACHE_TTL.get(endpoint, 0)
+        key = url + "?" + json.dumps(params or {}, sort_keys=True)
+        
+        with tracer.span(f"github.{endpoint}") as span:
+            entry = self.cache.get(key, allow_stale=True)
+            if entry and entry.fresh:
+                span.set(cache="hit")
+                return (entry.value, {}) if links else entry.value
+            
+            headers = {}
+            if entry:
+                if entry.etag:
+                    headers["If-None-Match"] = entry.etag
+                if entry.last_modified:
+                    headers["If-Modified-Since"] = entry.last_modified
+            span.set(cache="stale" if entry else "miss")
+            
+            resource = "search" if endpoint == "search" else "core"
+            response = await self._arequest(url, params, headers, resource)
+            if response.status_code == 304 and entry:
+                span.set(cache="revalidated")
+                self.cache.count("revalidated")
+                self.cache.refresh(key, ttl)
+                return (entry.value, parse_link_header(response.headers.get("Link"))) if links else entry.value
+            
+            response.raise_for_status()
+            data = response.json()
+            self.cache.put(
+                key, data, ttl,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
+            )
+            return (data, parse_link_header(response.headers.get("Link"))) if links else data
     
     def search_repositories(
         self,
         query: str,
         sort: str = "stars",
         order: str = "desc",
-        per_page: int = 10
+        per_page: int = 10,
+        page: int = 1
     ) -> dict:
         """
         Search GitHub repositories.
@@ -38,36 +424,155 @@ class GitHubAPI:
             query: Search query string
             sort: Sort by (stars, forks, updated)
             order: Order (asc, desc)
-            per_page: Number of results
+            per_page: Number of results (max 100)
+            page: Result page (1-based)
             
         Returns:
-            API response as dict
+            dict with total_count and "items" as Repo records, or
+            "error" (with empty items)
         """
-        url = f"{self.BASE_URL}/search/repositories"
+        return self.http.run(self.asearch_repositories(query, sort, order, per_page, page))
+    
+    async def asearch_repositories(
+        self,
+        query: str,
+        sort: str = "stars",
+        order: str = "desc",
+        per_page: int = 10,
+        page: int = 1
+    ) -> dict:
+        """Coroutine version of search_repositories()."""
+        url = f"{self.base_url}/search/repositories"
         params = {
             "q": query,
             "sort": sort,
             "order": order,
             "per_page": per_page
         }
+        if page > 1:
+            params["page"] = page
+        
+        result = await self._asearch_page(url, params)
+        result.pop("next", None)
+        return result
+    
+    async def _asearch_page(self, url: str, params: Optional[dict] = None) -> dict:
+        """
+        Fetch one page of search results.
         
+        Args:
+            url: Search URL (a Link rel="next" URL carries its own query string)
+            params: Query parameters
+            
+        Returns:
+            dict with total_count, incomplete_results, "items" as Repo
+            records and the "next" page URL (None when the response had no
+            Link header), or "error" (with empty items)
+        """
         try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            data, links = await self._aget_json(url, params, endpoint="search", links=True)
+        except RateLimitExceeded as e:
+            wait = max(int(e.reset_at - time.time()), 1)
+            return {"error": f"GitHub rate limit reached. Resets in {wait}s.", "items": []}
+        except requests.exceptions.Timeout:
+            return {"error": "GitHub request timed out. Try again.", "items": []}
+        except requests.exceptions.HTTPError as e:
             # Security: Sanitize error message - don't expose internal network details
-            error_msg = str(e).lower()
-            if "timeout" in error_msg:
-                return {"error": "GitHub request timed out. Try again.", "items": []}
-            elif "rate" in error_msg or "403" in error_msg:
+            status = e.response.status_code if e.response is not None else 0
+            if status in (403, 429):
                 return {"error": "GitHub rate limit reached. Wait a moment.", "items": []}
-            elif "401" in error_msg or "auth" in error_msg:
+            elif status == 401:
                 return {"error": "GitHub authentication failed.", "items": []}
-            else:
-                return {"error": "GitHub connection error. Check your internet.", "items": []}
+            elif status == 422:
+                return {"error": "GitHub rejected the search query.", "items": []}
+            return {"error": "GitHub API error. Try again later.", "items": []}
+        except requests.exceptions.JSONDecodeError:
+            return {"error": "GitHub API error. Try again later.", "items": []}
+        except requests.exceptions.RequestException:
+            return {"error": "GitHub connection error. Check your internet.", "items": []}
+        if not isinstance(data, dict):
+            return {"error": "GitHub API error. Try again later.", "items": []}
+        
+        # The cache keeps the raw payload; callers only ever see compact records
+        return {
+            "total_count": data.get("total_count", 0),
+            "incomplete_results": data.get("incomplete_results", False),
+            "items": [repo for repo in map(Repo.from_api, data.get("items") or []) if repo],
+            "next": links.get("next")
+        }
+    
+    def iter_search(
+        self,
+        query: str,
+        sort: str = "stars",
+        order: str = "desc",
+        per_page: int = 100,
+        max_results: int = 1000,
+        prefetch: bool = True
+    ) -> "SearchPager":
+        """
+        Page lazily through every result of a search (see SearchPager).
+        
+        Args:
+            query: Search query string
+            sort: Sort by (stars, forks, updated)
+            order: Order (asc, desc)
+            per_page: Results per request (max 100)
+            max_results: Stop after this many results (GitHub serves 1000 at most)
+            prefetch: Request the next page while the caller handles the current one
+            
+        Returns:
+            Iterable of Repo records
+        """
+        return SearchPager(self, query, sort, order, per_page, max_results, prefetch)
+    
+    def search_many(self, queries: list[str], per_page: int = 10) -> dict:
+        """
+        Run several searches concurrently and merge the results.
+        
+        Requests go through the search rate limiter, so a large fan-out
+        is spread out instead of tripping the 30 req/min limit.
+        
+        Args:
+            queries: Search query strings
+            per_page: Number of results per query
+            
+        Returns:
+            dict with merged "items" (Repo records deduplicated by full_name,
+            each with a matched_queries count) and per-query "subqueries" stats
+        """
+        async def run(query: str):
+            started = time.perf_counter()
+            result = await self.asearch_repositories(query, per_page=per_page)
+            return query, result, (time.perf_counter() - started) * 1000
+        
+        outcomes = self.http.gather([run(query) for query in queries])
+        
+        merged = {}
+        subqueries = []
+        errors = []
+        for query, result, elapsed_ms in outcomes:
+            items = result.get("items", [])
+            subqueries.append({
+                "query": query,
+                "count": len(items),
+                "ms": round(elapsed_ms),
+                "error": result.get("error")
+            })
+            if "error" in result:
+                errors.append(result["error"])
+            for repo in items:
+                if repo.full_name in merged:
+                    merged[repo.full_name].matched_queries += 1
+                else:
+                    merged[repo.full_name] = repo
+        
+        response = {"items": list(merged.values()), "subqueries": subqueries}
+        if errors and len(errors) == len(outcomes):
+            response["error"] = errors[0]
+        return response
     
-    def get_repository(self, owner: str, repo: str) -> Optional[dict]:
+    def get_repository(self, owner: str, repo: str) -> Optional[Repo]:
         """
         Get detailed repository information.
         
@@ -76,42 +581,348 @@ class GitHubAPI:
             repo: Repository name
             
         Returns:
-            Repository data or None
+            Repository record or None
         """
-        url = f"{self.BASE_URL}/repos/{owner}/{repo}"
+        return self.http.run(self.aget_repository(owner, repo))
+    
+    async def aget_repository(self, owner: str, repo: str) -> Optional[Repo]:
+        """Coroutine version of get_repository()."""
+        url = f"{self.base_url}/repos/{owner}/{repo}"
         
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException:
+            data = await self._aget_json(url, endpoint="repo")
+        except (requests.exceptions.RequestException, RateLimitExceeded):
             return None
+        return Repo.from_api(data) if isinstance(data, dict) else None
+    
+    def get_repositories_bulk(self, full_names: list[str]) -> dict:
+        """
+        Fetch metadata and README text for many repositories via GraphQL.
+        
+        Up to GRAPHQL_BATCH repositories are fetched per query as aliased
+        fields, replacing one get_repository + get_readme REST pair per repo;
+        the queries of a large request run concurrently. Results are cached
+        per repository. GraphQL requires a token, so without one this
+        returns an empty dict and callers use REST.
+        
+        Args:
+            full_names: owner/repo names
+            
+        Returns:
+            dict of full_name -> metadata (license, topics, latest_release,
+            commits_recent, readme, ...); missing repos are omitted
+        """
+        if not config.has_github_token:
+            return {}
+        
+        results = {}
+        missing = []
+        for full_name in dict.fromkeys(full_names):
+            entry = self.cache.get(f"graphql:{full_name.lower()}")
+            if entry:
+                results[full_name] = entry.value
+            elif re.fullmatch(r"[\w.-]+/[\w.-]+", full_name):
+                missing.append(full_name)
+        
+        async def fetch(batch: list[str]) -> dict:
+            try:
+                return await self._graphql_batch(batch)
+            except (requests.exceptions.RequestException, RateLimitExceeded, ValueError):
+                return {}
+        
+        batches = [missing[start:start + self.GRAPHQL_BATCH] for start in range(0, len(missing), self.GRAPHQL_BATCH)]
+        for fetched in self.http.gather([fetch(batch) for batch in batches]):
+            for full_name, details in fetched.items():
+                self.cache.put(f"graphql:{full_name.lower()}", details, self.CACHE_TTL["repo"])
+                if details.get("readme") and details.get("readme_sha"):
+                    # Lets get_readme() skip the download while the blob is unchanged
+                    self._store_readme(full_name, f"blob:{details['readme_sha']}", details["readme"])
+                results[full_name] = details
+        
+        return results
+    
+    async def _graphql_batch(self, full_names: list[str]) -> dict:
+        """Run one aliased GraphQL query for a batch of repositories."""
+        readme_fields = " ".join(
+            f'readme{i}: object(expression: "HEAD:{path}") {{ ... on Blob {{ oid text }} }}'
+            for i, path in enumerate(self.README_PATHS)
+        )
+        declarations = ["$since: GitTimestamp!"]
+        fields = []
+        variables = {
+            "since": time.strftime(
+                "%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - self.ACTIVITY_DAYS * 86400)
+            )
+        }
+        for i, full_name in enumerate(full_names):
+            owner, name = full_name.split("/", 1)
+            declarations += [f"$o{i}: String!", f"$n{i}: String!"]
+            variables[f"o{i}"], variables[f"n{i}"] = owner, name
+            fields.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ {self.GRAPHQL_FIELDS} {readme_fields} }}")
+        
+        query = (
+            f"query({', '.join(declarations)}) {{ "
+            f"rateLimit {{ cost remaining limit resetAt }} {' '.join(fields)} }}"
+        )
+        with tracer.span("github.graphql", repos=len(full_names)) as span:
+            response = await self._arequest(
+                f"{self.base_url}/graphql", resource="graphql",
+                body={"query": query, "variables": variables}
+            )
+            response.raise_for_status()
+            payload = response.json()
+            data = payload.get("data") if isinstance(payload, dict) else None
+            if not isinstance(data, dict):
+                # A proxy or error page answering with other JSON: the batch comes back empty
+                data = {}
+            rate = data.get("rateLimit") or {}
+            span.set(cost=rate.get("cost", 0))
+        
+        self.graphql_stats["queries"] += 1
+        self.graphql_stats["cost"] += rate.get("cost", 0) or 0
+        
+        fetched = {}
+        for i, full_name in enumerate(full_names):
+            node = data.get(f"r{i}")
+            if node and isinstance(node, dict):
+                fetched[full_name] = self._parse_graphql_repo(node)
+        self.graphql_stats["repos"] += len(fetched)
+        return fetched
+    
+    def _parse_graphql_repo(self, node: dict) -> dict:
+        """Flatten a GraphQL repository node."""
+        readme, readme_sha = None, None
+        for i in range(len(self.README_PATHS)):
+            blob = node.get(f"readme{i}") or {}
+            if blob.get("text"):
+                readme_sha = blob.get("oid")
+                readme = self._cached_blob(f"blob:{readme_sha}") if readme_sha else None
+                if readme is None:
+                    readme = readme_excerpt(blob["text"], self.README_TOKENS)
+                break
+        
+        release = node.get("latestRelease") or {}
+        target = (node.get("defaultBranchRef") or {}).get("target") or {}
+        return {
+            "full_name": node.get("nameWithOwner", ""),
+            "description": node.get("description") or "",
+            "html_url": node.get("url", ""),
+            "stargazers_count": node.get("stargazerCount", 0),
+            "forks_count": node.get("forkCount", 0),
+            "archived": node.get("isArchived", False),
+            "fork": node.get("isFork", False),
+            "pushed_at": node.get("pushedAt") or "",
+            "language": (node.get("primaryLanguage") or {}).get("name"),
+            "license": (node.get("licenseInfo") or {}).get("spdxId"),
+            "topics": [
+                item["topic"]["name"]
+                for item in (node.get("repositoryTopics") or {}).get("nodes", [])
+                if item.get("topic")
+            ],
+            "latest_release": (release.get("publishedAt") or "")[:10],
+            "commits_recent": (target.get("history") or {}).get("totalCount"),
+            "readme": readme,
+            "readme_sha": readme_sha
+        }
+    
+    def _cached_blob(self, blob_key: str) -> Optional[str]:
+        """Look up a processed README excerpt by content key."""
+        entry = self.readme_cache.get(blob_key)
+        return entry.value if entry else None
+    
+    def _store_readme(self, full_name: str, blob_key: str, excerpt: str, etag: Optional[str] = None):
+        """Store an excerpt under its content key and point the repository at it."""
+        if self._cached_blob(blob_key) is None:
+            self.readme_cache.put(blob_key, excerpt, self.BLOB_TTL)
+        self.cache.put(f"readme:{full_name.lower()}", {"blob": blob_key}, self.CACHE_TTL["readme"], etag=etag)
+    
+    @staticmethod
+    def _decode_limited(response: Response) -> str:
+        """
+        Decode a body read up to README_MAX_BYTES.
+        
+        Decoding is tolerant: invalid UTF-8 becomes U+FFFD, and a character
+        cut in half at the byte limit is dropped.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        return decoder.decode(response.content, final=not response.truncated)
     
     def get_readme(self, owner: str, repo: str) -> Optional[str]:
         """
-        Get repository README content.
+        Get a repository README as a cleaned excerpt (see prompts.readme_excerpt).
+        
+        The README is requested in the raw media type and streamed, reading
+        at most README_MAX_BYTES. Excerpts are cached by content: under the
+        blob SHA when known (GraphQL oid, or a strong SHA-1 ETag) and under
+        a SHA-256 of the bytes otherwise, with a per-repository pointer that
+        is revalidated with If-None-Match. A README whose blob was already
+        processed (a fork, or an unchanged file) is not read again.
         
         Args:
             owner: Repository owner
             repo: Repository name
             
         Returns:
-            README content or None
+            README excerpt or None
         """
-        url = f"{self.BASE_URL}/repos/{owner}/{repo}/readme"
+        return self.http.run(self.aget_readme(owner, repo))
+    
+    async def aget_readme(self, owner: str, repo: str) -> Optional[str]:
+        """Coroutine version of get_readme()."""
+        full_name = f"{owner}/{repo}"
+        url = f"{self.base_url}/repos/{owner}/{repo}/readme"
+        pointer_key = f"readme:{full_name.lower()}"
         
-        try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+        with tracer.span("github.readme") as span:
+            pointer = self.cache.get(pointer_key, allow_stale=True)
+            excerpt = self._cached_blob(pointer.value["blob"]) if pointer else None
+            if pointer and pointer.fresh and excerpt is not None:
+                span.set(cache="hit")
+                return excerpt
+            
+            headers = {"Accept": "application/vnd.github.raw+json"}
+            if excerpt is not None and pointer.etag:
+                headers["If-None-Match"] = pointer.etag
+            
+            def blob_sha(headers) -> Optional[str]:
+                etag = headers.get("ETag")
+                return etag.strip('"') if etag and re.fullmatch(r'"[0-9a-f]{40}"', etag) else None
             
-            # README is base64 encoded
-            import base64
-            content = base64.b64decode(data.get("content", "")).decode("utf-8")
-            return content[:2000]  # Limit for AI context
-        except Exception:
+            def read_if(status: int, headers) -> bool:
+                # Content already processed: skip the body entirely
+                sha = blob_sha(headers)
+                return status != 200 or not sha or self._cached_blob(f"blob:{sha}") is None
+            
+            try:
+                response = await self._arequest(
+                    url, headers=headers, max_bytes=self.README_MAX_BYTES, read_if=read_if
+                )
+            except (requests.exceptions.RequestException, RateLimitExceeded):
+                return None
+            if response.status_code == 304 and excerpt is not None:
+                span.set(cache="revalidated")
+                self.cache.count("revalidated")
+                self.cache.refresh(pointer_key, self.CACHE_TTL["readme"])
+                return excerpt
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError:
+                return None
+            
+            etag = response.headers.get("ETag")
+            sha = blob_sha(response.headers)
+            known = self._cached_blob(f"blob:{sha}") if sha else None
+            if known is not None:
+                span.set(cache="blob")
+                self._store_readme(full_name, f"blob:{sha}", known, etag)
+                return known
+            if response.truncated and not response.content:
+                # The blob was evicted between the headers and this check
+                return None
+            
+            raw = response.content
+            text = self._decode_limited(response)
+            span.set(cache="stale" if pointer else "miss", bytes=len(raw))
+            blob_key = f"blob:{sha}" if sha else f"sha256:{hashlib.sha256(raw).hexdigest()}"
+            excerpt = self._cached_blob(blob_key)
+            if excerpt is None:
+                excerpt = readme_excerpt(text, self.README_TOKENS)
+            self._store_readme(full_name, blob_key, excerpt, etag)
+            return excerpt
+
+
+class SearchPager:
+    """
+    Lazy iterator over the results of one search, page by page.
+    
+    Pages follow the Link header's rel="next" URL (the page number when a
+    page came from the cache) up to GitHub's 1000-result cap, and their
+    items are yielded as soon as each page arrives. With ``prefetch``, the
+    next page is requested on the transport loop before the current one is
+    handed out, so a caller that scores as it goes rarely waits on GitHub.
+    Each page goes through the search rate-limit scheduler and the response
+    cache like any other search: a deep scan slows down near the limit
+    instead of failing, and a rate-limit error ends it.
+    
+    Stop early by breaking out of the loop; at most the one prefetched page
+    is wasted (it still lands in the cache). ``total_count``, ``pages``,
+    ``fetched`` and ``error`` describe the scan so far.
+    """
+    
+    # GitHub serves at most the first 1000 results of a search
+    MAX_RESULTS = 1000
+    
+    def __init__(self, api: GitHubAPI, query: str, sort: str = "stars", order: str = "desc",
+                 per_page: int = 100, max_results: int = MAX_RESULTS, prefetch: bool = True):
+        self.api = api
+        self.query = query
+        self.params = {"q": query, "sort": sort, "order": order, "per_page": max(1, min(per_page, 100))}
+        self.max_results = max(0, min(max_results, self.MAX_RESULTS))
+        self.prefetch = prefetch
+        self.total_count: Optional[int] = None
+        self.incomplete_results = False
+        self.pages = 0
+        self.fetched = 0
+        self.error: Optional[str] = None
+    
+    def _next_page(self, result: dict) -> Optional[tuple[str, Optional[dict]]]:
+        """(url, params) of the page after the last one fetched, or None at the end."""
+        per_page = self.params["per_page"]
+        if len(result["items"]) < per_page or self.pages * per_page >= min(self.total_count, self.max_results):
             return None
+        url = f"{self.api.base_url}/search/repositories"
+        page = self.pages + 1
+        # Security: only follow links back to the API the token belongs to
+        if result.get("next") and result["next"].startswith(url + "?"):
+            target = parse_qs(urlparse(result["next"]).query).get("page", [""])[0]
+            if not target.isdigit():
+                return result["next"], None
+            # Same params as a page-number request, so both share one cache entry
+            page = int(target)
+        return url, {**self.params, "page": page}
+    
+    def _submit(self, request: tuple[str, Optional[dict]]):
+        return self.api.http.submit(self.api._asearch_page(*request))
+    
+    def __iter__(self) -> Iterator[Repo]:
+        if not self.max_results:
+            return
+        pending = self._submit((f"{self.api.base_url}/search/repositories", dict(self.params)))
+        try:
+            while pending is not None:
+                result = pending.result()
+                pending = None
+                if "error" in result:
+                    self.error = result["error"]
+                    return
+                self.pages += 1
+                self.total_count = result["total_count"]
+                self.incomplete_results = self.incomplete_results or result["incomplete_results"]
+                
+                request = self._next_page(result)
+                if request and self.prefetch:
+                    pending = self._submit(request)
+                for repo in result["items"][:self.max_results - self.fetched]:
+                    self.fetched += 1
+                    yield repo
+                if request and not self.prefetch:
+                    pending = self._submit(request)
+        finally:
+            # Stopped early: drop the prefetched page if it hasn't started
+            if pending is not None:
+                pending.cancel()
+    
+    def stats(self) -> dict:
+        """Describe the scan (for subquery stats and logs)."""
+        return {
+            "query": self.query,
+            "pages": self.pages,
+            "fetched": self.fetched,
+            "total_count": self.total_count,
+            "incomplete_results": self.incomplete_results,
+            "error": self.error
+        }
 
 
-# Global instance
-github = GitHubAPI()
+# Global instance (built on first use)
+github = LazyObject(GitHubAPI)
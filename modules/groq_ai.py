@@ -1,58 +1,301 @@
 """
 RepoHunter - Groq AI Integration
-AI-powered repository analysis and ranking using Groq Cloud.
+AI-powered repository analysis and ranking (Groq Cloud by default, see llm.py).
 """
 
+import hashlib
 import json
-from groq import Groq
+import math
+from typing import Any, Callable, Optional
+from .cache import DiskCache
 from .config import config
+from .jsonparse import ArrayItemStream, parse_json, validate
+from .lazy import LazyObject
+from .llm import LLMBackend, create_backend
+from .metrics import tracer
+from .models import ground_ranking
+from .prompts import candidate_table, readme_excerpt
+from .ranking import local_ranking
+from .search import DOMAIN_TOPICS, DOMAIN_WORDS, LANGUAGE_WORDS
+from .text import jaccard, normalize_query, shingles
+
+# Language and domain words, normalized like cache keys: near-duplicate
+# queries that differ in one of them ask for different tools
+DISTINCTIVE_TOKENS = {
+    normalize_query(word) for word in (*LANGUAGE_WORDS, *DOMAIN_WORDS, *" ".join(DOMAIN_TOPICS).split())
+} - {""}
 
 
 class GroqAI:
-    """Groq AI client for intelligent repository analysis."""
+    """
+    AI client for intelligent repository analysis.
+    
+    Completions go through a pluggable LLMBackend (Groq, OpenAI-compatible,
+    mock or replay) and each task uses its own model from config.models.
+    """
+    
+    # Query profiles are stable, so reuse them for a week
+    PROFILE_TTL = 7 * 24 * 60 * 60
+    # Rankings only change when the candidate set does; the TTL bounds drift
+    RANKING_TTL = 24 * 60 * 60
+    
+    # Profile fields that influence ranking
+    PROFILE_KEYS = ("domain", "tool_type", "language", "skill_tier", "search_terms", "query_summary")
     
-    MODEL = "llama-3.3-70b-versatile"
+    # Expected answer shapes (validated with jsonparse.validate)
+    PROFILE_SCHEMA = {
+        "type": "object",
+        "required": ["search_terms"],
+        "properties": {
+            "domain": {"type": "string"},
+            "tool_type": {"type": "string"},
+            "language": {"type": "string"},
+            "skill_tier": {"type": "string"},
+            "search_terms": {"type": "string"},
+            "alt_terms": {"type": "array", "items": {"type": "string"}},
+            "query_summary": {"type": "string"}
+        }
+    }
+    RANKED_REPO_SCHEMA = {
+        "type": "object",
+        "required": ["name"],
+        "properties": {
+            "rank": {"type": "integer"},
+            "name": {"type": "string"},
+            "url": {"type": "string"},
+            "language": {"type": "string"},
+            "stars": {"type": ["integer", "string"]},
+            "forks": {"type": ["integer", "string"]},
+            "updated": {"type": "string"},
+            "summary": {"type": "string"},
+            "why": {"type": "string"}
+        }
+    }
+    RANKING_SCHEMA = {
+        "type": "object",
+        "required": ["ranked_repos"],
+        "properties": {
+            "ranked_repos": {"type": "array", "items": RANKED_REPO_SCHEMA},
+            "notes": {"type": "array", "items": {"type": "string"}},
+            "recommendation": {"type": "string"}
+        }
+    }
+    # Fused mode: the profile and the ranking in one answer
+    FUSED_SCHEMA = {
+        "type": "object",
+        "required": ["profile", "ranked_repos"],
+        "properties": {"profile": PROFILE_SCHEMA, **RANKING_SCHEMA["properties"]}
+    }
+    INSTALL_SCHEMA = {
+        "type": "object",
+        "required": ["steps"],
+        "properties": {"steps": {"type": "array", "minItems": 1, "items": {"type": "string"}}}
+    }
+    
+    REPAIR_PROMPT = """You fix malformed JSON written by another model.
+Return ONLY the corrected JSON value, no markdown or comments.
+Keep all the content that is there: fix the syntax, finish truncated structures
+and match the expected shape."""
+
+    def __init__(self, backend: Optional[LLMBackend] = None):
+        self.backend = backend or create_backend()
+        self.models = dict(config.models)
+        
+        # Mock and replayed answers get their own caches so they never leak into real runs
+        suffix = "-offline" if self.backend.synthetic else ""
+        self.profile_cache = DiskCache(f"profiles{suffix}", max_bytes=4 * 1024 * 1024)
+        self.ranking_cache = DiskCache(f"rankings{suffix}", max_bytes=16 * 1024 * 1024, memory_entries=64)
+    
+    def _ranking_key(self, profile: dict, repos: list, task: str = "rank") -> str:
+        """
+        Fingerprint a ranking request.
+        
+        Candidates are reduced to name, last push day and a logarithmic
+        star bucket (~78% steps), so small star drifts or repeat pushes on
+        the same day don't invalidate the cached ranking.
+        
+        Args:
+            profile: Analyzed profile
+            repos: Candidate repositories sent to the model
+            task: "rank", or "fused" for a combined profile + ranking
+            
+        Returns:
+            Hex digest
+        """
+        candidates = sorted(
+            (repo.full_name, repo.updated, round(math.log10(repo.stars + 1) * 4))
+            for repo in repos
+        )
+        fingerprint = {
+            "task": task,
+            "model": self.models[task],
+            "profile": {key: profile.get(key, "") for key in self.PROFILE_KEYS},
+            "candidates": candidates
+        }
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()
+    
+    def _cached_profile(self, key: str) -> Optional[dict]:
+        """
+        Look up a cached profile by normalized query.
+        
+        Tries the exact key first, then the most similar recent query
+        above the configured similarity threshold (character-trigram
+        Jaccard). A near match is refused when the two queries' tokens
+        differ in any language or domain word: "c2 framework in go" and
+        "... in rust", or "sql" and "nosql" scanners, score above 0.8 but
+        need different profiles.
+        
+        Args:
+            key: Normalized query from normalize_query()
+            
+        Returns:
+            Cached profile or None
+        """
+        entry = self.profile_cache.get(key)
+        if entry:
+            return entry.value
+        
+        if config.query_similarity >= 1.0:
+            return None
+        
+        target = shingles(key)
+        tokens = set(key.split())
+        best_key, best_score = None, config.query_similarity
+        for candidate in self.profile_cache.recent_keys():
+            if (tokens ^ set(candidate.split())) & DISTINCTIVE_TOKENS:
+                continue
+            score = jaccard(target, shingles(candidate))
+            if score >= best_score:
+                best_key, best_score = candidate, score
+        
+        if best_key is None:
+            return None
+        
+        entry = self.profile_cache.get(best_key)
+        if entry:
+            self.profile_cache.count("similar")
+            return entry.value
+        return None
     
-    def __init__(self):
-        self.client = None
-        if config.groq_api_key:
-            self.client = Groq(api_key=config.groq_api_key)
+    def _call_ai(self, system_prompt: str, user_prompt: str, task: str) -> str:
+        """
+        Make a call to the AI backend.
+        
+        Args:
+            system_prompt: System message
+            user_prompt: User message
+            task: Pipeline step ("analyze", "rank", "install"), selects the model
+        """
+        if not self.backend.available:
+            return json.dumps({"error": self.backend.unavailable_reason})
+        
+        with tracer.span(f"llm.{task}", task=task, model=self.models[task], backend=self.backend.name) as span:
+            try:
+                return self.backend.complete(
+                    system_prompt, user_prompt, self.models[task], task, json_mode=config.json_mode
+                )
+            except Exception as e:
+                span.error = type(e).__name__
+                return f'{{"error": "{self._safe_error(e)}"}}'
     
-    def _call_ai(self, system_prompt: str, user_prompt: str) -> str:
-        """Make a call to Groq AI."""
-        if not self.client:
-            return '{"error": "Groq API key not configured"}'
+    def _call_ai_stream(self, system_prompt: str, user_prompt: str, task: str):
+        """
+        Make a streaming call to the AI backend.
+        
+        Yields:
+            Text chunks as they are generated. Errors are reported the same
+            way as _call_ai, as a JSON error object.
+        """
+        if not self.backend.available:
+            yield json.dumps({"error": self.backend.unavailable_reason})
+            return
         
+        with tracer.span(f"llm.{task}", task=task, model=self.models[task], backend=self.backend.name,
+                         stream=True) as span:
+            try:
+                for chunk in self.backend.stream(
+                    system_prompt, user_prompt, self.models[task], task, json_mode=config.json_mode
+                ):
+                    if "ttft_ms" not in span.attrs:
+                        span.set(ttft_ms=round(span.elapsed_ms(), 1))
+                    yield chunk
+            except Exception as e:
+                span.error = type(e).__name__
+                yield f'{{"error": "{self._safe_error(e)}"}}'
+    
+    def _safe_error(self, error: Exception) -> str:
+        """Map an API exception to a message that exposes no keys or internal details."""
+        # Security: Sanitize error message - don't expose API keys or internal details
+        error_msg = str(error)
+        if "api_key" in error_msg.lower() or "key" in error_msg.lower():
+            return f"API authentication failed. Check your {self.backend.key_name or 'API key'}."
+        elif "rate" in error_msg.lower():
+            return "Rate limit reached. Please wait and try again."
+        elif "timeout" in error_msg.lower():
+            return "Request timed out. Check your connection."
+        return "AI service temporarily unavailable."
+    
+    @staticmethod
+    def _is_error(text: str) -> bool:
+        """Check if a completion is an error payload from _call_ai."""
+        try:
+            value = json.loads(text)
+        except (json.JSONDecodeError, TypeError):
+            return False
+        return isinstance(value, dict) and list(value) == ["error"]
+    
+    @staticmethod
+    def _decode(text: str, schema: dict, salvage: Optional[Callable[[Any], Any]]) -> tuple[Any, list[str]]:
+        """Decode and validate a completion, returning (value, problems)."""
         try:
-            response = self.client.chat.completions.create(
-                model=self.MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            # Security: Sanitize error message - don't expose API keys or internal details
-            error_msg = str(e)
-            if "api_key" in error_msg.lower() or "key" in error_msg.lower():
-                error_msg = "API authentication failed. Check your GROQ_API_KEY."
-            elif "rate" in error_msg.lower():
-                error_msg = "Rate limit reached. Please wait and try again."
-            elif "timeout" in error_msg.lower():
-                error_msg = "Request timed out. Check your connection."
-            else:
-                error_msg = "AI service temporarily unavailable."
-            return f'{{"error": "{error_msg}"}}'
+            value = parse_json(text)
+        except ValueError as e:
+            return None, [str(e)]
+        if salvage:
+            value = salvage(value)
+        return value, validate(value, schema)
+    
+    def _parse_response(self, text: str, schema: dict, salvage: Optional[Callable[[Any], Any]] = None) -> Any:
+        """
+        Decode a completion and validate it against a schema.
+        
+        Prose, markdown fences, trailing commas and truncation are handled
+        locally (see jsonparse.parse_json). Output that is still unusable
+        gets one small repair call that only sees the broken answer, rather
+        than the whole task being run again.
+        
+        Args:
+            text: Completion text
+            schema: Expected shape
+            salvage: Optional function that drops or reshapes invalid parts
+                of a decoded value (e.g. malformed list entries)
+                
+        Returns:
+            Valid value, or None for error payloads and unrepairable output
+        """
+        value, problems = self._decode(text, schema, salvage)
+        if not problems:
+            return value
+        if not config.json_repair or not (text or "").strip() or self._is_error(text):
+            return None
+        
+        user_prompt = (
+            f"Expected shape (JSON Schema): {json.dumps(schema, separators=(',', ':'))}\n"
+            f"Problems: {'; '.join(problems[:5])}\n"
+            f"JSON:\n{text[:6000]}"
+        )
+        fixed = self._call_ai(self.REPAIR_PROMPT, user_prompt, "repair")
+        if self._is_error(fixed):
+            return None
+        value, problems = self._decode(fixed, schema, salvage)
+        return None if problems else value
     
     def analyze_query(self, user_query: str) -> dict:
         """
         Analyze user query to detect profile and ideal tool characteristics.
         
         Returns:
-            dict with domain, tool_type, language, skill_tier, search_terms
+            dict with domain, tool_type, language, skill_tier, search_terms, alt_terms
         """
         system_prompt = """You are a cybersecurity and development tools expert.
 Analyze the user's query and extract:
@@ -61,64 +304,159 @@ Analyze the user's query and extract:
 3. language: python / go / rust / javascript / c / multi (if no preference)
 4. skill_tier: beginner / intermediate / advanced
 5. search_terms: optimal GitHub search query (2-5 keywords)
-6. query_summary: clear 1-line technical summary of what user wants
+6. alt_terms: 2 alternative GitHub search queries using synonyms or related tool names (2-4 keywords each)
+7. query_summary: clear 1-line technical summary of what user wants
 
 Respond ONLY with valid JSON, no markdown:
-{"domain": "", "tool_type": "", "language": "", "skill_tier": "", "search_terms": "", "query_summary": ""}"""
+{"domain": "", "tool_type": "", "language": "", "skill_tier": "", "search_terms": "", "alt_terms": ["", ""], "query_summary": ""}"""
 
-        result = self._call_ai(system_prompt, user_query)
+        cache_key = normalize_query(user_query)
+        if cache_key:
+            cached = self._cached_profile(cache_key)
+            if cached:
+                return cached
         
-        try:
-            # Try to parse JSON from response
-            result = result.strip()
-            if result.startswith("```"):
-                result = result.split("```")[1]
-                if result.startswith("json"):
-                    result = result[4:]
-            return json.loads(result)
-        except json.JSONDecodeError:
-            # Security: Sanitize user query before using as fallback
-            safe_query = ''.join(c for c in user_query if c.isalnum() or c.isspace())[:100]
-            return {
-                "domain": "general",
-                "tool_type": "cli",
-                "language": "multi",
-                "skill_tier": "intermediate",
-                "search_terms": safe_query,
-                "query_summary": safe_query
-            }
-    
-    def rank_repositories(self, user_query: str, profile: dict, repos: list) -> dict:
+        result = self._call_ai(system_prompt, user_query, "analyze")
+        profile = self._parse_response(result, self.PROFILE_SCHEMA)
+        if profile is not None and profile["search_terms"].strip():
+            # Only cache real analyses, never error payloads
+            if cache_key:
+                self.profile_cache.put(cache_key, profile, self.PROFILE_TTL)
+            return profile
+        
+        # Security: Sanitize user query before using as fallback
+        safe_query = ''.join(c for c in user_query if c.isalnum() or c.isspace())[:100]
+        return {
+            "domain": "general",
+            "tool_type": "cli",
+            "language": "multi",
+            "skill_tier": "intermediate",
+            "search_terms": safe_query,
+            "query_summary": safe_query
+        }
+    
+    def rank_repositories(self, user_query: str, profile: dict, repos: list, fused: bool = False) -> dict:
         """
         Rank and analyze repositories based on user needs.
         
         Args:
             user_query: Original user query
-            profile: Analyzed profile from analyze_query
-            repos: List of repositories from GitHub API
+            profile: Analyzed profile from analyze_query (in fused mode, the
+                heuristic profile the candidates were retrieved with)
+            repos: List of repositories from GitHub API, best candidates
+                first (only the top config.rank_top_k are sent to the model)
+            fused: Have the same call analyze the query and return its profile
             
         Returns:
-            dict with ranked_repos, notes, recommendation
-        """
-        # Prepare repo data for AI
-        repo_data = []
-        for i, repo in enumerate(repos[:10]):  # Max 10 repos
-            repo_data.append({
-                "index": i + 1,
-                "name": repo.get("full_name", ""),
-                "description": repo.get("description", "")[:200] if repo.get("description") else "",
-                "stars": repo.get("stargazers_count", 0),
-                "language": repo.get("language", "Unknown"),
-                "updated": repo.get("updated_at", "")[:10],
-                "url": repo.get("html_url", "")
-            })
+            dict with ranked_repos, notes, recommendation (and profile when fused)
+        """
+        task = "fused" if fused else "rank"
+        repos = repos[:config.rank_top_k]
+        cache_key = self._ranking_key(profile, repos, task)
+        cached = self.ranking_cache.get(cache_key)
+        if cached:
+            return ground_ranking(cached.value, repos)
+        
+        system_prompt, user_prompt = self._ranking_prompts(user_query, profile, repos, fused)
+        result = self._call_ai(system_prompt, user_prompt, task)
+        # Entries carry the candidates' own url, stars, ... rather than the model's copy
+        return ground_ranking(self._parse_ranking(result, user_query, profile, repos, cache_key, fused), repos)
+    
+    def rank_repositories_stream(self, user_query: str, profile: dict, repos: list, fused: bool = False):
+        """
+        Rank repositories, yielding each ranked entry as soon as it arrives.
+        
+        In fused mode the model also analyzes the query: its answer starts
+        with the profile, which is yielded once before the first entry
+        (this replaces the separate analyze_query call, see
+        RepoHunter.pipeline).
+        
+        Args:
+            user_query: Original user query
+            profile: Analyzed profile from analyze_query (heuristic profile when fused)
+            repos: List of repositories, best candidates first
+            fused: Ask for the profile and the ranking in one call
+            
+        Yields:
+            ("profile", profile) first when fused, then ("repo", entry) for
+            every valid ranked repository in rank order (malformed entries
+            are dropped, as in rank_repositories), then ("result", ranking)
+            with the complete rank_repositories dict
+        """
+        task = "fused" if fused else "rank"
+        repos = repos[:config.rank_top_k]
+        cache_key = self._ranking_key(profile, repos, task)
+        cached = self.ranking_cache.get(cache_key)
+        if cached:
+            ranked = ground_ranking(cached.value, repos)
+            if fused:
+                yield "profile", ranked.get("profile") or profile
+            for entry in ranked["ranked_repos"]:
+                yield "repo", entry
+            yield "result", ranked
+            return
+        
+        candidates = {repo.full_name.lower(): repo for repo in repos}
+        
+        system_prompt, user_prompt = self._ranking_prompts(user_query, profile, repos, fused)
+        parser = ArrayItemStream("ranked_repos")
+        streamed = []
+        for chunk in self._call_ai_stream(system_prompt, user_prompt, task):
+            for entry in parser.feed(chunk):
+                if validate(entry, self.RANKED_REPO_SCHEMA):
+                    # Dropped here as _parse_ranking drops it, so the two lists still agree
+                    continue
+                if fused and not streamed:
+                    # The profile object is complete once the array has started
+                    yield "profile", self._partial_profile(parser.buffer) or profile
+                streamed.append(entry)
+                repo = candidates.get(str(entry.get("name", "")).lower())
+                yield "repo", repo.ground(entry) if repo else entry
+        
+        ranked = self._parse_ranking(parser.buffer, user_query, profile, repos, cache_key, fused)
+        if fused and not streamed:
+            yield "profile", ranked.get("profile") or profile
+        if streamed and ranked.get("ranked_repos") != streamed:
+            # Completion was cut off or malformed after some entries: keep what arrived
+            ranked = {"ranked_repos": streamed, "notes": [], "recommendation": ""}
+            if fused:
+                ranked["profile"] = self._partial_profile(parser.buffer) or profile
+        ranked = ground_ranking(ranked, repos)
+        if not streamed:
+            for entry in ranked["ranked_repos"]:
+                yield "repo", entry
+        yield "result", ranked
+    
+    def _partial_profile(self, text: str) -> Optional[dict]:
+        """Decode the profile at the start of a (possibly unfinished) fused answer."""
+        try:
+            value = parse_json(text)
+        except ValueError:
+            return None
+        profile = value.get("profile") if isinstance(value, dict) else None
+        if validate(profile, self.PROFILE_SCHEMA) or not profile["search_terms"].strip():
+            return None
+        return profile
+    
+    def _ranking_prompts(self, user_query: str, profile: dict, repos: list, fused: bool = False) -> tuple[str, str]:
+        """
+        Build the system and user prompts for ranking.
+        
+        Candidates are sent as a compact table (see prompts.candidate_table)
+        sized to config.rank_token_budget, and the profile as minified JSON.
+        Fused prompts ask for the profile as well instead of sending one.
+        """
+        table = candidate_table(repos, config.rank_token_budget)
+        if fused:
+            return self._fused_prompts(user_query, table)
+        summary = {key: profile[key] for key in self.PROFILE_KEYS if profile.get(key)}
         
         system_prompt = """You are RepoHunter, an expert curator of GitHub tools for cybersecurity and development.
 Your job is to rank repositories by PRACTICAL VALUE, not hype.
 
 CRITICAL RULES:
 - NEVER invent repositories or URLs
-- Only use the repos provided in the input
+- Only use the repos provided in the input (one per table row; the url of owner/repo is https://github.com/owner/repo)
 - Rank by: active maintenance, practical use, code quality, community trust
 - Filter out abandoned or low-quality projects
 - Be honest if no good options exist
@@ -145,38 +483,109 @@ Respond ONLY with valid JSON (no markdown):
 Return TOP 5 maximum. If less than 3 good options, return fewer."""
 
         user_prompt = f"""User Query: {user_query}
-Profile: {json.dumps(profile)}
+Profile: {json.dumps(summary, separators=(",", ":"))}
 Available Repositories:
-{json.dumps(repo_data, indent=2)}
+{table}
 
 Rank these repositories for the user's specific needs."""
 
-        result = self._call_ai(system_prompt, user_prompt)
+        return system_prompt, user_prompt
+    
+    @staticmethod
+    def _fused_prompts(user_query: str, table: str) -> tuple[str, str]:
+        """Build the prompts of a combined analyze + rank call."""
+        system_prompt = """You are RepoHunter, an expert curator of GitHub tools for cybersecurity and development.
+First analyze what the user wants, then rank the candidate repositories by PRACTICAL VALUE, not hype.
+
+Profile fields:
+- domain: web / osint / red team / blue team / network / mobile / forensics / malware / devops / general
+- tool_type: scanner / framework / cli / library / exploit / automation
+- language: python / go / rust / javascript / c / multi (if no preference)
+- skill_tier: beginner / intermediate / advanced
+- search_terms: optimal GitHub search query (2-5 keywords)
+- alt_terms: 2 alternative GitHub search queries
+- query_summary: clear 1-line technical summary of what user wants
+
+CRITICAL RULES:
+- NEVER invent repositories or URLs
+- Only use the repos provided in the input (one per table row; the url of owner/repo is https://github.com/owner/repo)
+- Rank by: fit for the analyzed need, active maintenance, practical use, community trust
+- Filter out abandoned, low-quality or off-topic projects
+- Be honest if no good options exist
+
+Respond ONLY with valid JSON (no markdown), profile first:
+{
+  "profile": {"domain": "", "tool_type": "", "language": "", "skill_tier": "", "search_terms": "", "alt_terms": ["", ""], "query_summary": ""},
+  "ranked_repos": [
+    {
+      "rank": 1,
+      "name": "owner/repo",
+      "url": "https://github.com/...",
+      "language": "Python",
+      "stars": 12500,
+      "forks": 2300,
+      "updated": "2024-12-20",
+      "summary": "What it does in 1-2 clear lines",
+      "why": "Why it's the best choice for this use case"
+    }
+  ],
+  "notes": ["requirement 1", "limitation 1"],
+  "recommendation": "Expert advice on which to use first and why"
+}
+
+Return TOP 5 maximum. If less than 3 good options, return fewer."""
+
+        user_prompt = f"""User Query: {user_query}
+Available Repositories:
+{table}
+
+Analyze the query, then rank these repositories for the user's specific needs."""
+
+        return system_prompt, user_prompt
+    
+    @classmethod
+    def _valid_entries(cls, ranked: Any) -> Any:
+        """Drop malformed ranked_repos entries so the rest of a ranking survives."""
+        if isinstance(ranked, dict) and isinstance(ranked.get("ranked_repos"), list):
+            ranked["ranked_repos"] = [
+                entry for entry in ranked["ranked_repos"] if not validate(entry, cls.RANKED_REPO_SCHEMA)
+            ]
+        return ranked
+    
+    def _parse_ranking(self, result: str, user_query: str, profile: dict, repos: list, cache_key: str,
+                       fused: bool = False) -> dict:
+        """
+        Parse a ranking completion, caching good results and falling back to local ranking.
         
-        try:
-            result = result.strip()
-            if result.startswith("```"):
-                result = result.split("```")[1]
-                if result.startswith("json"):
-                    result = result[4:]
-            return json.loads(result)
-        except json.JSONDecodeError:
-            # Fallback: return basic ranking
-            ranked = []
-            for repo in repos[:5]:
-                ranked.append({
-                    "rank": len(ranked) + 1,
-                    "name": repo.get("full_name", "Unknown"),
-                    "url": repo.get("html_url", ""),
-                    "language": repo.get("language", "Unknown"),
-                    "summary": repo.get("description", "No description")[:100],
-                    "why": f"Has {repo.get('stargazers_count', 0)} stars"
-                })
-            return {
-                "ranked_repos": ranked,
-                "notes": ["AI analysis unavailable, showing by star count"],
-                "recommendation": "Review each repository manually"
-            }
+        A fused answer's profile is also stored in the profile cache, so the
+        two-call pipeline can reuse it; when the profile is missing or
+        malformed the heuristic one is kept and the ranking still counts.
+        """
+        if fused:
+            def salvage(value):
+                value = self._valid_entries(value)
+                if isinstance(value, dict) and validate(value.get("profile"), self.PROFILE_SCHEMA):
+                    value["profile"] = profile
+                return value
+            ranked = self._parse_response(result, self.FUSED_SCHEMA, salvage)
+        else:
+            ranked = self._parse_response(result, self.RANKING_SCHEMA, self._valid_entries)
+        if ranked is not None:
+            if ranked["ranked_repos"]:
+                self.ranking_cache.put(cache_key, ranked, self.RANKING_TTL)
+            if fused and ranked["profile"] is not profile and ranked["profile"]["search_terms"].strip():
+                cache_key = normalize_query(user_query)
+                if cache_key:
+                    self.profile_cache.put(cache_key, ranked["profile"], self.PROFILE_TTL)
+            return ranked
+        
+        # Fallback: rank locally
+        ranked = local_ranking(repos, profile, user_query)
+        ranked["notes"] = ["AI analysis unavailable, ranked locally instead"]
+        ranked["recommendation"] = "Review each repository manually"
+        if fused:
+            ranked["profile"] = profile
+        return ranked
     
     def get_install_steps(self, repo_name: str, language: str, readme: str = None) -> list:
         """
@@ -190,14 +599,15 @@ Rank these repositories for the user's specific needs."""
         Returns:
             List of installation command strings
         """
-        readme_context = f"\nREADME excerpt:\n{readme[:1000]}" if readme else ""
+        excerpt = readme_excerpt(readme, config.install_token_budget) if readme else ""
+        readme_context = f"\nREADME excerpt:\n{excerpt}" if excerpt else ""
         
         system_prompt = """You are a developer tools expert.
 Generate 2-4 practical installation/setup commands for this repository.
 Base your suggestions on the language and any README content provided.
 
-Respond ONLY with a JSON array of command strings:
-["command 1", "command 2"]
+Respond ONLY with a JSON object holding the command strings:
+{"steps": ["command 1", "command 2"]}
 
 Keep commands simple and practical. Common patterns:
 - Python: pip install -r requirements.txt, python setup.py install
@@ -208,28 +618,26 @@ Keep commands simple and practical. Common patterns:
 
         user_prompt = f"Repository: {repo_name}\nLanguage: {language}{readme_context}"
         
-        result = self._call_ai(system_prompt, user_prompt)
+        result = self._call_ai(system_prompt, user_prompt, "install")
+        # A bare array is accepted too
+        parsed = self._parse_response(
+            result, self.INSTALL_SCHEMA, lambda value: {"steps": value} if isinstance(value, list) else value
+        )
+        if parsed is not None:
+            return parsed["steps"]
         
-        try:
-            result = result.strip()
-            if result.startswith("```"):
-                result = result.split("```")[1]
-                if result.startswith("json"):
-                    result = result[4:]
-            return json.loads(result)
-        except json.JSONDecodeError:
-            # Default fallback based on language
-            fallbacks = {
-                "Python": ["pip install -r requirements.txt"],
-                "Go": ["go build"],
-                "JavaScript": ["npm install"],
-                "TypeScript": ["npm install", "npm run build"],
-                "Rust": ["cargo build --release"],
-                "C": ["make"],
-                "C++": ["make"]
-            }
-            return fallbacks.get(language, ["# Check README for setup instructions"])
-
-
-# Global instance
-groq_ai = GroqAI()
+        # Default fallback based on language
+        fallbacks = {
+            "Python": ["pip install -r requirements.txt"],
+            "Go": ["go build"],
+            "JavaScript": ["npm install"],
+            "TypeScript": ["npm install", "npm run build"],
+            "Rust": ["cargo build --release"],
+            "C": ["make"],
+            "C++": ["make"]
+        }
+        return fallbacks.get(language, ["# Check README for setup instructions"])
+
+
+# Global instance (built on first use)
+groq_ai = LazyObject(GroqAI)
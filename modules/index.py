@@ -0,0 +1,530 @@
+"""
+RepoHunter - Local Repository Index
+Offline full-text (FTS5/BM25) and metadata search over crawled repositories.
+"""
+
+import calendar
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from .config import config
+from .lazy import LazyObject
+from .models import Repo
+from .search import DOMAIN_TOPICS
+from .text import STOPWORDS, tokenize
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def _parse_time(value: str) -> int:
+    """Seconds since the epoch of a UTC timestamp (YYYY-MM-DDTHH:MM:SSZ)."""
+    return calendar.timegm(time.strptime(value, TIME_FORMAT))
+
+
+def _format_time(seconds: int) -> str:
+    """UTC timestamp (YYYY-MM-DDTHH:MM:SSZ) of seconds since the epoch."""
+    return time.strftime(TIME_FORMAT, time.gmtime(seconds))
+
+
+class RepoIndex:
+    """
+    SQLite index of repositories seen in GitHub results.
+    
+    Metadata lives in plain columns (for filtering), while name,
+    description, topics and README text are mirrored into an FTS5 table
+    by triggers and ranked with BM25. The index grows from every live
+    search and from ``refresh()``, which crawls each domain topic
+    incrementally from its last sync time.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS repos (
+            full_name TEXT PRIMARY KEY COLLATE NOCASE,
+            description TEXT NOT NULL DEFAULT '',
+            html_url TEXT NOT NULL DEFAULT '',
+            language TEXT,
+            topics TEXT NOT NULL DEFAULT '',
+            stars INTEGER NOT NULL DEFAULT 0,
+            forks INTEGER NOT NULL DEFAULT 0,
+            open_issues INTEGER NOT NULL DEFAULT 0,
+            archived INTEGER NOT NULL DEFAULT 0,
+            fork INTEGER NOT NULL DEFAULT 0,
+            license TEXT,
+            pushed_at TEXT,
+            updated_at TEXT,
+            readme TEXT,
+            indexed_at REAL NOT NULL  -- change sequence: grows with every change of the searchable text
+        );
+        CREATE INDEX IF NOT EXISTS idx_repos_language ON repos (language);
+        CREATE INDEX IF NOT EXISTS idx_repos_stars ON repos (stars);
+        CREATE INDEX IF NOT EXISTS idx_repos_pushed ON repos (pushed_at);
+        CREATE INDEX IF NOT EXISTS idx_repos_indexed ON repos (indexed_at);
+
+        CREATE VIRTUAL TABLE IF NOT EXISTS repos_fts USING fts5(
+            full_name, description, topics, readme,
+            content='repos', tokenize='porter unicode61'
+        );
+        CREATE TRIGGER IF NOT EXISTS repos_ai AFTER INSERT ON repos BEGIN
+            INSERT INTO repos_fts (rowid, full_name, description, topics, readme)
+            VALUES (new.rowid, new.full_name, new.description, new.topics, new.readme);
+        END;
+        CREATE TRIGGER IF NOT EXISTS repos_ad AFTER DELETE ON repos BEGIN
+            INSERT INTO repos_fts (repos_fts, rowid, full_name, description, topics, readme)
+            VALUES ('delete', old.rowid, old.full_name, old.description, old.topics, old.readme);
+        END;
+        CREATE TRIGGER IF NOT EXISTS repos_au AFTER UPDATE ON repos BEGIN
+            INSERT INTO repos_fts (repos_fts, rowid, full_name, description, topics, readme)
+            VALUES ('delete', old.rowid, old.full_name, old.description, old.topics, old.readme);
+            INSERT INTO repos_fts (rowid, full_name, description, topics, readme)
+            VALUES (new.rowid, new.full_name, new.description, new.topics, new.readme);
+        END;
+
+        CREATE TABLE IF NOT EXISTS sync_state (
+            topic TEXT PRIMARY KEY,
+            last_sync TEXT NOT NULL
+        );
+    """
+    
+    # BM25 column weights: full_name, description, topics, readme
+    BM25_WEIGHTS = (10.0, 5.0, 3.0, 1.0)
+    
+    # Columns read back into repository records (see _row_to_repo)
+    COLUMNS = (
+        "repos.full_name, repos.description, repos.html_url, repos.language, "
+        "repos.topics, repos.stars, repos.forks, repos.open_issues, repos.archived, "
+        "repos.fork, repos.license, repos.pushed_at, repos.updated_at, repos.readme"
+    )
+    
+    # Search results per crawl page (GitHub maximum)
+    PAGE_SIZE = 100
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or config.index_path
+        self._lock = threading.Lock()
+        self._conn = None
+        
+        if config.index_enabled:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+                self._conn.executescript(self.SCHEMA)
+            except (OSError, sqlite3.Error):
+                # No FTS5 or unusable disk - searches go straight to GitHub
+                self._conn = None
+    
+    @property
+    def enabled(self) -> bool:
+        """Check if the index has a usable backing store."""
+        return self._conn is not None
+    
+    def upsert(self, repos: list[Repo], readmes: Optional[dict] = None) -> int:
+        """
+        Add or update repositories.
+        
+        Args:
+            repos: Repository records
+            readmes: Optional dict of full_name -> README text
+            
+        Returns:
+            Number of repositories written
+        """
+        if not self.enabled:
+            return 0
+        
+        readmes = readmes or {}
+        rows = []
+        for repo in repos:
+            rows.append((
+                repo.full_name,
+                repo.description,
+                repo.url,
+                repo.language,
+                " ".join(repo.topics),
+                repo.stars,
+                repo.forks,
+                repo.open_issues,
+                int(repo.archived),
+                int(repo.fork),
+                repo.license,
+                repo.pushed_at or None,
+                None,
+                readmes.get(repo.full_name)
+            ))
+        
+        with self._lock:
+            try:
+                with self._conn:
+                    # Sequence numbers are taken inside the lock, one per row, so they
+                    # follow commit order and a reader's cursor never skips a change
+                    last = self._conn.execute("SELECT COALESCE(MAX(indexed_at), 0) FROM repos").fetchone()[0]
+                    rows = [(*row, last + number) for number, row in enumerate(rows, 1)]
+                    self._conn.executemany(
+                        """
+                        INSERT INTO repos (full_name, description, html_url, language, topics,
+                                           stars, forks, open_issues, archived, fork, license,
+                                           pushed_at, updated_at, readme, indexed_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT (full_name) DO UPDATE SET
+                            description = excluded.description,
+                            html_url = excluded.html_url,
+                            language = excluded.language,
+                            topics = excluded.topics,
+                            stars = excluded.stars,
+                            forks = excluded.forks,
+                            open_issues = excluded.open_issues,
+                            archived = excluded.archived,
+                            fork = excluded.fork,
+                            license = COALESCE(excluded.license, repos.license),
+                            pushed_at = COALESCE(excluded.pushed_at, repos.pushed_at),
+                            updated_at = COALESCE(excluded.updated_at, repos.updated_at),
+                            readme = COALESCE(excluded.readme, repos.readme),
+                            indexed_at = CASE
+                                WHEN repos.description IS NOT excluded.description
+                                    OR repos.topics IS NOT excluded.topics
+                                    OR repos.readme IS NOT COALESCE(excluded.readme, repos.readme)
+                                THEN excluded.indexed_at ELSE repos.indexed_at
+                            END
+                        """,
+                        rows
+                    )
+            except sqlite3.Error:
+                return 0
+        return len(rows)
+    
+    @staticmethod
+    def _row_to_repo(row: tuple) -> tuple[Repo, Optional[str]]:
+        """Convert a COLUMNS row into a repository record and its README."""
+        (full_name, description, html_url, language, topics, stars, forks,
+         open_issues, archived, fork, license_id, pushed_at, updated_at, readme) = row
+        repo = Repo(
+            full_name, description=description, url=html_url, language=language,
+            topics=topics.split() if topics else (), stars=stars, forks=forks,
+            open_issues=open_issues, archived=archived, fork=fork, license=license_id,
+            pushed_at=pushed_at or updated_at
+        )
+        return repo, readme
+    
+    def get(self, full_names: list[str]) -> dict:
+        """
+        Look up repositories by name.
+        
+        Args:
+            full_names: owner/repo names
+            
+        Returns:
+            dict with "items" (in the requested order, unknown names
+            skipped) and "readmes" (full_name -> README)
+        """
+        response = {"items": [], "readmes": {}}
+        if not self.enabled or not full_names:
+            return response
+        
+        rows = {}
+        with self._lock:
+            for start in range(0, len(full_names), 500):
+                batch = full_names[start:start + 500]
+                placeholders = ", ".join("?" * len(batch))
+                for row in self._conn.execute(
+                    f"SELECT {self.COLUMNS} FROM repos WHERE full_name IN ({placeholders})", batch
+                ):
+                    rows[row[0].lower()] = row
+        
+        for full_name in full_names:
+            row = rows.get(full_name.lower())
+            if row:
+                repo, readme = self._row_to_repo(row)
+                response["items"].append(repo)
+                if readme:
+                    response["readmes"][repo.full_name] = readme
+        return response
+    
+    def documents_since(self, since: float = 0.0) -> list[tuple[str, str, float]]:
+        """
+        Get the searchable text of repositories changed after a cursor.
+        
+        Every upsert that changes a repository's searchable text gives it a
+        new change sequence number (indexed_at), higher than any before, so
+        a reader that resumes after the last number it consumed sees every
+        change exactly once.
+        
+        Args:
+            since: indexed_at of the last document already consumed
+            
+        Returns:
+            (full_name, text, indexed_at) tuples, oldest change first
+        """
+        if not self.enabled:
+            return []
+        with self._lock:
+            return self._conn.execute(
+                """
+                SELECT full_name,
+                       full_name || ' ' || description || ' ' || topics || ' ' || COALESCE(readme, ''),
+                       indexed_at
+                FROM repos WHERE indexed_at > ? ORDER BY indexed_at
+                """,
+                (since,)
+            ).fetchall()
+    
+    @staticmethod
+    def _match_expression(text: str, operator: str) -> str:
+        """Build an FTS5 MATCH expression from free text (every token quoted)."""
+        tokens = [token for token in dict.fromkeys(tokenize(text)) if token not in STOPWORDS]
+        return f" {operator} ".join('"' + token.replace('"', '""') + '"' for token in tokens)
+    
+    def search(
+        self,
+        text: str,
+        limit: int = 30,
+        language: Optional[str] = None,
+        min_stars: int = 0,
+        include_archived: bool = True
+    ) -> dict:
+        """
+        Search the index with BM25 over name, description, topics and README.
+        
+        Repositories matching every keyword come first; if those are fewer
+        than ``limit``, repositories matching any keyword fill the rest.
+        
+        Args:
+            text: Free-text search terms
+            limit: Maximum number of results
+            language: Only repositories in this language
+            min_stars: Minimum star count
+            include_archived: Include archived repositories
+            
+        Returns:
+            dict with "items" (Repo records),
+            "readmes" (full_name -> README), "matched_all" (how many
+            items contain every keyword) and "ms" (query time)
+        """
+        started = time.perf_counter()
+        response = {"items": [], "readmes": {}, "matched_all": 0, "ms": 0.0}
+        if not self.enabled:
+            return response
+        
+        filters = ["repos_fts MATCH ?"]
+        params: list = []
+        if language:
+            filters.append("repos.language = ? COLLATE NOCASE")
+            params.append(language)
+        if min_stars:
+            filters.append("repos.stars >= ?")
+            params.append(min_stars)
+        if not include_archived:
+            filters.append("repos.archived = 0")
+        
+        sql = f"""
+            SELECT {self.COLUMNS}
+            FROM repos_fts JOIN repos ON repos.rowid = repos_fts.rowid
+            WHERE {' AND '.join(filters)}
+            ORDER BY bm25(repos_fts, {', '.join(str(weight) for weight in self.BM25_WEIGHTS)})
+            LIMIT ?
+        """
+        
+        rows = []
+        with self._lock:
+            try:
+                for operator in ("AND", "OR"):
+                    expression = self._match_expression(text, operator)
+                    if not expression or len(rows) >= limit:
+                        break
+                    seen = {row[0] for row in rows}
+                    found = self._conn.execute(sql, [expression, *params, limit]).fetchall()
+                    rows.extend(row for row in found if row[0] not in seen)
+                    if operator == "AND":
+                        response["matched_all"] = min(len(rows), limit)
+            except sqlite3.Error:
+                rows = []
+                response["matched_all"] = 0
+        
+        for row in rows[:limit]:
+            repo, readme = self._row_to_repo(row)
+            response["items"].append(repo)
+            if readme:
+                response["readmes"][repo.full_name] = readme
+        
+        response["ms"] = (time.perf_counter() - started) * 1000
+        return response
+    
+    def last_sync(self, topic: str) -> Optional[str]:
+        """Get the time of the last successful crawl of a topic."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_sync FROM sync_state WHERE topic = ?", (topic,)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def _set_last_sync(self, topic: str, when: str):
+        """Record a successful crawl of a topic."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (topic, last_sync) VALUES (?, ?)",
+                (topic, when)
+            )
+    
+    def refresh(
+        self,
+        github,
+        topics: Optional[list[str]] = None,
+        pages: int = 3,
+        on_topic: Optional[Callable[[dict], None]] = None
+    ) -> list[dict]:
+        """
+        Crawl domain topics into the index.
+        
+        The first crawl of a topic takes its most starred repositories;
+        later crawls only ask for repositories pushed since the last
+        successful sync (see _crawl_window). READMEs come from the GraphQL
+        bulk fetch when a GitHub token is configured.
+        
+        Args:
+            github: GitHubAPI instance
+            topics: GitHub topics to crawl (default: every domain topic)
+            pages: Maximum result pages (of 100) per topic
+            on_topic: Optional callback invoked with each topic's stats
+            
+        Returns:
+            Per-topic stats: topic, since, fetched, ms, error
+        """
+        if not self.enabled:
+            return []
+        
+        report = []
+        for topic in topics or list(dict.fromkeys(DOMAIN_TOPICS.values())):
+            started = time.perf_counter()
+            since = self.last_sync(topic)
+            sync_time = time.strftime(TIME_FORMAT, time.gmtime())
+            if since:
+                fetched, error = self._crawl_window(github, topic, since, sync_time, max(1, pages))
+            else:
+                fetched, error = self._crawl_top(github, topic, max(1, pages))
+                if error is None:
+                    self._set_last_sync(topic, sync_time)
+            stats = {
+                "topic": topic,
+                "since": since,
+                "fetched": fetched,
+                "ms": round((time.perf_counter() - started) * 1000),
+                "error": error
+            }
+            report.append(stats)
+            if on_topic:
+                on_topic(stats)
+        
+        return report
+    
+    def _index_page(self, github, items: list[Repo]) -> int:
+        """Index one page of search results with their READMEs."""
+        details = github.get_repositories_bulk([repo.full_name for repo in items])
+        readmes = {name: extra.get("readme") for name, extra in details.items()}
+        return self.upsert(items, readmes)
+    
+    def _crawl_top(self, github, topic: str, pages: int) -> tuple[int, Optional[str]]:
+        """
+        Index the most starred repositories of a topic.
+        
+        Returns:
+            (repositories indexed, error or None)
+        """
+        fetched = 0
+        for page in range(1, pages + 1):
+            result = github.search_repositories(
+                f"topic:{topic}", sort="stars", order="desc", per_page=self.PAGE_SIZE, page=page
+            )
+            if "error" in result:
+                return fetched, result["error"]
+            items = result.get("items", [])
+            fetched += self._index_page(github, items)
+            if len(items) < self.PAGE_SIZE:
+                break
+        return fetched, None
+    
+    def _crawl_window(self, github, topic: str, since: str, until: str,
+                      pages: int) -> tuple[int, Optional[str]]:
+        """
+        Index the repositories of a topic pushed between two sync times.
+        
+        GitHub cannot sort by push time, so the window is crawled as
+        ``pushed:`` ranges, oldest first, each small enough to page through
+        completely within the ``pages`` cap: a range with more results than
+        the pages left is halved before anything of it is indexed (these
+        probes do not count against the cap, and there are at most about
+        log2 of the window's seconds of them). The sync
+        time advances to the end of every range crawled completely, so a
+        crawl cut short by the cap or an error resumes exactly where its
+        coverage stops.
+        
+        Args:
+            github: GitHubAPI instance
+            topic: GitHub topic
+            since: Last sync time (YYYY-MM-DDTHH:MM:SSZ)
+            until: This sync's time
+            pages: Maximum result pages (of 100) to request
+            
+        Returns:
+            (repositories indexed, error or None)
+        """
+        fetched = 0
+        lower, end = _parse_time(since), _parse_time(until)
+        upper = end
+        while pages > 0 and lower <= end:
+            query = f"topic:{topic} pushed:{_format_time(lower)}..{_format_time(upper)}"
+            seen = set()
+            complete = False
+            page = 0
+            while pages > 0:
+                page += 1
+                result = github.search_repositories(
+                    query, sort="updated", order="asc", per_page=self.PAGE_SIZE, page=page
+                )
+                if "error" in result:
+                    return fetched, result["error"]
+                total = result.get("total_count", 0)
+                if page == 1 and total > pages * self.PAGE_SIZE and upper > lower:
+                    break
+                pages -= 1
+                items = result.get("items", [])
+                fetched += self._index_page(github, items)
+                seen.update(repo.full_name.lower() for repo in items)
+                if len(items) < self.PAGE_SIZE or len(seen) >= total:
+                    # A repository updated mid-crawl shifts the later pages;
+                    # the range is only covered if nothing slipped between them
+                    complete = len(seen) >= total
+                    break
+            
+            if complete:
+                self._set_last_sync(topic, _format_time(upper))
+                lower, upper = upper + 1, end
+            elif upper > lower:
+                upper = lower + (upper - lower) // 2
+            else:
+                break
+        return fetched, None
+    
+    def stats(self) -> dict:
+        """Get the index size and per-topic sync times."""
+        if not self.enabled:
+            return {"enabled": False, "path": self.path}
+        with self._lock:
+            repos, readmes = self._conn.execute(
+                "SELECT COUNT(*), COUNT(readme) FROM repos"
+            ).fetchone()
+            syncs = dict(self._conn.execute("SELECT topic, last_sync FROM sync_state ORDER BY topic"))
+        return {
+            "enabled": True,
+            "path": self.path,
+            "repos": repos,
+            "readmes": readmes,
+            "bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            "syncs": syncs
+        }
+
+
+# Global instance (built on first use)
+repo_index = LazyObject(RepoIndex)
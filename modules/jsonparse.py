@@ -0,0 +1,266 @@
+"""
+RepoHunter - JSON Parsing
+Tolerant and incremental parsing of AI responses, with light schema validation.
+"""
+
+import json
+from typing import Any, Optional
+
+
+def extract_json(text: str) -> Optional[str]:
+    """
+    Find the first JSON object or array in a completion.
+    
+    Skips prose and markdown fences before it and anything after its
+    closing bracket. A document that never closes (a truncated
+    completion) is returned up to the end of the text.
+    
+    Args:
+        text: Completion text
+        
+    Returns:
+        The JSON text, or None if there is no object or array
+    """
+    starts = [index for index in (text.find("{"), text.find("[")) if index >= 0]
+    if not starts:
+        return None
+    start = min(starts)
+    
+    depth = 0
+    in_string = escape = False
+    for pos in range(start, len(text)):
+        char = text[pos]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:pos + 1]
+    return text[start:]
+
+
+def repair_json(fragment: str) -> str:
+    """
+    Repair the common defects of model-written JSON.
+    
+    Drops trailing commas before a closing bracket. If the document is
+    truncated, it is cut back to the last complete element and every open
+    object and array is closed, so the entries that did arrive survive.
+    
+    Args:
+        fragment: Output of extract_json()
+        
+    Returns:
+        Repaired JSON text (may still be invalid for other defects)
+    """
+    out: list[str] = []
+    stack: list[str] = []
+    # Longest prefix (and the brackets open at that point) that can be closed cleanly
+    safe = (0, ())
+    in_string = escape = False
+    
+    for char in fragment:
+        if in_string:
+            out.append(char)
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+                if stack and stack[-1] == "]":
+                    # A finished string inside an array is a complete element
+                    safe = (len(out), tuple(stack))
+            continue
+        
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+            out.append(char)
+            safe = (len(out), tuple(stack))
+            continue
+        elif char in "}]":
+            while out and (out[-1].isspace() or out[-1] == ","):
+                out.pop()
+            if stack:
+                stack.pop()
+            out.append(char)
+            safe = (len(out), tuple(stack))
+            if not stack:
+                break
+            continue
+        elif char == ",":
+            safe = (len(out), tuple(stack))
+        out.append(char)
+    
+    if not stack and not in_string:
+        return "".join(out)
+    length, still_open = safe
+    return "".join(out[:length]).rstrip().rstrip(",") + "".join(reversed(still_open))
+
+
+def parse_json(text: str) -> Any:
+    """
+    Decode the JSON value in a completion, repairing it if needed.
+    
+    Args:
+        text: Completion text (may include prose, fences or be truncated)
+        
+    Returns:
+        Decoded value
+        
+    Raises:
+        ValueError: No JSON value could be recovered
+    """
+    fragment = extract_json(text or "")
+    if fragment is None:
+        raise ValueError("no JSON object or array found")
+    try:
+        return json.loads(fragment, strict=False)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(repair_json(fragment), strict=False)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"invalid JSON ({e.msg} at position {e.pos})") from e
+
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool
+}
+
+
+def validate(value: Any, schema: dict, path: str = "$") -> list[str]:
+    """
+    Check a value against a JSON Schema subset: type, properties,
+    required, items, minItems and enum.
+    
+    Args:
+        value: Decoded JSON value
+        schema: Schema dict
+        path: Location used in messages
+        
+    Returns:
+        Problems found (empty when the value is valid)
+    """
+    expected = schema.get("type")
+    if expected:
+        types = expected if isinstance(expected, list) else [expected]
+        matches = any(
+            isinstance(value, _TYPES[name]) and not (name in ("integer", "number") and isinstance(value, bool))
+            for name in types
+        )
+        if not matches:
+            return [f"{path}: expected {' or '.join(types)}, got {type(value).__name__}"]
+    
+    errors = []
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{path}: must be one of {schema['enum']}")
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}: missing '{key}'")
+        for key, subschema in schema.get("properties", {}).items():
+            if key in value and value[key] is not None:
+                errors += validate(value[key], subschema, f"{path}.{key}")
+    elif isinstance(value, list):
+        if len(value) < schema.get("minItems", 0):
+            errors.append(f"{path}: needs at least {schema['minItems']} items")
+        if "items" in schema:
+            for i, item in enumerate(value):
+                errors += validate(item, schema["items"], f"{path}[{i}]")
+    return errors
+
+
+class ArrayItemStream:
+    """
+    Incremental scanner that emits the objects of one array as soon as
+    each of them closes.
+    
+    Feed it chunks of a streamed JSON document such as
+    ``{"ranked_repos": [{...}, {...}], "notes": [...]}``; with
+    ``key="ranked_repos"`` every ``{...}`` element is decoded and returned
+    from ``feed()`` the moment its closing brace arrives. Text before the
+    first ``{`` (e.g. a markdown fence) is ignored.
+    """
+    
+    def __init__(self, key: str):
+        self.key = key
+        self.buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._current_key: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+    
+    def feed(self, chunk: str) -> list[dict]:
+        """
+        Consume a chunk of text.
+        
+        Args:
+            chunk: Next piece of the streamed document
+            
+        Returns:
+            Array elements completed by this chunk
+        """
+        self.buffer += chunk
+        items = []
+        text = self.buffer
+        
+        while self._pos < len(text):
+            char = text[self._pos]
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start:self._pos]
+            elif char == '"':
+                self._in_string = True
+                self._string_start = self._pos + 1
+            elif char == ":" and self._depth == 1:
+                self._current_key = self._last_string
+            elif char in "{[":
+                if char == "[" and self._depth == 1 and self._current_key == self.key:
+                    self._array_depth = self._depth + 1
+                elif char == "{" and self._array_depth is not None and self._depth == self._array_depth:
+                    self._item_start = self._pos
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if char == "}" and self._item_start is not None and self._depth == self._array_depth:
+                    try:
+                        item = json.loads(text[self._item_start:self._pos + 1])
+                        if isinstance(item, dict):
+                            items.append(item)
+                    except json.JSONDecodeError:
+                        pass
+                    self._item_start = None
+                elif char == "]" and self._array_depth is not None and self._depth == self._array_depth - 1:
+                    self._array_depth = None
+            
+            self._pos += 1
+        
+        return items
@@ -0,0 +1,137 @@
+"""
+RepoHunter - Lazy Loading
+Deferred imports and on-demand construction of the shared clients.
+"""
+
+import importlib
+import importlib.util
+import threading
+from typing import Callable, Iterable, Optional
+
+
+class LazyModule:
+    """
+    A module imported on first attribute access.
+    
+    Raises ImportError up front when the module is not installed, so the
+    usual ``try: ... except ImportError`` guard for optional dependencies
+    keeps working; only the (slow) import itself is deferred.
+    """
+    
+    def __init__(self, name: str):
+        if importlib.util.find_spec(name) is None:
+            raise ImportError(f"No module named {name!r}", name=name)
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+    
+    def __getattr__(self, attr: str):
+        # Only called for names not set in __init__
+        return getattr(self._load(), attr)
+    
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Import a module on first use.
+    
+    Args:
+        name: Top-level module name
+        
+    Returns:
+        Proxy forwarding attribute access to the module
+        
+    Raises:
+        ImportError: If the module is not installed
+    """
+    return LazyModule(name)
+
+
+class LazyObject:
+    """
+    Stand-in for a module-level instance that is built on first use.
+    
+    Attribute reads and writes are forwarded to the instance, which is
+    created by ``factory`` exactly once even when several threads reach
+    it together (the others wait for the first to finish).
+    """
+    
+    __slots__ = ("_factory", "_instance", "_lock")
+    
+    def __init__(self, factory: Callable):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+    
+    def resolve(self):
+        """Build the instance if needed and return it."""
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    instance = self._factory()
+                    object.__setattr__(self, "_instance", instance)
+        return instance
+    
+    @property
+    def is_built(self) -> bool:
+        return self._instance is not None
+    
+    def __getattr__(self, name: str):
+        return getattr(self.resolve(), name)
+    
+    def __setattr__(self, name: str, value):
+        setattr(self.resolve(), name, value)
+    
+    def __delattr__(self, name: str):
+        delattr(self.resolve(), name)
+    
+    def __repr__(self) -> str:
+        if self._instance is None:
+            return f"<lazy {getattr(self._factory, '__name__', 'object')} (not built)>"
+        return repr(self._instance)
+
+
+def warm_up(objects: Iterable[LazyObject], on_error: Optional[Callable[[Exception], None]] = None) -> threading.Thread:
+    """
+    Build lazy objects on a background thread.
+    
+    After building an object, its ``warm()`` method (if it has one) is
+    called to do the rest of its first-use setup, such as importing an
+    HTTP library or opening a database. Anything that needs an object
+    before the thread got to it simply builds it (or waits for the
+    thread's build) on first access, so warming up never changes
+    results - it only moves the wait.
+    
+    Args:
+        objects: Lazy objects to build, in order
+        on_error: Called with any construction error (default: ignored;
+            the error repeats on first real use)
+            
+    Returns:
+        The started daemon thread
+    """
+    def build():
+        for obj in objects:
+            try:
+                warm = getattr(obj.resolve(), "warm", None)
+                if callable(warm):
+                    warm()
+            except Exception as e:
+                if on_error is not None:
+                    on_error(e)
+    
+    thread = threading.Thread(target=build, name="repohunter-warmup", daemon=True)
+    thread.start()
+    return thread
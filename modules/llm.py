@@ -0,0 +1,460 @@
+"""
+RepoHunter - LLM Backends
+Interchangeable chat-completion backends: Groq, OpenAI-compatible HTTP, mock and replay.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Iterator, Optional
+
+from .config import config
+from .jsonparse import extract_json, repair_json
+from .lazy import lazy_import
+from .metrics import tracer
+
+requests = lazy_import("requests")
+
+
+class LLMBackend:
+    """
+    Base class for chat-completion backends.
+    
+    Subclasses implement ``complete()`` and may override ``stream()``;
+    both raise on failure and GroqAI turns exceptions into error payloads.
+    Token usage reported by the server is attached to the current trace
+    span with ``tracer.annotate()``. ``json_mode`` asks the server to
+    constrain the output to a JSON object where that is supported; it is
+    a hint, and callers still validate what comes back.
+    """
+    
+    name = "base"
+    # Setting to point users at when authentication fails
+    key_name = ""
+    # True when answers don't come from a real model (kept out of the main caches)
+    synthetic = False
+    
+    @property
+    def available(self) -> bool:
+        """Check if the backend is configured well enough to be called."""
+        return True
+    
+    @property
+    def unavailable_reason(self) -> str:
+        """Explain why the backend can't be called."""
+        return f"{self.key_name or 'LLM backend'} not configured"
+    
+    def complete(self, system_prompt: str, user_prompt: str, model: str, task: str,
+                 temperature: float = 0.3, max_tokens: int = 2000, json_mode: bool = False) -> str:
+        """
+        Run one chat completion.
+        
+        Args:
+            system_prompt: System message
+            user_prompt: User message
+            model: Model name
+            task: Pipeline step ("analyze", "rank", "install")
+            temperature: Sampling temperature
+            max_tokens: Completion length limit
+            json_mode: Request a JSON object response
+            
+        Returns:
+            Completion text
+        """
+        raise NotImplementedError
+    
+    def stream(self, system_prompt: str, user_prompt: str, model: str, task: str,
+               temperature: float = 0.3, max_tokens: int = 2000, json_mode: bool = False) -> Iterator[str]:
+        """Stream a chat completion as text chunks (default: one chunk)."""
+        yield self.complete(system_prompt, user_prompt, model, task, temperature, max_tokens, json_mode)
+
+
+class GroqBackend(LLMBackend):
+    """Groq Cloud through the official SDK."""
+    
+    name = "groq"
+    key_name = "GROQ_API_KEY"
+    
+    def __init__(self, api_key: str):
+        self.client = None
+        if api_key:
+            from groq import Groq
+            self.client = Groq(api_key=api_key)
+    
+    @property
+    def available(self) -> bool:
+        return self.client is not None
+    
+    @staticmethod
+    def _messages(system_prompt: str, user_prompt: str) -> list[dict]:
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+    
+    def complete(self, system_prompt, user_prompt, model, task, temperature=0.3, max_tokens=2000, json_mode=False):
+        options = {"response_format": {"type": "json_object"}} if json_mode else {}
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=self._messages(system_prompt, user_prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **options
+        )
+        if response.usage:
+            tracer.annotate(
+                prompt_tokens=response.usage.prompt_tokens,
+                completion_tokens=response.usage.completion_tokens
+            )
+        return response.choices[0].message.content
+    
+    def stream(self, system_prompt, user_prompt, model, task, temperature=0.3, max_tokens=2000, json_mode=False):
+        # Groq doesn't combine JSON mode with streaming; the caller validates instead
+        stream = self.client.chat.completions.create(
+            model=model,
+            messages=self._messages(system_prompt, user_prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        for chunk in stream:
+            # Groq reports usage on the final chunk
+            usage = getattr(getattr(chunk, "x_groq", None), "usage", None)
+            if usage:
+                tracer.annotate(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """
+    Any server speaking the OpenAI ``/chat/completions`` API
+    (OpenAI, OpenRouter, vLLM, llama.cpp, Ollama, LM Studio...).
+    """
+    
+    name = "openai"
+    key_name = "REPOHUNTER_LLM_API_KEY"
+    
+    TIMEOUT = 60
+    
+    def __init__(self, base_url: str, api_key: str = ""):
+        self.base_url = base_url.rstrip("/")
+        # Cleared when the server rejects response_format
+        self.json_mode_supported = True
+        self.session = requests.Session()
+        self.session.headers["Content-Type"] = "application/json"
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+    
+    @property
+    def available(self) -> bool:
+        return bool(self.base_url)
+    
+    @property
+    def unavailable_reason(self) -> str:
+        return "REPOHUNTER_LLM_BASE_URL not configured"
+    
+    def _post(self, body: dict, stream: bool = False) -> "requests.Response":
+        response = self.session.post(
+            f"{self.base_url}/chat/completions", json=body, stream=stream, timeout=self.TIMEOUT
+        )
+        if response.status_code == 400 and "response_format" in body:
+            # Server without JSON mode: retry once without it and stop asking
+            response.close()
+            self.json_mode_supported = False
+            body = {key: value for key, value in body.items() if key != "response_format"}
+            response = self.session.post(
+                f"{self.base_url}/chat/completions", json=body, stream=stream, timeout=self.TIMEOUT
+            )
+        if response.status_code == 401:
+            raise PermissionError("invalid api key")
+        if response.status_code == 429:
+            raise RuntimeError("rate limit reached")
+        response.raise_for_status()
+        return response
+    
+    @staticmethod
+    def _usage(data: dict):
+        """Attach the ``usage`` object of a response or final stream chunk to the trace."""
+        usage = data.get("usage")
+        if isinstance(usage, dict):
+            tracer.annotate(
+                prompt_tokens=usage.get("prompt_tokens", 0),
+                completion_tokens=usage.get("completion_tokens", 0)
+            )
+    
+    def _body(self, system_prompt, user_prompt, model, temperature, max_tokens, json_mode) -> dict:
+        body = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        if json_mode and self.json_mode_supported:
+            body["response_format"] = {"type": "json_object"}
+        return body
+    
+    def complete(self, system_prompt, user_prompt, model, task, temperature=0.3, max_tokens=2000, json_mode=False):
+        body = self._body(system_prompt, user_prompt, model, temperature, max_tokens, json_mode)
+        data = self._post(body).json()
+        self._usage(data)
+        return data["choices"][0]["message"]["content"] or ""
+    
+    def stream(self, system_prompt, user_prompt, model, task, temperature=0.3, max_tokens=2000, json_mode=False):
+        body = self._body(system_prompt, user_prompt, model, temperature, max_tokens, json_mode)
+        body["stream"] = True
+        # Ask for a final chunk with token usage (servers that don't know it ignore it)
+        body["stream_options"] = {"include_usage": True}
+        with self._post(body, stream=True) as response:
+            # Server-sent events: "data: {...}" lines, terminated by "data: [DONE]"
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                payload = line[5:].strip()
+                if payload == "[DONE]":
+                    break
+                try:
+                    event = json.loads(payload)
+                except json.JSONDecodeError:
+                    continue
+                self._usage(event)
+                choices = event.get("choices") or []
+                content = choices[0].get("delta", {}).get("content") if choices else None
+                if content:
+                    yield content
+
+
+class MockBackend(LLMBackend):
+    """
+    Offline backend that answers every task with a deterministic,
+    well-formed response after a configurable delay.
+    
+    Latency is modeled as time to first token plus a per-chunk delay
+    derived from the tokens/second rate, so streaming behaves like a
+    real model. Use it for repeatable benchmarks without quota or
+    network variance.
+    """
+    
+    name = "mock"
+    synthetic = True
+    
+    # Characters per streamed chunk (roughly one token)
+    CHUNK_CHARS = 4
+    
+    INSTALL_STEPS = {
+        "Python": ["pip install -r requirements.txt"],
+        "Go": ["go build ./..."],
+        "JavaScript": ["npm install"],
+        "TypeScript": ["npm install", "npm run build"],
+        "Rust": ["cargo build --release"]
+    }
+    
+    def __init__(self, latency_ms: float = 0.0, tokens_per_second: float = 0.0):
+        self.latency = max(latency_ms, 0.0) / 1000
+        self.chunk_delay = 1 / tokens_per_second if tokens_per_second > 0 else 0.0
+    
+    def respond(self, user_prompt: str, task: str) -> str:
+        """Build the canned response for a task."""
+        if task == "analyze":
+            words = [word for word in re.findall(r"[a-z0-9+#.-]+", user_prompt.lower()) if len(word) > 2]
+            terms = " ".join(words[:4]) or "security tool"
+            return json.dumps({
+                "domain": "general",
+                "tool_type": "cli",
+                "language": "multi",
+                "skill_tier": "intermediate",
+                "search_terms": terms,
+                "alt_terms": [" ".join(words[1:4]) or terms],
+                "query_summary": user_prompt.strip()[:100]
+            })
+        
+        if task == "fused":
+            query = re.search(r"^User Query: (.*)$", user_prompt, re.MULTILINE)
+            answer = json.loads(self.respond(query.group(1) if query else "", "analyze"))
+            return json.dumps({"profile": answer, **json.loads(self.respond(user_prompt, "rank"))})
+        
+        if task == "rank":
+            # Candidate table rows: index|name|stars|language|updated|...|description
+            rows = re.findall(r"^\d+\|.*$", user_prompt, re.MULTILINE)
+            ranked = []
+            for row in rows[:5]:
+                cells = row.split("|")
+                ranked.append({
+                    "rank": len(ranked) + 1,
+                    "name": cells[1],
+                    "url": f"https://github.com/{cells[1]}",
+                    "language": cells[3] or "Unknown",
+                    "stars": int(cells[2]) if cells[2].isdigit() else 0,
+                    "forks": 0,
+                    "updated": cells[4],
+                    "summary": cells[-1] or "No description",
+                    "why": "Mock ranking (input order)"
+                })
+            return json.dumps({
+                "ranked_repos": ranked,
+                "notes": ["Mock LLM backend"],
+                "recommendation": "Start with #1." if ranked else ""
+            })
+        
+        if task == "repair":
+            fragment = extract_json(user_prompt.split("JSON:\n", 1)[-1])
+            return repair_json(fragment) if fragment else "{}"
+        
+        language = re.search(r"Language: (\S+)", user_prompt)
+        steps = self.INSTALL_STEPS.get(language.group(1) if language else "", ["make"])
+        return json.dumps({"steps": steps})
+    
+    def deliver(self, text: str) -> str:
+        """Return text after the time a model would take to generate it."""
+        time.sleep(self.latency + self.chunk_delay * len(text) / self.CHUNK_CHARS)
+        return text
+    
+    def deliver_stream(self, text: str) -> Iterator[str]:
+        """Yield text in token-sized chunks at the configured pace."""
+        time.sleep(self.latency)
+        for start in range(0, len(text), self.CHUNK_CHARS):
+            if self.chunk_delay:
+                time.sleep(self.chunk_delay)
+            yield text[start:start + self.CHUNK_CHARS]
+    
+    @classmethod
+    def estimate_usage(cls, system_prompt: str, user_prompt: str, text: str):
+        """Attach estimated token counts (one token per CHUNK_CHARS characters) to the trace."""
+        tracer.annotate(
+            prompt_tokens=(len(system_prompt) + len(user_prompt)) // cls.CHUNK_CHARS,
+            completion_tokens=len(text) // cls.CHUNK_CHARS
+        )
+    
+    def complete(self, system_prompt, user_prompt, model, task, temperature=0.3, max_tokens=2000, json_mode=False):
+        text = self.respond(user_prompt, task)
+        self.estimate_usage(system_prompt, user_prompt, text)
+        return self.deliver(text)
+    
+    def stream(self, system_prompt, user_prompt, model, task, temperature=0.3, max_tokens=2000, json_mode=False):
+        text = self.respond(user_prompt, task)
+        self.estimate_usage(system_prompt, user_prompt, text)
+        yield from self.deliver_stream(text)
+
+
+class ReplayBackend(LLMBackend):
+    """
+    Records completions to a JSONL file and plays them back.
+    
+    With a live ``inner`` backend every completion is appended to the file
+    (recording); without one, recorded answers are replayed with the mock
+    latency model, and prompts that were never recorded get a mock answer.
+    Records are keyed by task and prompts, not by model.
+    """
+    
+    name = "replay"
+    
+    def __init__(self, path: str, inner: Optional[LLMBackend] = None, mock: Optional[MockBackend] = None):
+        self.path = path
+        self.inner = inner
+        self.mock = mock or MockBackend()
+        self.counters = {"replayed": 0, "recorded": 0, "missing": 0}
+        self._lock = threading.Lock()
+        self._records: dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                        self._records[record["key"]] = record["response"]
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        continue
+    
+    @property
+    def synthetic(self) -> bool:
+        return self.inner is None
+    
+    @property
+    def available(self) -> bool:
+        return self.inner.available if self.inner else True
+    
+    @property
+    def unavailable_reason(self) -> str:
+        return self.inner.unavailable_reason if self.inner else super().unavailable_reason
+    
+    @property
+    def key_name(self) -> str:
+        return self.inner.key_name if self.inner else ""
+    
+    @staticmethod
+    def _key(task: str, system_prompt: str, user_prompt: str) -> str:
+        return hashlib.sha256("\0".join((task, system_prompt, user_prompt)).encode()).hexdigest()
+    
+    def _record(self, key: str, task: str, model: str, response: str):
+        record = {"key": key, "task": task, "model": model, "response": response}
+        with self._lock:
+            self._records[key] = response
+            self.counters["recorded"] += 1
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+    
+    def _replay(self, key: str, user_prompt: str, task: str) -> str:
+        with self._lock:
+            response = self._records.get(key)
+            self.counters["replayed" if response is not None else "missing"] += 1
+        return response if response is not None else self.mock.respond(user_prompt, task)
+    
+    def complete(self, system_prompt, user_prompt, model, task, temperature=0.3, max_tokens=2000, json_mode=False):
+        key = self._key(task, system_prompt, user_prompt)
+        if self.inner:
+            response = self.inner.complete(
+                system_prompt, user_prompt, model, task, temperature, max_tokens, json_mode
+            )
+            self._record(key, task, model, response)
+            return response
+        text = self._replay(key, user_prompt, task)
+        self.mock.estimate_usage(system_prompt, user_prompt, text)
+        return self.mock.deliver(text)
+    
+    def stream(self, system_prompt, user_prompt, model, task, temperature=0.3, max_tokens=2000, json_mode=False):
+        key = self._key(task, system_prompt, user_prompt)
+        if self.inner:
+            chunks = []
+            for chunk in self.inner.stream(
+                system_prompt, user_prompt, model, task, temperature, max_tokens, json_mode
+            ):
+                chunks.append(chunk)
+                yield chunk
+            self._record(key, task, model, "".join(chunks))
+            return
+        text = self._replay(key, user_prompt, task)
+        self.mock.estimate_usage(system_prompt, user_prompt, text)
+        yield from self.mock.deliver_stream(text)
+
+
+def create_backend(name: Optional[str] = None) -> LLMBackend:
+    """
+    Build the configured backend.
+    
+    Args:
+        name: Backend name (default: config.llm_backend) - groq, openai, mock or replay
+        
+    Returns:
+        LLMBackend instance (wrapped in a recorder when config.llm_record is set)
+    """
+    name = (name or config.llm_backend).lower()
+    mock = MockBackend(config.mock_latency_ms, config.mock_tokens_per_second)
+    
+    if name == "mock":
+        return mock
+    if name == "replay":
+        return ReplayBackend(config.replay_path, mock=mock)
+    if name == "openai":
+        backend = OpenAICompatibleBackend(config.llm_base_url, config.llm_api_key)
+    else:
+        backend = GroqBackend(config.groq_api_key)
+    
+    if config.llm_record:
+        return ReplayBackend(config.replay_path, inner=backend, mock=mock)
+    return backend
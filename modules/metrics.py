@@ -0,0 +1,344 @@
+"""
+RepoHunter - Metrics & Tracing
+Timed spans around network and LLM calls, with JSONL trace and Prometheus export.
+"""
+
+import contextvars
+import itertools
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Optional
+
+from .config import config
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Span:
+    """One timed operation and the attributes recorded while it ran."""
+    
+    def __init__(self, name: str, span_id: int, parent: Optional["Span"], attrs: dict):
+        self.name = name
+        self.id = span_id
+        self.parent_id = parent.id if parent else None
+        self.trace_id = parent.trace_id if parent else span_id
+        self.attrs = attrs
+        self.error = None
+        self.started_at = time.time()
+        self.ms = 0.0
+        self._start = time.perf_counter()
+    
+    def set(self, **attrs):
+        """Add or overwrite attributes."""
+        self.attrs.update(attrs)
+    
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the span started."""
+        return (time.perf_counter() - self._start) * 1000
+    
+    def to_dict(self) -> dict:
+        """Serialize for the trace file."""
+        record = {
+            "trace": self.trace_id,
+            "span": self.id,
+            "parent": self.parent_id,
+            "name": self.name,
+            "start": round(self.started_at, 3),
+            "ms": round(self.ms, 2),
+            **self.attrs
+        }
+        if self.error:
+            record["error"] = self.error
+        return record
+
+
+class Tracer:
+    """
+    Records spans and aggregates them per name: latency percentiles,
+    error counts, HTTP statuses, cache outcomes and LLM token usage.
+    
+    The innermost open span is tracked per thread and per asyncio task
+    (in a context variable), so code deep in a call
+    (e.g. an LLM backend reading the ``usage`` field) can attach attributes
+    with ``annotate()`` without the span being passed around. Percentiles
+    cover the last WINDOW spans of each name; counts and sums cover the
+    whole process lifetime.
+    """
+    
+    # Durations kept per span name for percentiles
+    WINDOW = 1000
+    
+    def __init__(self, trace_path: Optional[str] = None):
+        self.trace_path = config.trace_path if trace_path is None else trace_path
+        self._spans = contextvars.ContextVar(f"repohunter_spans_{id(self)}", default=())
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._trace_file = None
+        self.reset()
+    
+    def reset(self):
+        """Forget every recorded span."""
+        with self._lock:
+            self._durations: dict[str, deque] = {}
+            self._totals: dict[str, dict] = {}
+            self._statuses: dict[tuple[str, str], int] = {}
+            self._cache: dict[tuple[str, str], int] = {}
+            self._tokens: dict[tuple[str, str], dict] = {}
+    
+    def current(self) -> Optional[Span]:
+        """Get the innermost open span of this thread or task."""
+        stack = self._spans.get()
+        return stack[-1] if stack else None
+    
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """
+        Time a block of code.
+        
+        Args:
+            name: Span name, e.g. "github.search" or "llm.rank"
+            **attrs: Initial attributes
+            
+        Yields:
+            The Span, for adding attributes while it runs
+        """
+        stack = self._spans.get()
+        span = Span(name, next(self._ids), stack[-1] if stack else None, attrs)
+        # Tuples, not a shared list: tasks started inside the span copy the context
+        self._spans.set(stack + (span,))
+        try:
+            yield span
+        except GeneratorExit:
+            # A consumer stopped reading a streamed call early - not a failure
+            raise
+        except BaseException as e:
+            span.error = span.error or type(e).__name__
+            raise
+        finally:
+            span.ms = span.elapsed_ms()
+            # Generators may close their spans out of order
+            self._spans.set(tuple(open_span for open_span in self._spans.get() if open_span is not span))
+            self._finish(span)
+    
+    def annotate(self, **attrs):
+        """Add attributes to the innermost open span (no-op outside a span)."""
+        span = self.current()
+        if span is not None:
+            span.set(**attrs)
+    
+    def record(self, name: str, ms: float, **attrs):
+        """
+        Record a duration measured elsewhere as a finished span.
+        
+        Args:
+            name: Span name
+            ms: Duration in milliseconds
+            **attrs: Attributes
+        """
+        span = Span(name, next(self._ids), None, attrs)
+        span.started_at -= ms / 1000
+        span.ms = ms
+        self._finish(span)
+    
+    def record_stages(self, timings: dict, prefix: str = "stage."):
+        """Record a pipeline's per-stage timings (ms) as "<prefix><name>" spans."""
+        for stage, ms in timings.items():
+            self.record(f"{prefix}{stage}", ms)
+    
+    def _finish(self, span: Span):
+        """Aggregate a closed span and append it to the trace file."""
+        attrs = span.attrs
+        with self._lock:
+            durations = self._durations.get(span.name)
+            if durations is None:
+                durations = self._durations[span.name] = deque(maxlen=self.WINDOW)
+            durations.append(span.ms)
+            
+            totals = self._totals.setdefault(span.name, {"count": 0, "ms": 0.0, "errors": 0})
+            totals["count"] += 1
+            totals["ms"] += span.ms
+            if span.error:
+                totals["errors"] += 1
+            
+            if "status" in attrs:
+                key = (span.name, str(attrs["status"]))
+                self._statuses[key] = self._statuses.get(key, 0) + 1
+            if "cache" in attrs:
+                key = (span.name, attrs["cache"])
+                self._cache[key] = self._cache.get(key, 0) + 1
+            if "prompt_tokens" in attrs or "completion_tokens" in attrs:
+                usage = self._tokens.setdefault(
+                    (attrs.get("task", span.name), attrs.get("model", "")),
+                    {"calls": 0, "prompt": 0, "completion": 0}
+                )
+                usage["calls"] += 1
+                usage["prompt"] += attrs.get("prompt_tokens") or 0
+                usage["completion"] += attrs.get("completion_tokens") or 0
+            
+            if self.trace_path:
+                self._write(span)
+    
+    def _write(self, span: Span):
+        """Append one span to the JSONL trace file (caller holds the lock)."""
+        try:
+            if self._trace_file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.trace_path)), exist_ok=True)
+                self._trace_file = open(self.trace_path, "a", encoding="utf-8", buffering=1)
+            self._trace_file.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n")
+        except OSError:
+            # Tracing must never break a search - stop writing instead
+            self.trace_path = ""
+    
+    def summary(self) -> dict:
+        """
+        Get aggregated metrics.
+        
+        Returns:
+            dict with "spans" (name -> count, errors, total_ms, p50, p95,
+            cache outcomes and HTTP statuses) and "tokens" ((task, model)
+            -> calls, prompt, completion)
+        """
+        with self._lock:
+            spans = {}
+            for name, totals in sorted(self._totals.items()):
+                window = list(self._durations[name])
+                spans[name] = {
+                    "count": totals["count"],
+                    "errors": totals["errors"],
+                    "total_ms": round(totals["ms"], 1),
+                    "p50": round(percentile(window, 50), 1),
+                    "p95": round(percentile(window, 95), 1),
+                    "cache": {outcome: count for (span, outcome), count in self._cache.items() if span == name},
+                    "statuses": {status: count for (span, status), count in self._statuses.items() if span == name}
+                }
+            tokens = {key: dict(usage) for key, usage in sorted(self._tokens.items())}
+        return {"spans": spans, "tokens": tokens}
+    
+    def prometheus(self) -> str:
+        """
+        Render metrics in the Prometheus text exposition format.
+        
+        Returns:
+            Metrics text (version 0.0.4)
+        """
+        from . import cache
+        
+        summary = self.summary()
+        lines = [
+            "# HELP repohunter_span_duration_milliseconds Duration of traced operations.",
+            "# TYPE repohunter_span_duration_milliseconds summary"
+        ]
+        for name, stats in summary["spans"].items():
+            label = f'span="{_escape(name)}"'
+            lines.append(f'repohunter_span_duration_milliseconds{{{label},quantile="0.5"}} {stats["p50"]}')
+            lines.append(f'repohunter_span_duration_milliseconds{{{label},quantile="0.95"}} {stats["p95"]}')
+            lines.append(f"repohunter_span_duration_milliseconds_sum{{{label}}} {stats['total_ms']}")
+            lines.append(f"repohunter_span_duration_milliseconds_count{{{label}}} {stats['count']}")
+        
+        lines += [
+            "# HELP repohunter_span_errors_total Traced operations that raised.",
+            "# TYPE repohunter_span_errors_total counter"
+        ]
+        for name, stats in summary["spans"].items():
+            lines.append(f'repohunter_span_errors_total{{span="{_escape(name)}"}} {stats["errors"]}')
+        
+        lines += [
+            "# HELP repohunter_http_responses_total HTTP responses by status.",
+            "# TYPE repohunter_http_responses_total counter"
+        ]
+        for name, stats in summary["spans"].items():
+            for status, count in sorted(stats["statuses"].items()):
+                lines.append(
+                    f'repohunter_http_responses_total{{span="{_escape(name)}",status="{_escape(status)}"}} {count}'
+                )
+        
+        lines += [
+            "# HELP repohunter_span_cache_total Cache outcome of traced operations.",
+            "# TYPE repohunter_span_cache_total counter"
+        ]
+        for name, stats in summary["spans"].items():
+            for outcome, count in sorted(stats["cache"].items()):
+                lines.append(
+                    f'repohunter_span_cache_total{{span="{_escape(name)}",outcome="{_escape(outcome)}"}} {count}'
+                )
+        
+        lines += [
+            "# HELP repohunter_llm_tokens_total LLM tokens reported by the backend.",
+            "# TYPE repohunter_llm_tokens_total counter"
+        ]
+        for (task, model), usage in summary["tokens"].items():
+            labels = f'task="{_escape(task)}",model="{_escape(model)}"'
+            lines.append(f'repohunter_llm_tokens_total{{{labels},kind="prompt"}} {usage["prompt"]}')
+            lines.append(f'repohunter_llm_tokens_total{{{labels},kind="completion"}} {usage["completion"]}')
+        
+        lines += [
+            "# HELP repohunter_cache_lookups_total Lookups per cache and outcome.",
+            "# TYPE repohunter_cache_lookups_total counter"
+        ]
+        for stats in cache.all_stats():
+            for outcome in ("hits", "misses", "stale", "revalidated", "similar"):
+                lines.append(
+                    f'repohunter_cache_lookups_total{{cache="{_escape(stats["name"])}",outcome="{outcome}"}} '
+                    f'{stats.get(outcome, 0)}'
+                )
+        return "\n".join(lines) + "\n"
+    
+    def serve(self, port: int, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+        """
+        Expose /metrics for Prometheus from a background thread.
+        
+        Args:
+            port: TCP port
+            host: Interface to bind (loopback by default)
+            
+        Returns:
+            The running server (call shutdown() to stop it)
+        """
+        # Imported here: only needed when metrics are served
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        
+        tracer = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = tracer.prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="repohunter-metrics", daemon=True).start()
+        return server
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Global instance
+tracer = Tracer()
@@ -0,0 +1,171 @@
+"""
+RepoHunter - Data Models
+Compact repository record shared by search, ranking, display and install.
+"""
+
+import sys
+from typing import Optional
+
+
+def _intern(value) -> Optional[str]:
+    """Intern a short, often repeated string (owner, language, license, topic)."""
+    return sys.intern(value) if isinstance(value, str) and value else None
+
+
+class Repo:
+    """
+    One candidate repository.
+    
+    Built once where data enters the program (GitHub REST or GraphQL
+    JSON, index rows) and passed on as is. ``__slots__`` keeps each
+    record to a few hundred bytes instead of a ~90-key dict per search
+    item, and owner, language, license and topic strings are interned,
+    so tens of thousands of candidates share one copy of "Python".
+    """
+    
+    __slots__ = (
+        "full_name", "owner", "description", "url", "language", "topics",
+        "stars", "forks", "open_issues", "archived", "fork", "license",
+        "pushed_at", "latest_release", "commits_recent", "matched_queries"
+    )
+    
+    def __init__(self, full_name: str, description: str = "", url: str = "",
+                 language: Optional[str] = None, topics: tuple = (), stars: int = 0,
+                 forks: int = 0, open_issues: int = 0, archived: bool = False, fork: bool = False,
+                 license: Optional[str] = None, pushed_at: str = "",
+                 latest_release: Optional[str] = None, commits_recent: Optional[int] = None,
+                 matched_queries: int = 1):
+        self.full_name = full_name
+        self.owner = _intern(full_name.split("/", 1)[0]) or ""
+        self.description = description or ""
+        self.url = url or f"https://github.com/{full_name}"
+        self.language = _intern(language)
+        self.topics = tuple(_intern(topic) for topic in topics if topic)
+        self.stars = stars or 0
+        self.forks = forks or 0
+        self.open_issues = open_issues or 0
+        self.archived = bool(archived)
+        self.fork = bool(fork)
+        self.license = _intern(license)
+        self.pushed_at = pushed_at or ""
+        self.latest_release = latest_release or None
+        self.commits_recent = commits_recent
+        # Number of search variants (or indexes) that returned the repository
+        self.matched_queries = matched_queries
+    
+    @classmethod
+    def from_api(cls, item: dict) -> Optional["Repo"]:
+        """
+        Build a record from a GitHub REST item or a flattened GraphQL node.
+        
+        Args:
+            item: Search item, repository object or
+                GitHubAPI._parse_graphql_repo() result
+                
+        Returns:
+            Repo, or None without a full_name
+        """
+        full_name = item.get("full_name")
+        if not full_name:
+            return None
+        license_info = item.get("license")
+        if isinstance(license_info, dict):
+            license_info = license_info.get("spdx_id")
+        return cls(
+            full_name,
+            description=item.get("description"),
+            url=item.get("html_url"),
+            language=item.get("language"),
+            topics=item.get("topics") or (),
+            stars=item.get("stargazers_count"),
+            forks=item.get("forks_count"),
+            open_issues=item.get("open_issues_count"),
+            archived=item.get("archived"),
+            fork=item.get("fork"),
+            license=license_info,
+            pushed_at=item.get("pushed_at") or item.get("updated_at"),
+            latest_release=item.get("latest_release"),
+            commits_recent=item.get("commits_recent"),
+            matched_queries=item.get("matched_queries") or 1
+        )
+    
+    @property
+    def name(self) -> str:
+        """Repository name without the owner."""
+        return self.full_name.split("/", 1)[-1]
+    
+    @property
+    def updated(self) -> str:
+        """Day of the last push (YYYY-MM-DD, or empty)."""
+        return self.pushed_at[:10]
+    
+    def ranked(self, rank: int, summary: str = "", why: str = "") -> dict:
+        """
+        The ranked-entry shape shown by the UI and returned by the rankers.
+        
+        Args:
+            rank: 1-based position
+            summary: What the tool does (default: the description)
+            why: Why it was ranked here
+            
+        Returns:
+            dict with rank, name, url, language, stars, forks, updated,
+            summary and why
+        """
+        return {
+            "rank": rank,
+            "name": self.full_name,
+            "url": self.url,
+            "language": self.language or "Unknown",
+            "stars": self.stars,
+            "forks": self.forks,
+            "updated": self.updated,
+            "summary": summary or (self.description or "No description")[:200],
+            "why": why
+        }
+    
+    def ground(self, entry: dict) -> dict:
+        """A ranked entry (from the model or a cache) with this record's facts."""
+        return {**entry, **self.ranked(entry.get("rank", 0), entry.get("summary", ""), entry.get("why", ""))}
+    
+    def to_dict(self) -> dict:
+        """JSON form in GitHub's field names (read back by from_api)."""
+        return {
+            "full_name": self.full_name,
+            "description": self.description,
+            "html_url": self.url,
+            "language": self.language,
+            "topics": list(self.topics),
+            "stargazers_count": self.stars,
+            "forks_count": self.forks,
+            "open_issues_count": self.open_issues,
+            "archived": self.archived,
+            "fork": self.fork,
+            "license": self.license,
+            "pushed_at": self.pushed_at,
+            "latest_release": self.latest_release,
+            "commits_recent": self.commits_recent,
+            "matched_queries": self.matched_queries
+        }
+    
+    def __repr__(self) -> str:
+        return f"Repo({self.full_name!r}, stars={self.stars}, language={self.language!r})"
+
+
+def ground_ranking(ranked: dict, repos: list[Repo]) -> dict:
+    """
+    Give every ranked entry the metadata of its candidate record.
+    
+    Args:
+        ranked: Ranking dict (ranked_repos, notes, recommendation, ...)
+        repos: The candidates it was ranked from
+        
+    Returns:
+        New ranking dict; entries naming no candidate are kept as they are
+    """
+    candidates = {repo.full_name.lower(): repo for repo in repos}
+    entries = []
+    for entry in ranked.get("ranked_repos", []):
+        repo = candidates.get(str(entry.get("name", "")).lower())
+        entries.append(repo.ground(entry) if repo else entry)
+    return {**ranked, "ranked_repos": entries}
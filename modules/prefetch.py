@@ -0,0 +1,154 @@
+"""
+RepoHunter - Background Prefetching
+Overlaps README downloads and install-step generation with the interactive flow.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from .config import config
+
+
+class Prefetcher:
+    """
+    Runs README fetches and speculative install-step generation in a
+    bounded thread pool.
+    
+    Work is grouped into generations: ``reset()`` starts a new generation,
+    cancels everything that hasn't started yet and makes running tasks
+    drop their results, so a new query never waits on the previous one.
+    """
+    
+    def __init__(self, github, groq_ai, max_workers: Optional[int] = None):
+        self.github = github
+        self.groq_ai = groq_ai
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or config.max_workers,
+            thread_name_prefix="repohunter-prefetch"
+        )
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._readmes: dict[str, Future] = {}
+        self._installs: dict[str, Future] = {}
+    
+    def reset(self):
+        """Cancel pending work and forget all prefetched results."""
+        with self._lock:
+            self._generation += 1
+            for future in list(self._readmes.values()) + list(self._installs.values()):
+                future.cancel()
+            self._readmes.clear()
+            self._installs.clear()
+    
+    def shutdown(self):
+        """Stop the worker pool without waiting for running tasks."""
+        self.reset()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _fetch_readme(self, full_name: str) -> Optional[str]:
+        """Fetch a README by owner/repo name."""
+        if "/" not in full_name:
+            return None
+        owner, name = full_name.split("/", 1)
+        return self.github.get_readme(owner, name)
+    
+    def _readme_future(self, full_name: str) -> Future:
+        """Get or schedule the README fetch for a repository (caller holds the lock)."""
+        future = self._readmes.get(full_name)
+        if future is None:
+            future = self.executor.submit(self._fetch_readme, full_name)
+            self._readmes[full_name] = future
+        return future
+    
+    def seed_readmes(self, readmes: dict):
+        """
+        Register READMEs that were already fetched (e.g. by a GraphQL bulk query).
+        
+        Args:
+            readmes: dict of owner/repo name -> README content
+        """
+        with self._lock:
+            for full_name, content in readmes.items():
+                if content is None or full_name in self._readmes:
+                    continue
+                future = Future()
+                future.set_result(content)
+                self._readmes[full_name] = future
+    
+    def prefetch_readmes(self, full_names: list[str]):
+        """
+        Start fetching READMEs in the background.
+        
+        Args:
+            full_names: owner/repo names, most likely to be installed first
+        """
+        with self._lock:
+            for full_name in full_names[:config.prefetch_readmes]:
+                self._readme_future(full_name)
+    
+    def readme(self, full_name: str) -> Optional[str]:
+        """
+        Get a README, waiting on a prefetch if one is in flight.
+        
+        Args:
+            full_name: owner/repo name
+            
+        Returns:
+            README content or None
+        """
+        with self._lock:
+            future = self._readmes.get(full_name)
+        if future is not None and not future.cancelled():
+            try:
+                return future.result()
+            except Exception:
+                pass
+        return self._fetch_readme(full_name)
+    
+    def _generate_install(self, generation: int, full_name: str, language: str) -> Optional[list]:
+        """Generate install steps unless the query changed in the meantime."""
+        readme = self.readme(full_name)
+        if generation != self._generation:
+            return None
+        return self.groq_ai.get_install_steps(full_name, language, readme)
+    
+    def speculate_installs(self, ranked_repos: list[dict]):
+        """
+        Start generating install steps for the top ranked repositories.
+        
+        Args:
+            ranked_repos: Ranked entries as returned by rank_repositories
+        """
+        with self._lock:
+            generation = self._generation
+            for repo in ranked_repos[:config.speculative_installs]:
+                full_name = repo.get("name", "")
+                if not full_name or full_name in self._installs:
+                    continue
+                self._readme_future(full_name)
+                self._installs[full_name] = self.executor.submit(
+                    self._generate_install, generation, full_name, repo.get("language", "Unknown")
+                )
+    
+    def install_steps(self, full_name: str, language: str) -> list:
+        """
+        Get install steps, reusing speculative work when available.
+        
+        Args:
+            full_name: owner/repo name
+            language: Primary language
+            
+        Returns:
+            List of installation command strings
+        """
+        with self._lock:
+            future = self._installs.get(full_name)
+        if future is not None and not future.cancelled():
+            try:
+                steps = future.result()
+                if steps is not None:
+                    return steps
+            except Exception:
+                pass
+        return self.groq_ai.get_install_steps(full_name, language, self.readme(full_name))
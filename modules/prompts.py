@@ -0,0 +1,262 @@
+"""
+RepoHunter - Prompt Builder
+Token counting, README cleanup and budget-aware encoding of AI prompt inputs.
+"""
+
+import math
+import re
+
+from .models import Repo
+
+# Headings of README sections that explain how to install or run a tool
+INSTALL_HEADING_RE = re.compile(
+    r"\b(install|setup|set up|getting started|quick ?start|usage|build|requirement|dependenc|compil|run)",
+    re.IGNORECASE
+)
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_HTML_TAG_RE = re.compile(r"</?[a-zA-Z][^>]*>")
+# [![alt](image)](link) badges, then plain ![alt](image) images
+_BADGE_RE = re.compile(r"\[!\[[^\]]*\]\([^)]*\)\]\([^)]*\)")
+_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+# [text](url) -> text
+_LINK_RE = re.compile(r"\[([^\]]+)\]\([^)]*\)")
+_REFERENCE_RE = re.compile(r"^\s*\[[^\]]+\]:\s*\S+.*$", re.MULTILINE)
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_UNDERLINE_RE = re.compile(r"\s*(=+|-{3,})\s*")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+    
+    Counts words and punctuation marks, with long words split into
+    4-character pieces the way BPE tokenizers do. Close enough to the
+    Llama and GPT tokenizers (usually within 15%) for budgeting.
+    
+    Args:
+        text: Any text
+        
+    Returns:
+        Estimated token count
+    """
+    return sum(math.ceil(len(piece) / 4) for piece in _TOKEN_RE.findall(text or ""))
+
+
+def fit_tokens(text: str, budget: int) -> str:
+    """
+    Cut text to a token budget at a line (or, failing that, word) boundary.
+    
+    Args:
+        text: Text to cut
+        budget: Maximum tokens
+        
+    Returns:
+        The longest prefix within the budget
+    """
+    if count_tokens(text) <= budget:
+        return text
+    kept, used = [], 0
+    for line in text.split("\n"):
+        cost = count_tokens(line) + 1
+        if used + cost > budget:
+            if not kept:
+                # A single huge line: keep its first words
+                words = []
+                for word in line.split():
+                    used += count_tokens(word)
+                    if used > budget:
+                        break
+                    words.append(word)
+                kept.append(" ".join(words))
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept).rstrip()
+
+
+def clean_readme(text: str) -> str:
+    """
+    Strip the parts of a README that cost tokens but carry no meaning:
+    HTML comments and tags, badges, images, link targets, reference-style
+    link definitions and runs of blank lines. Code blocks are kept as is.
+    
+    Args:
+        text: Raw README markdown
+        
+    Returns:
+        Cleaned markdown
+    """
+    if not text:
+        return ""
+    text = _HTML_COMMENT_RE.sub("", text)
+    text = _BADGE_RE.sub("", text)
+    text = _IMAGE_RE.sub("", text)
+    text = _LINK_RE.sub(r"\1", text)
+    text = _REFERENCE_RE.sub("", text)
+    text = _HTML_TAG_RE.sub("", text)
+    
+    lines = []
+    for line in text.split("\n"):
+        line = line.rstrip()
+        # Lines left with only separators (badge rows, "| |" table debris),
+        # except code fences and setext heading underlines
+        if (line and not re.search(r"\w", line) and not line.lstrip().startswith("```")
+                and not (lines and lines[-1] and _UNDERLINE_RE.fullmatch(line))):
+            continue
+        if not line and lines and not lines[-1]:
+            continue
+        lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def split_sections(markdown: str) -> list[tuple[str, str]]:
+    """
+    Split markdown into (heading, body) sections.
+    
+    ATX headings (``## Install``) and setext headings (a line underlined
+    with === or ---) start a section; text before the first heading gets an
+    empty heading. Lines inside code fences are never treated as headings.
+    
+    Args:
+        markdown: Markdown text
+        
+    Returns:
+        List of (heading, body) pairs in document order
+    """
+    sections = []
+    heading, body = "", []
+    in_fence = False
+    lines = markdown.split("\n")
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        elif not in_fence:
+            title = None
+            match = _HEADING_RE.match(line)
+            if match:
+                title = match.group(2)
+            elif (line.strip() and i + 1 < len(lines)
+                  and _UNDERLINE_RE.fullmatch(lines[i + 1])):
+                title = line.strip()
+                i += 1
+            if title is not None:
+                sections.append((heading, "\n".join(body).strip()))
+                heading, body = title, []
+                i += 1
+                continue
+        body.append(line)
+        i += 1
+    sections.append((heading, "\n".join(body).strip()))
+    return [(title, text) for title, text in sections if title or text]
+
+
+def readme_excerpt(readme: str, budget: int) -> str:
+    """
+    Build the most useful README excerpt that fits a token budget.
+    
+    The cleaned README's install/usage sections come first (in document
+    order), then the introduction, then the remaining sections; each
+    section is included whole while it fits and the first one that
+    doesn't is cut to the remaining budget.
+    
+    Args:
+        readme: Raw README markdown
+        budget: Maximum tokens
+        
+    Returns:
+        Excerpt text ("" for an empty README)
+    """
+    sections = split_sections(clean_readme(readme))
+    if not sections:
+        return ""
+    
+    install = [section for section in sections if INSTALL_HEADING_RE.search(section[0])]
+    intro = [sections[0]] if sections[0] not in install else []
+    rest = [section for section in sections if section not in install and section not in intro]
+    
+    parts, used = [], 0
+    for title, body in install + intro + rest:
+        text = f"## {title}\n{body}" if title else body
+        cost = count_tokens(text) + 1
+        if used + cost > budget:
+            remaining = budget - used
+            if remaining > 20:
+                parts.append(fit_tokens(text, remaining))
+            break
+        parts.append(text)
+        used += cost
+    return "\n".join(parts)
+
+
+def _cell(value) -> str:
+    """Format a table cell (no separators or line breaks inside)."""
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        value = ",".join(str(item) for item in value)
+    return re.sub(r"\s+", " ", str(value).replace("|", "/")).strip()
+
+
+def candidate_table(repos: list[Repo], budget: int) -> str:
+    """
+    Encode ranking candidates as a compact pipe-separated table.
+    
+    One header line names the columns, then one row per repository, so
+    field names and JSON punctuation are paid for once instead of per
+    candidate. Descriptions get the longest common length that keeps the
+    table within the budget; if even short descriptions don't fit, the
+    lowest candidates are dropped (the input is ordered best first).
+    
+    Args:
+        repos: Candidate repositories
+        budget: Maximum tokens for the table
+        
+    Returns:
+        Table text
+    """
+    columns = ["index", "name", "stars", "language", "updated"]
+    optional = {
+        "license": lambda repo: repo.license,
+        "topics": lambda repo: repo.topics[:5],
+        "latest_release": lambda repo: repo.latest_release,
+        "commits_90d": lambda repo: repo.commits_recent
+    }
+    # Only spend a column on signals at least one candidate has
+    extra = [name for name, getter in optional.items() if any(getter(repo) not in (None, "", ()) for repo in repos)]
+    header = "|".join(columns + extra + ["description"])
+    
+    rows = []
+    for i, repo in enumerate(repos):
+        cells = [
+            i + 1, repo.full_name, repo.stars, repo.language or "Unknown", repo.updated
+        ] + [optional[name](repo) for name in extra]
+        rows.append(("|".join(_cell(cell) for cell in cells), _cell(repo.description)))
+    
+    def render(count: int, width: int) -> str:
+        lines = [header]
+        for prefix, description in rows[:count]:
+            if len(description) > width:
+                description = description[:width].rsplit(" ", 1)[0] + "…"
+            lines.append(f"{prefix}|{description}")
+        return "\n".join(lines)
+    
+    # Widest descriptions (up to 200 chars) that fit with every candidate...
+    low, high = 40, 200
+    if count_tokens(render(len(rows), low)) <= budget:
+        while low < high:
+            width = (low + high + 1) // 2
+            if count_tokens(render(len(rows), width)) <= budget:
+                low = width
+            else:
+                high = width - 1
+        return render(len(rows), low)
+    
+    # ...otherwise as many candidates as fit with short descriptions
+    count = len(rows)
+    while count > 1 and count_tokens(render(count, low)) > budget:
+        count -= 1
+    return render(count, low)
@@ -0,0 +1,207 @@
+"""
+RepoHunter - Local Ranking
+Cheap deterministic scoring of candidates before the AI sees them.
+"""
+
+import math
+import time
+from datetime import datetime
+from typing import Iterable, Optional
+
+from .models import Repo
+from .text import STOPWORDS, tokenize
+
+# Feature weights for score_repository()
+WEIGHTS = {
+    "stars": 1.0,       # per decade of stars
+    "forks": 1.5,       # fork/star ratio, capped
+    "recency": 2.0,     # decays with a 180-day half-life since last push
+    "issues": -1.0,     # open issues per star, capped
+    "language": 1.5,    # matches the profile language
+    "keywords": 3.0,    # share of query keywords found in name/description/topics
+    "matches": 0.75,    # each extra search variant that returned the repo
+    "archived": -3.0,
+    "fork": -1.5
+}
+
+RECENCY_HALF_LIFE_DAYS = 180
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    """Parse a GitHub ISO-8601 timestamp."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def query_keywords(profile: Optional[dict], query: str = "") -> set[str]:
+    """Collect the meaningful keywords of a query and its profile."""
+    profile = profile or {}
+    text = " ".join([query, profile.get("search_terms", "") or "", profile.get("domain", "") or ""])
+    return {token for token in tokenize(text) if token not in STOPWORDS and len(token) > 1}
+
+
+def score_repository(repo: Repo, profile: Optional[dict], keywords: set[str],
+                     now: Optional[float] = None) -> tuple[float, dict]:
+    """
+    Score one candidate from its search metadata.
+    
+    Args:
+        repo: Candidate repository
+        profile: Analyzed profile (for the language preference)
+        keywords: Output of query_keywords()
+        now: Reference time (defaults to the current time)
+        
+    Returns:
+        (score, per-feature contributions)
+    """
+    now = now or time.time()
+    stars = repo.stars
+    
+    features = {
+        "stars": math.log10(stars + 1),
+        "forks": min(repo.forks / (stars + 1), 0.5),
+        "issues": min(repo.open_issues / (stars + 1), 1.0),
+        "matches": max(repo.matched_queries - 1, 0),
+        "archived": 1.0 if repo.archived else 0.0,
+        "fork": 1.0 if repo.fork else 0.0
+    }
+    
+    pushed = _timestamp(repo.pushed_at)
+    age_days = (now - pushed) / 86400 if pushed else 10 * 365
+    features["recency"] = 0.5 ** (max(age_days, 0) / RECENCY_HALF_LIFE_DAYS)
+    
+    wanted = ((profile or {}).get("language") or "").lower()
+    language = (repo.language or "").lower()
+    features["language"] = 1.0 if wanted and language and wanted == language else 0.0
+    
+    if keywords:
+        text = " ".join([repo.full_name, repo.description, " ".join(repo.topics)])
+        found = set(tokenize(text.replace("/", " ").replace("_", " ")))
+        features["keywords"] = len(keywords & found) / len(keywords)
+    else:
+        features["keywords"] = 0.0
+    
+    contributions = {name: WEIGHTS[name] * value for name, value in features.items()}
+    return sum(contributions.values()), contributions
+
+
+def prerank(repos: list[Repo], profile: Optional[dict] = None, query: str = "",
+            top_k: Optional[int] = None) -> list[Repo]:
+    """
+    Order candidates by local score.
+    
+    Args:
+        repos: Merged candidates
+        profile: Analyzed profile
+        query: Original user query
+        top_k: Keep only the best K candidates
+        
+    Returns:
+        New list, best candidates first
+    """
+    keywords = query_keywords(profile, query)
+    now = time.time()
+    scored = sorted(
+        repos,
+        key=lambda repo: score_repository(repo, profile, keywords, now)[0],
+        reverse=True
+    )
+    return scored[:top_k] if top_k else scored
+
+
+def is_good_match(repo: Repo, contributions: dict) -> bool:
+    """Check if a scored candidate closely matches the query (and is usable)."""
+    return contributions["keywords"] >= WEIGHTS["keywords"] * 0.5 and not repo.archived
+
+
+def collect_candidates(repos: Iterable[Repo], profile: Optional[dict], query: str,
+                       enough: int) -> tuple[list[Repo], int]:
+    """
+    Take candidates from a (lazy) stream until enough of them are good.
+    
+    Scoring happens as items arrive, so a paginated search can stop as soon
+    as ``enough`` candidates closely match the query instead of paging to
+    the end.
+    
+    Args:
+        repos: Candidates, e.g. GitHubAPI.iter_search()
+        profile: Analyzed profile
+        query: Original user query
+        enough: Good matches (see is_good_match) to stop after
+        
+    Returns:
+        (candidates taken, number of good matches among them)
+    """
+    keywords = query_keywords(profile, query)
+    now = time.time()
+    taken, good = [], 0
+    iterator = iter(repos)
+    try:
+        for repo in iterator:
+            taken.append(repo)
+            if is_good_match(repo, score_repository(repo, profile, keywords, now)[1]):
+                good += 1
+                if good >= enough:
+                    break
+    finally:
+        # Stop a generator now rather than when it's garbage collected
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+    return taken, good
+
+
+def _explain(repo: Repo, contributions: dict) -> str:
+    """Turn the strongest score contributions into a short reason."""
+    reasons = []
+    if contributions["keywords"] >= WEIGHTS["keywords"] * 0.5:
+        reasons.append("closely matches your query")
+    if contributions["language"] > 0:
+        reasons.append(f"written in {repo.language}")
+    if contributions["recency"] >= WEIGHTS["recency"] * 0.5:
+        reasons.append("actively maintained")
+    if contributions["matches"] > 0:
+        reasons.append(f"found by {repo.matched_queries} searches")
+    if contributions["archived"] < 0:
+        reasons.append("archived")
+    if not reasons:
+        reasons.append(f"{repo.stars:,} stars")
+    return "Local score: " + ", ".join(reasons)
+
+
+def local_ranking(repos: list[Repo], profile: Optional[dict], query: str, limit: int = 5) -> dict:
+    """
+    Rank repositories without the AI.
+    
+    Args:
+        repos: Candidate repositories
+        profile: Analyzed profile
+        query: Original user query
+        limit: Number of entries to return
+        
+    Returns:
+        dict with ranked_repos, notes, recommendation (same shape as
+        GroqAI.rank_repositories)
+    """
+    keywords = query_keywords(profile, query)
+    now = time.time()
+    scored = sorted(
+        ((score_repository(repo, profile, keywords, now), repo) for repo in repos),
+        key=lambda item: item[0][0],
+        reverse=True
+    )
+    
+    ranked = [
+        repo.ranked(rank, why=_explain(repo, contributions))
+        for rank, ((score, contributions), repo) in enumerate(scored[:limit], 1)
+    ]
+    
+    return {
+        "ranked_repos": ranked,
+        "notes": ["Ranked locally (stars, activity, language and keyword match) without AI"],
+        "recommendation": "Start with #1 and check its README for fit." if ranked else ""
+    }
@@ -0,0 +1,130 @@
+"""
+RepoHunter - Search Planning
+Turns an analyzed profile into several GitHub search expressions.
+"""
+
+from datetime import date, timedelta
+
+from .config import config
+from .text import STOPWORDS, tokenize
+
+# GitHub topics that best match each analysis domain
+DOMAIN_TOPICS = {
+    "web": "web-security",
+    "osint": "osint",
+    "red team": "red-team",
+    "blue team": "blue-team",
+    "network": "network-security",
+    "mobile": "mobile-security",
+    "forensics": "forensics",
+    "malware": "malware-analysis",
+    "devops": "devops"
+}
+
+# How far back the freshness sub-query looks
+FRESHNESS_DAYS = 365
+
+# Language names recognized in a raw query ("go" only after in/using/with/written)
+LANGUAGE_WORDS = {
+    "python": "python", "golang": "go", "go": "go", "rust": "rust", "javascript": "javascript",
+    "js": "javascript", "node": "javascript", "node.js": "javascript", "typescript": "typescript",
+    "ruby": "ruby", "java": "java", "kotlin": "kotlin", "c": "c", "c++": "c++", "c#": "c#",
+    "powershell": "powershell", "bash": "shell", "php": "php", "swift": "swift"
+}
+_LANGUAGE_LEADS = {"in", "using", "with", "written"}
+
+# Words that pick the analysis domain of a raw query
+DOMAIN_WORDS = {
+    "osint": "osint", "recon": "osint", "web": "web", "xss": "web", "sqli": "web", "sql": "web",
+    "network": "network", "packet": "network", "wifi": "network", "mobile": "mobile",
+    "android": "mobile", "ios": "mobile", "forensics": "forensics", "memory": "forensics",
+    "malware": "malware", "reverse": "malware", "yara": "malware", "devops": "devops",
+    "kubernetes": "devops", "docker": "devops", "c2": "red team", "phishing": "red team",
+    "siem": "blue team", "detection": "blue team"
+}
+
+
+def build_search_queries(profile: dict, query: str) -> list[str]:
+    """
+    Build alternative GitHub search expressions for a profile.
+    
+    The primary query comes first, followed by the AI's alternative
+    phrasings and qualified variants (language:, topic:, pushed:>),
+    ordered so that a small fan-out still covers different angles.
+    
+    Args:
+        profile: Analyzed profile from analyze_query
+        query: Original user query (fallback search terms)
+        
+    Returns:
+        Deduplicated list of at most config.search_fanout queries
+    """
+    terms = (profile.get("search_terms") or query).strip()
+    alternatives = profile.get("alt_terms") or []
+    if not isinstance(alternatives, list):
+        alternatives = []
+    alternatives = [str(alt).strip() for alt in alternatives]
+    
+    # Most distinct variants first, so a small fan-out still diversifies
+    queries = [terms] + alternatives[:1]
+    
+    language = (profile.get("language") or "").lower()
+    if language and language not in ("multi", "unknown", "any"):
+        queries.append(f"{terms} language:{language}")
+    
+    topic = DOMAIN_TOPICS.get((profile.get("domain") or "").lower())
+    if topic:
+        keyword = terms.split()[0] if terms.split() else ""
+        queries.append(f"{keyword} topic:{topic}".strip())
+    
+    since = (date.today() - timedelta(days=FRESHNESS_DAYS)).isoformat()
+    queries.append(f"{terms} pushed:>{since}")
+    queries.extend(alternatives[1:2])
+    
+    unique = []
+    for item in queries:
+        if item and item not in unique:
+            unique.append(item)
+    
+    fanout = config.search_fanout if config.has_github_token else min(config.search_fanout, 2)
+    return unique[:max(1, fanout)]
+
+
+def heuristic_profile(query: str) -> dict:
+    """
+    Derive a profile from the raw query without an AI call.
+    
+    Used by the fused pipeline to retrieve candidates before the model
+    has seen the query: the keywords become the search terms, and a
+    language or domain is only set when the query names one.
+    
+    Args:
+        query: Original user query
+        
+    Returns:
+        Profile with the same keys as analyze_query()
+    """
+    tokens = tokenize(query)
+    language, domain, keywords = "multi", "general", []
+    for i, token in enumerate(tokens):
+        name = LANGUAGE_WORDS.get(token)
+        if name and (token != "go" or (i and tokens[i - 1] in _LANGUAGE_LEADS)):
+            language = name
+            continue
+        if domain == "general" and token in DOMAIN_WORDS:
+            domain = DOMAIN_WORDS[token]
+        if token not in STOPWORDS and token not in _LANGUAGE_LEADS and len(token) > 1 and token not in keywords:
+            keywords.append(token)
+    if "red team" in query.lower() or "blue team" in query.lower():
+        domain = "red team" if "red team" in query.lower() else "blue team"
+    
+    terms = " ".join(keywords[:5]) or query.strip()[:100]
+    return {
+        "domain": domain,
+        "tool_type": "cli",
+        "language": language,
+        "skill_tier": "intermediate",
+        "search_terms": terms,
+        "alt_terms": [" ".join(keywords[1:5])] if len(keywords) > 2 else [],
+        "query_summary": query.strip()[:100]
+    }
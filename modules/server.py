@@ -0,0 +1,267 @@
+"""
+RepoHunter - Service Mode
+Long-running HTTP/JSON API over the search pipeline, with request coalescing.
+"""
+
+import hmac
+import json
+import re
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from . import __version__
+from . import cache
+from .config import config
+from .github_api import github
+from .groq_ai import groq_ai
+from .metrics import tracer
+
+# Largest accepted request body (bytes)
+MAX_BODY = 16 * 1024
+# Longest accepted query (characters), as in the REPL history
+MAX_QUERY = 500
+
+_REPO_RE = re.compile(r"[\w.-]+/[\w.-]+")
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: while a call for a key is in
+    flight, later callers wait for its result instead of starting their
+    own. Nothing is kept once the call finishes - lasting reuse is the
+    job of the caches behind the pipeline.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+        self.stats = {"calls": 0, "shared": 0}
+    
+    def do(self, key: str, fn: Callable):
+        """
+        Run ``fn()`` once per key at a time.
+        
+        Args:
+            key: Identity of the call
+            fn: Function producing the result
+            
+        Returns:
+            (result, shared) - shared is True if another caller's run was reused
+            
+        Raises:
+            Whatever ``fn`` raised, in every waiting caller
+        """
+        with self._lock:
+            self.stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+            else:
+                self.stats["shared"] += 1
+        if not leader:
+            return call.result(), True
+        
+        try:
+            result = fn()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return result, False
+    
+    def in_flight(self) -> int:
+        """Number of calls currently running."""
+        with self._lock:
+            return len(self._calls)
+
+
+def normalize_query(query: str) -> str:
+    """Coalescing key of a query: case and whitespace don't matter."""
+    return " ".join(query.lower().split())
+
+
+def jsonable_summary(summary: dict) -> dict:
+    """Tracer summary with the (task, model) token keys turned into records."""
+    return {
+        "spans": summary["spans"],
+        "tokens": [{"task": task, "model": model, **usage} for (task, model), usage in summary["tokens"].items()]
+    }
+
+
+class RepoHunterService:
+    """
+    The search pipeline shared by every client of one process: warm
+    connection pools, caches and rate-limit budgets, and one in-flight
+    computation per distinct query or install request.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+        self.searches = SingleFlight()
+        self.installs = SingleFlight()
+    
+    def search(self, query: str) -> dict:
+        """
+        Run (or join) the pipeline for a query.
+        
+        Args:
+            query: User's search query
+            
+        Returns:
+            hunt() record plus "coalesced"
+        """
+        record, shared = self.searches.do(normalize_query(query), lambda: self.app.hunt(query))
+        return {**record, "coalesced": shared}
+    
+    def install_steps(self, full_name: str, language: str) -> dict:
+        """
+        Generate (or join the generation of) install steps.
+        
+        Args:
+            full_name: owner/repo name
+            language: Primary language
+            
+        Returns:
+            dict with repo, steps and coalesced
+        """
+        def generate():
+            owner, name = full_name.split("/", 1)
+            return groq_ai.get_install_steps(full_name, language, github.get_readme(owner, name))
+        
+        steps, shared = self.installs.do(f"{full_name.lower()}|{language.lower()}", generate)
+        return {"repo": full_name, "steps": steps, "coalesced": shared}
+    
+    def stats(self) -> dict:
+        """Latency, cache, rate-limit and coalescing statistics of the service."""
+        return {
+            "version": __version__,
+            "trace": jsonable_summary(tracer.summary()),
+            "caches": cache.all_stats(),
+            "rate_limits": github.budget(),
+            "transport": github.http.stats(),
+            "coalescing": {
+                "search": {**self.searches.stats, "in_flight": self.searches.in_flight()},
+                "install": {**self.installs.stats, "in_flight": self.installs.in_flight()}
+            }
+        }
+    
+    def serve(self, port: Optional[int] = None, host: Optional[str] = None) -> ThreadingHTTPServer:
+        """
+        Create the HTTP server (call serve_forever() on it).
+        
+        Endpoints (GET with query parameters, or POST with a JSON body):
+            /search?q=QUERY
+            /install-steps?repo=OWNER/NAME&language=LANG
+            /stats (POST /stats/reset clears the latency statistics)
+            /metrics (Prometheus text format)
+            
+        With REPOHUNTER_SERVER_TOKEN set, every request needs an
+        ``Authorization: Bearer <token>`` header.
+        
+        Args:
+            port: TCP port (default: config.server_port)
+            host: Interface to bind (default: config.server_host, loopback)
+            
+        Returns:
+            The bound server
+        """
+        service = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            server_version = f"RepoHunter/{__version__}"
+            
+            def _send(self, status: int, payload, content_type: str = "application/json"):
+                if content_type == "application/json":
+                    body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+                else:
+                    body = payload.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def _params(self) -> Optional[dict]:
+                """Query parameters merged with a JSON object body (None if malformed)."""
+                params = {key: values[-1] for key, values in parse_qs(urlsplit(self.path).query).items()}
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                except ValueError:
+                    return None
+                if length:
+                    if length > MAX_BODY:
+                        return None
+                    try:
+                        body = json.loads(self.rfile.read(length))
+                    except ValueError:
+                        return None
+                    if not isinstance(body, dict):
+                        return None
+                    params.update({key: str(value) for key, value in body.items()})
+                return params
+            
+            def _authorized(self) -> bool:
+                if not config.server_token:
+                    return True
+                supplied = self.headers.get("Authorization", "")
+                return hmac.compare_digest(supplied.encode(), f"Bearer {config.server_token}".encode())
+            
+            def _handle(self, method: str):
+                path = urlsplit(self.path).path.rstrip("/")
+                if not self._authorized():
+                    self._send(401, {"error": "Missing or invalid token."})
+                    return
+                params = self._params()
+                if params is None:
+                    self._send(400, {"error": "Malformed request body."})
+                    return
+                
+                try:
+                    if path == "/search":
+                        query = (params.get("q") or params.get("query") or "").strip()
+                        if not query or len(query) > MAX_QUERY:
+                            self._send(400, {"error": f"Parameter q must be 1-{MAX_QUERY} characters."})
+                            return
+                        self._send(200, service.search(query))
+                    elif path == "/install-steps":
+                        repo = (params.get("repo") or "").strip()
+                        if not _REPO_RE.fullmatch(repo):
+                            self._send(400, {"error": "Parameter repo must be owner/name."})
+                            return
+                        language = (params.get("language") or "Unknown").strip()[:40]
+                        self._send(200, service.install_steps(repo, language))
+                    elif path == "/stats/reset" and method == "POST":
+                        tracer.reset()
+                        self._send(200, {"reset": True})
+                    elif path == "/stats":
+                        self._send(200, service.stats())
+                    elif path == "/metrics":
+                        self._send(200, tracer.prometheus(), "text/plain; version=0.0.4")
+                    else:
+                        self._send(404, {"error": "Not found."})
+                except Exception:
+                    # Security: Don't expose internal error details
+                    self._send(500, {"error": "Internal error. Please try again."})
+            
+            def do_GET(self):
+                self._handle("GET")
+            
+            def do_POST(self):
+                self._handle("POST")
+            
+            def log_message(self, format, *args):
+                pass
+        
+        server = ThreadingHTTPServer(
+            (host or config.server_host, port if port is not None else config.server_port), Handler
+        )
+        server.daemon_threads = True
+        return server
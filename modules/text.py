@@ -0,0 +1,62 @@
+"""
+RepoHunter - Text Utilities
+Query normalization and similarity helpers shared by caches and ranking.
+"""
+
+import re
+
+# Words that carry no search intent in tool queries
+STOPWORDS = frozenset("""
+a an and any are as at be best by can for from get good how i in into is it
+its me my need of on or some that the this to tool tools use using want what
+which with
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercase word tokens.
+    
+    Keeps characters that matter in tech names (c++, c#, node.js, red-team).
+    """
+    return [token.strip(".-") for token in _TOKEN_RE.findall(text.lower()) if token.strip(".-")]
+
+
+def _stem(token: str) -> str:
+    """Very light plural stripping (scanners -> scanner)."""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query so trivially different phrasings compare equal.
+    
+    Lowercases, drops punctuation and stopwords, strips plurals and sorts
+    the remaining unique tokens: "OSINT tool for Telegram" and
+    "osint telegram tools" both become "osint telegram".
+    """
+    tokens = {_stem(token) for token in tokenize(query) if token not in STOPWORDS}
+    return " ".join(sorted(tokens))
+
+
+def shingles(text: str, size: int = 3) -> set[str]:
+    """Character n-grams of each word, padded so short words still count."""
+    result = set()
+    for word in text.split():
+        padded = f" {word} "
+        if len(padded) <= size:
+            result.add(padded)
+        for i in range(len(padded) - size + 1):
+            result.add(padded[i:i + size])
+    return result
+
+
+def jaccard(a: set, b: set) -> float:
+    """Jaccard similarity of two sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
@@ -0,0 +1,295 @@
+"""
+RepoHunter - HTTP Transport
+Pooled async HTTP client (httpx, HTTP/2 when available) with a sync bridge.
+"""
+
+import concurrent.futures
+import contextvars
+import importlib.util
+import json
+import threading
+from typing import Callable, Optional
+
+from .config import config
+from .lazy import lazy_import
+
+# Imported on first request, not at startup
+asyncio = lazy_import("asyncio")
+requests = lazy_import("requests")
+
+try:
+    httpx = lazy_import("httpx")
+except ImportError:  # Optional dependency - falls back to a pooled requests.Session
+    httpx = None
+
+
+class Response:
+    """
+    A fully read (or deliberately cut short) HTTP response.
+    
+    Mirrors the parts of requests.Response the API clients use, whichever
+    library sent the request. ``raise_for_status()`` raises
+    requests.exceptions.HTTPError so callers keep a single set of
+    exception types.
+    """
+    
+    def __init__(self, status_code: int, headers, content: bytes, url: str = "", truncated: bool = False):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+        # The body was longer than max_bytes (or not read at all)
+        self.truncated = truncated
+    
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+    
+    def json(self):
+        """
+        Decode the body as JSON.
+        
+        Raises:
+            requests.exceptions.JSONDecodeError (a RequestException, as with
+            requests' own responses) when the body isn't JSON
+        """
+        try:
+            return json.loads(self.content)
+        except ValueError as e:
+            doc, pos = (e.doc, e.pos) if isinstance(e, json.JSONDecodeError) else ("", 0)
+            raise requests.exceptions.JSONDecodeError(str(e), doc, pos) from e
+    
+    def raise_for_status(self):
+        """Raise requests.exceptions.HTTPError for 4xx/5xx statuses."""
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} error for {self.url}", response=self)
+    
+    def close(self):
+        """Nothing to release - the connection went back to the pool after reading."""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Transport:
+    """
+    Connection-pooled HTTP client running on a private event loop thread.
+    
+    With httpx installed, requests go through one httpx.AsyncClient: a
+    pool of at most ``pool_size`` connections kept alive between calls,
+    multiplexed over HTTP/2 when the ``h2`` package is available. Without
+    httpx, a requests.Session with an adapter sized to the same pool is
+    driven from worker threads, so the async API works either way.
+    
+    Coroutines (``request``) are meant to be awaited from code already
+    running on the loop; synchronous callers (the REPL, worker threads)
+    use ``run()`` and ``gather()``, which submit to the loop and block.
+    Transport errors are raised as requests.exceptions.Timeout /
+    ConnectionError in both modes.
+    """
+    
+    def __init__(self, pool_size: Optional[int] = None, http2: Optional[bool] = None,
+                 headers: Optional[dict] = None):
+        self.pool_size = pool_size or config.http_pool_size
+        want_http2 = config.http2 if http2 is None else http2
+        self.backend = "httpx" if httpx is not None and config.http_async else "requests"
+        self.http2 = bool(
+            want_http2 and self.backend == "httpx" and importlib.util.find_spec("h2") is not None
+        )
+        self.headers = dict(headers or {})
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client = None
+        self._session = None
+    
+    @property
+    def loop(self) -> "asyncio.AbstractEventLoop":
+        """The transport's event loop (started on first use)."""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(
+                        target=loop.run_forever, name="repohunter-http", daemon=True
+                    )
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+    
+    def _httpx_client(self):
+        """Create the pooled client (on the loop thread)."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                    keepalive_expiry=config.http_keepalive
+                ),
+                follow_redirects=True
+            )
+        return self._client
+    
+    def _requests_session(self) -> "requests.Session":
+        """Create the pooled fallback session."""
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                session.headers.update(self.headers)
+                adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+        return self._session
+    
+    async def request(self, method: str, url: str, params: Optional[dict] = None,
+                      headers: Optional[dict] = None, json: Optional[dict] = None,
+                      timeout: float = 10, max_bytes: Optional[int] = None,
+                      read_if: Optional[Callable[[int, dict], bool]] = None) -> Response:
+        """
+        Send a request and read its body.
+        
+        Args:
+            method: HTTP method
+            url: Full URL
+            params: Query parameters
+            headers: Extra request headers
+            json: JSON body
+            timeout: Seconds for connecting and for each read
+            max_bytes: Stop reading the body after this many bytes
+            read_if: Called with (status, headers) before the body is read;
+                returning False leaves it unread (the response is truncated)
+                
+        Returns:
+            The response (may be an error status)
+            
+        Raises:
+            requests.exceptions.Timeout or ConnectionError on transport errors
+        """
+        if self.backend == "requests":
+            return await asyncio.to_thread(
+                self._request_sync, method, url, params, headers, json, timeout, max_bytes, read_if
+            )
+        
+        client = self._httpx_client()
+        try:
+            async with client.stream(method, url, params=params, headers=headers, json=json,
+                                     timeout=timeout) as response:
+                if read_if is not None and not read_if(response.status_code, response.headers):
+                    return Response(response.status_code, response.headers, b"", url, truncated=True)
+                if max_bytes is None:
+                    return Response(response.status_code, response.headers, await response.aread(), url)
+                
+                chunks, size = [], 0
+                async for chunk in response.aiter_bytes():
+                    chunks.append(chunk[:max_bytes - size])
+                    size += len(chunks[-1])
+                    if size >= max_bytes:
+                        return Response(response.status_code, response.headers, b"".join(chunks), url,
+                                        truncated=True)
+                return Response(response.status_code, response.headers, b"".join(chunks), url)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+    
+    def _request_sync(self, method, url, params, headers, json, timeout, max_bytes, read_if) -> Response:
+        """The requests.Session version of request() (runs in a worker thread)."""
+        stream = max_bytes is not None or read_if is not None
+        response = self._requests_session().request(
+            method, url, params=params, headers=headers, json=json, timeout=timeout, stream=stream
+        )
+        with response:
+            if not stream:
+                return Response(response.status_code, response.headers, response.content, url)
+            if read_if is not None and not read_if(response.status_code, response.headers):
+                return Response(response.status_code, response.headers, b"", url, truncated=True)
+            
+            chunks, size = [], 0
+            for chunk in response.iter_content(chunk_size=16 * 1024):
+                if max_bytes is not None:
+                    chunk = chunk[:max_bytes - size]
+                chunks.append(chunk)
+                size += len(chunk)
+                if max_bytes is not None and size >= max_bytes:
+                    return Response(response.status_code, response.headers, b"".join(chunks), url,
+                                    truncated=True)
+            return Response(response.status_code, response.headers, b"".join(chunks), url)
+    
+    def submit(self, coro) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the transport loop.
+        
+        The coroutine runs in a copy of the caller's context, so spans it
+        opens nest under the caller's current span.
+        
+        Returns:
+            A concurrent.futures.Future with its result
+        """
+        loop = self.loop
+        context = contextvars.copy_context()
+        future = concurrent.futures.Future()
+        
+        def start():
+            if not future.set_running_or_notify_cancel():
+                coro.close()
+                return
+            # A task copies the context that is current when it is created
+            task = context.run(loop.create_task, coro)
+            
+            def done(task):
+                if task.cancelled():
+                    future.cancel()
+                elif task.exception() is not None:
+                    future.set_exception(task.exception())
+                else:
+                    future.set_result(task.result())
+            task.add_done_callback(done)
+        
+        loop.call_soon_threadsafe(start)
+        return future
+    
+    def run(self, coro):
+        """
+        Run a coroutine on the transport loop and wait for its result.
+        
+        Raises:
+            RuntimeError when called from the loop itself (await instead)
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("Transport.run() called from the event loop - await the coroutine instead")
+        return self.submit(coro).result()
+    
+    def gather(self, coros: list) -> list:
+        """Run coroutines concurrently on the transport loop and wait for all results."""
+        async def all_of():
+            return await asyncio.gather(*coros)
+        return self.run(all_of()) if coros else []
+    
+    def close(self):
+        """Close pooled connections (the loop thread keeps running for later calls)."""
+        if self._client is not None:
+            client, self._client = self._client, None
+            self.run(client.aclose())
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+    
+    def warm(self):
+        """Start the loop and create the pooled client ahead of the first request."""
+        if self.backend == "httpx":
+            async def create():
+                self._httpx_client()
+            self.run(create())
+        else:
+            self._requests_session()
+    
+    def stats(self) -> dict:
+        """Describe the transport configuration."""
+        return {"backend": self.backend, "http2": self.http2, "pool_size": self.pool_size}
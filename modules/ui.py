@@ -4,6 +4,7 @@ Professional CLI interface with box-drawing and colors.
 """
 
 import sys
+import time
 from colorama import Fore, Style, init
 
 # Initialize colorama for Windows compatibility
@@ -70,6 +71,14 @@ class UI:
         print(f"  - Language    : {UI.YELLOW}{language}{UI.RESET}")
         print(f"  - Skill Tier  : {UI.YELLOW}{skill_tier}{UI.RESET}")
     
+    @staticmethod
+    def subqueries(stats: list[dict]):
+        """Display per-query search stats."""
+        print(f"\n{UI.GREEN}▶ GitHub Searches:{UI.RESET}")
+        for entry in stats:
+            status = f"{UI.RED}{entry['error']}{UI.RESET}" if entry.get("error") else f"{entry['count']} results"
+            print(f"  - {entry['query']:<48} {status}  {UI.MAGENTA}{entry['ms']} ms{UI.RESET}")
+    
     @staticmethod
     def repository(rank: int, name: str, url: str, language: str, summary: str, why: str, 
                    stars: int = 0, forks: int = 0, updated: str = ""):
@@ -128,6 +137,172 @@ class UI:
         print()
         print(f"{UI.GREEN}✔ Installation guide ready.{UI.RESET}")
     
+    @staticmethod
+    def cache_stats(stats: list[dict]):
+        """Display cache counters."""
+        print(f"\n{UI.CYAN}Cache Statistics:{UI.RESET}")
+        for entry in stats:
+            if not entry["enabled"]:
+                print(f"  {entry['name']:<10} {UI.YELLOW}disabled{UI.RESET}")
+                continue
+            print(
+                f"  {entry['name']:<10} {entry['entries']:>5} entries  "
+                f"{entry['bytes'] / 1024:>8.1f} KB  "
+                f"hits {entry['hits']}  misses {entry['misses']}  "
+                f"revalidated {entry['revalidated']}  similar {entry.get('similar', 0)}  "
+                f"{UI.GREEN}hit rate {entry['hit_rate']:.0%}{UI.RESET}"
+            )
+    
+    @staticmethod
+    def rate_limits(budget: dict):
+        """Display the remaining GitHub API budget."""
+        print(f"\n{UI.CYAN}GitHub Rate Limits:{UI.RESET}")
+        for resource, bucket in budget.items():
+            if not bucket["limit"]:
+                continue
+            resets_in = max(int(bucket["reset"] - time.time()), 0)
+            color = UI.GREEN if bucket["remaining"] > bucket["limit"] * 0.2 else UI.YELLOW
+            print(f"  {resource:<8} {color}{bucket['remaining']:>6,} / {bucket['limit']:,}{UI.RESET}"
+                  f"  resets in {resets_in}s  ({bucket['tokens']} token(s))")
+    
+    @staticmethod
+    def trace_stats(summary: dict):
+        """Display per-stage and per-call latency, cache outcomes and token usage."""
+        spans = summary["spans"]
+        if not spans:
+            UI.warning("No timings yet. Run a search first.")
+            return
+        
+        stages = {name[6:]: stats for name, stats in spans.items() if name.startswith("stage.")}
+        if stages:
+            print(f"\n{UI.CYAN}Pipeline Stages:{UI.RESET}")
+            for stage, stats in stages.items():
+                print(f"  {stage:<14} p50 {stats['p50']:>8,.0f} ms   p95 {stats['p95']:>8,.0f} ms"
+                      f"   ({stats['count']} runs)")
+        
+        print(f"\n{UI.CYAN}Calls:{UI.RESET}")
+        for name, stats in spans.items():
+            if name.startswith("stage."):
+                continue
+            details = []
+            if stats["cache"]:
+                hits = stats["cache"].get("hit", 0) + stats["cache"].get("revalidated", 0)
+                details.append(f"cached {hits / stats['count']:.0%}")
+            failures = sum(count for status, count in stats["statuses"].items() if not status.startswith("2")
+                           and status != "304")
+            if failures:
+                details.append(f"{UI.YELLOW}{failures} non-2xx{UI.RESET}")
+            if stats["errors"]:
+                details.append(f"{UI.RED}{stats['errors']} errors{UI.RESET}")
+            print(f"  {name:<16} p50 {stats['p50']:>8,.0f} ms   p95 {stats['p95']:>8,.0f} ms   "
+                  f"{stats['count']:>4} calls  {stats['total_ms'] / 1000:>7,.1f} s total  {'  '.join(details)}")
+        
+        if summary["tokens"]:
+            print(f"\n{UI.CYAN}LLM Tokens:{UI.RESET}")
+            for (task, model), usage in summary["tokens"].items():
+                print(f"  {task:<8} {model:<28} {usage['prompt']:>9,} prompt  "
+                      f"{usage['completion']:>8,} completion  ({usage['calls']} calls)")
+    
+    @staticmethod
+    def coalescing_stats(stats: dict):
+        """Display how many service requests joined an in-flight computation."""
+        if not stats:
+            return
+        print(f"\n{UI.CYAN}Request Coalescing:{UI.RESET}")
+        for endpoint, counts in stats.items():
+            print(f"  {endpoint:<14} {counts['calls']:>5} requests  {counts['shared']:>5} shared  "
+                  f"{counts['in_flight']:>3} in flight")
+    
+    @staticmethod
+    def index_stats(stats: dict, vectors: dict):
+        """Display the local repository index size and sync times."""
+        print(f"\n{UI.CYAN}Local Index:{UI.RESET}")
+        if not stats["enabled"]:
+            print(f"  {UI.YELLOW}disabled{UI.RESET}")
+            return
+        print(f"  {stats['repos']:,} repositories ({stats['readmes']:,} with README)  "
+              f"{stats['bytes'] / 1024 / 1024:.1f} MB  {stats['path']}")
+        if vectors["enabled"]:
+            print(f"  {vectors['vectors']:,} semantic vectors ({vectors['dim']} dims)  "
+                  f"{vectors['bytes'] / 1024 / 1024:.1f} MB")
+        else:
+            print(f"  {UI.YELLOW}Semantic search off ({vectors['reason']}){UI.RESET}")
+        if not stats["syncs"]:
+            print(f"  {UI.YELLOW}Never refreshed - run 'index refresh'{UI.RESET}")
+        for topic, last_sync in stats["syncs"].items():
+            print(f"  {topic:<18} synced {last_sync}")
+    
+    @staticmethod
+    def index_topic(stats: dict):
+        """Display the outcome of crawling one topic."""
+        since = f"since {stats['since']}" if stats["since"] else "full crawl"
+        if stats["error"]:
+            print(f"  {UI.RED}✘{UI.RESET} {stats['topic']:<18} {since}  {UI.RED}{stats['error']}{UI.RESET}")
+        else:
+            print(f"  {UI.GREEN}✔{UI.RESET} {stats['topic']:<18} {since}  "
+                  f"{stats['fetched']} repos  {stats['ms']} ms")
+    
+    @staticmethod
+    def batch_result(record: dict, done: int, total: int):
+        """Display one finished batch query."""
+        elapsed = record.get("timings", {}).get("total", 0)
+        if "error" in record:
+            print(f"{UI.RED}✘{UI.RESET} [{done}/{total}] {record['query']}  {UI.RED}{record['error']}{UI.RESET}")
+        else:
+            found = len(record.get("ranked", {}).get("ranked_repos", []))
+            print(f"{UI.GREEN}✔{UI.RESET} [{done}/{total}] {record['query']}  "
+                  f"{found} ranked  {UI.MAGENTA}{elapsed:,.0f} ms{UI.RESET}")
+    
+    @staticmethod
+    def batch_summary(summary: dict):
+        """Display batch run totals and per-stage latency."""
+        print(f"\n{UI.CYAN}Batch Summary:{UI.RESET}")
+        print(f"  Queries     : {summary['total']} "
+              f"({summary['completed']} ok, {summary['failed']} failed, {summary['skipped']} resumed)")
+        print(f"  Wall time   : {summary['wall_seconds']} s")
+        for stage, latency in summary["stages"].items():
+            print(f"  {stage:<12}: p50 {latency['p50']:>8,.0f} ms   p95 {latency['p95']:>8,.0f} ms")
+    
+    @staticmethod
+    def watch_list(entries: list[dict]):
+        """Display the saved queries and when they last ran."""
+        print(f"\n{UI.CYAN}Watchlist:{UI.RESET}")
+        if not entries:
+            print(f'  {UI.YELLOW}Nothing watched yet - add a query with: watch add "<query>"{UI.RESET}')
+            return
+        for number, entry in enumerate(entries, 1):
+            last_run = f"last run {entry['last_run']}" if entry.get("last_run") else "never run"
+            ranked = len((entry.get("ranked") or {}).get("ranked_repos", []))
+            print(f"  {number}. {entry['query']:<40} {last_run}  {ranked} ranked  "
+                  f"{len(entry.get('pool') or [])} candidates")
+    
+    @staticmethod
+    def watch_result(result: dict):
+        """Display what changed in one watched query's ranking."""
+        elapsed = f"{UI.MAGENTA}{result['timings']['total']:,.0f} ms{UI.RESET}"
+        if "error" in result:
+            print(f"\n{UI.RED}✘{UI.RESET} {result['query']}  {UI.RED}{result['error']}{UI.RESET}  {elapsed}")
+            return
+        source = "full search" if result["first"] else f"{result['fetched']} pushed since last run"
+        ranking = "re-ranked" if result["reranked"] else "ranking unchanged (no AI call)"
+        print(f"\n{UI.GREEN}✔{UI.RESET} {UI.BRIGHT}{result['query']}{UI.RESET}  "
+              f"{source}, {result['added']} new candidates, {ranking}  {elapsed}")
+        
+        diff = result["diff"]
+        for entry in diff["new"]:
+            print(f"  {UI.GREEN}+ #{entry.get('rank', '?'):<3}{UI.RESET} {UI.CYAN}{entry.get('name', 'Unknown')}{UI.RESET}  "
+                  f"{UI.YELLOW}⭐ {entry.get('stars', 0):,}{UI.RESET}  {entry.get('summary', '')[:70]}")
+        for entry in diff["moved"]:
+            arrow = "↑" if entry.get("rank", 0) < (entry.get("previous_rank") or 0) else "↓"
+            print(f"  {UI.YELLOW}{arrow} #{entry.get('rank', '?'):<3}{UI.RESET} {entry.get('name', 'Unknown')}  "
+                  f"(was #{entry.get('previous_rank')})")
+        for entry in diff["dropped"]:
+            print(f"  {UI.RED}- {UI.RESET}    {entry.get('name', 'Unknown')}  (was #{entry.get('rank', '?')})")
+        if not (diff["new"] or diff["moved"] or diff["dropped"]):
+            print(f"  No changes ({diff['unchanged']} ranked)")
+        if not result.get("complete", True):
+            print(f"  {UI.YELLOW}Some searches failed or had too many results - the next run checks this window again{UI.RESET}")
+    
     @staticmethod
     def error(message: str):
         """Display error message."""
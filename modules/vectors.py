@@ -0,0 +1,317 @@
+"""
+RepoHunter - Semantic Vector Index
+Hashed TF-IDF embeddings of repository text with memory-mapped cosine search.
+"""
+
+import json
+import os
+import threading
+import zlib
+from typing import Optional
+
+from .config import config
+from .lazy import LazyObject, lazy_import
+from .text import STOPWORDS, _stem, shingles, tokenize
+
+try:
+    np = lazy_import("numpy")  # Imported when the index is first opened
+except ImportError:  # Optional dependency - semantic search is skipped without it
+    np = None
+
+
+class VectorIndex:
+    """
+    Dense vectors for every indexed repository, quantized to int8 and
+    memory-mapped from disk.
+    
+    Documents are encoded with the hashing trick (stemmed words plus
+    character trigrams, signed buckets, sublinear term frequency), so no
+    model or vocabulary is needed and encoding is stable across runs.
+    Stored vectors are plain normalized TF; IDF weights are applied to the
+    query only, which keeps ingestion incremental - new documents never
+    force existing rows to be re-encoded.
+    
+    The matrix is stored column-major in blocks of BLOCK_ROWS documents
+    (shape: blocks x dim x BLOCK_ROWS). A query touches only a few dozen
+    buckets, so scoring reads just those contiguous rows of each block
+    and does one small matrix-vector product per block.
+    """
+    
+    # Weight of a character trigram relative to a whole word
+    SHINGLE_WEIGHT = 0.3
+    
+    # Characters of name/description/topics/README text that go into a vector
+    DOCUMENT_CHARS = 1500
+    
+    # Documents per storage block (one matrix-vector product each)
+    BLOCK_ROWS = 16384
+    
+    # int8 scale: unit-vector components are stored as round(value * 127)
+    SCALE = 127.0
+    
+    def __init__(self, path: Optional[str] = None, dim: Optional[int] = None):
+        self.path = path or config.vector_dir
+        self.dim = dim or config.vector_dim
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._matrix = None
+        self._names: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._doc_freq = None
+        self._synced_at = 0.0
+        
+        if np is not None and config.vectors_enabled:
+            try:
+                self._load()
+            except (OSError, ValueError):
+                # Vectors are an optimization - search without them if unusable
+                self._matrix = None
+    
+    @property
+    def enabled(self) -> bool:
+        """Check if NumPy is installed and the store is usable."""
+        return self._matrix is not None
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+    
+    def _load(self):
+        """Open (or create) the on-disk store."""
+        os.makedirs(self.path, exist_ok=True)
+        meta = {}
+        if os.path.exists(self._file("meta.json")):
+            with open(self._file("meta.json"), encoding="utf-8") as handle:
+                meta = json.load(handle)
+        if meta.get("dim", self.dim) != self.dim:
+            # Dimension changed - start over rather than mix encodings
+            meta = {}
+            for name in ("vectors.i8", "names.txt"):
+                if os.path.exists(self._file(name)):
+                    os.remove(self._file(name))
+        
+        if os.path.exists(self._file("names.txt")):
+            with open(self._file("names.txt"), encoding="utf-8") as handle:
+                names = handle.read().splitlines()
+            self._names = names[:meta.get("count", 0)]
+            if len(names) > len(self._names):
+                # Names appended by a write that never committed its vectors
+                with open(self._file("names.txt"), "w", encoding="utf-8") as handle:
+                    handle.write("".join(name + "\n" for name in self._names))
+        self._rows = {name.lower(): row for row, name in enumerate(self._names)}
+        self._doc_freq = np.array(meta.get("doc_freq") or [0.0] * self.dim, dtype=np.float64)
+        self._synced_at = meta.get("synced_at", 0.0)
+        self._open_matrix(max(1, len(self._names)))
+    
+    @property
+    def capacity(self) -> int:
+        """Number of documents the mapped file can hold."""
+        return self._matrix.shape[0] * self.BLOCK_ROWS
+    
+    def _open_matrix(self, rows: int):
+        """Map the vector file, growing it by whole blocks to hold ``rows`` documents."""
+        path = self._file("vectors.i8")
+        block_bytes = self.dim * self.BLOCK_ROWS
+        needed = -(-rows // self.BLOCK_ROWS) * block_bytes
+        if not os.path.exists(path) or os.path.getsize(path) < needed:
+            with open(path, "ab") as handle:
+                handle.truncate(needed)
+        blocks = os.path.getsize(path) // block_bytes
+        self._matrix = np.memmap(path, dtype=np.int8, mode="r+", shape=(blocks, self.dim, self.BLOCK_ROWS))
+    
+    def _save_meta(self):
+        """Persist counters (after the vectors themselves are flushed)."""
+        self._matrix.flush()
+        meta = {
+            "dim": self.dim,
+            "count": len(self._names),
+            "doc_freq": self._doc_freq.tolist(),
+            "synced_at": self._synced_at
+        }
+        tmp_path = self._file("meta.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(meta, handle)
+        os.replace(tmp_path, self._file("meta.json"))
+    
+    def encode(self, text: str) -> "np.ndarray":
+        """
+        Encode text as a normalized hashed term-frequency vector.
+        
+        Args:
+            text: Repository text or query
+            
+        Returns:
+            float32 vector of length dim (all zeros for empty text)
+        """
+        words = [_stem(token) for token in tokenize(text) if token not in STOPWORDS]
+        features = [(word, 1.0) for word in words]
+        features += [(gram, self.SHINGLE_WEIGHT) for gram in shingles(" ".join(words))]
+        
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if not features:
+            return vector
+        hashes = np.fromiter(
+            (zlib.crc32(feature.encode("utf-8")) for feature, _ in features),
+            dtype=np.uint64, count=len(features)
+        )
+        weights = np.fromiter((weight for _, weight in features), dtype=np.float32, count=len(features))
+        # Top hash bit picks the sign so collisions cancel out on average
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(vector, (hashes % self.dim).astype(np.intp), weights * signs)
+        
+        vector = np.sign(vector) * np.log1p(np.abs(vector))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def add(self, documents: list[tuple[str, str]]) -> int:
+        """
+        Add or replace document vectors.
+        
+        Args:
+            documents: (full_name, text) pairs
+            
+        Returns:
+            Number of vectors written
+        """
+        if not self.enabled or not documents:
+            return 0
+        vectors = np.stack([self.encode(text) for _, text in documents])
+        return self.add_vectors([name for name, _ in documents], vectors)
+    
+    def add_vectors(self, full_names: list[str], vectors: "np.ndarray") -> int:
+        """
+        Store pre-encoded vectors (one row per name).
+        
+        Args:
+            full_names: owner/repo names
+            vectors: float array of shape (len(full_names), dim)
+            
+        Returns:
+            Number of vectors written
+        """
+        if not self.enabled or not full_names:
+            return 0
+        
+        # A name listed twice keeps its last vector
+        latest = {name.lower(): i for i, name in enumerate(full_names)}
+        if len(latest) < len(full_names):
+            keep = sorted(latest.values())
+            full_names = [full_names[i] for i in keep]
+            vectors = np.asarray(vectors)[keep]
+        
+        with self._lock:
+            new_names = []
+            rows = []
+            for full_name in full_names:
+                row = self._rows.get(full_name.lower())
+                if row is None:
+                    row = len(self._names) + len(new_names)
+                    self._rows[full_name.lower()] = row
+                    new_names.append(full_name)
+                else:
+                    # Replaced documents stop counting towards document frequency
+                    block, column = divmod(row, self.BLOCK_ROWS)
+                    self._doc_freq -= self._matrix[block, :, column] != 0
+                rows.append(row)
+            
+            total = len(self._names) + len(new_names)
+            if total > self.capacity:
+                self._matrix.flush()
+                self._open_matrix(total)
+            
+            quantized = np.clip(
+                np.rint(np.asarray(vectors, dtype=np.float32) * self.SCALE), -127, 127
+            ).astype(np.int8)
+            blocks, columns = np.divmod(np.asarray(rows, dtype=np.intp), self.BLOCK_ROWS)
+            self._matrix[blocks, :, columns] = quantized
+            self._doc_freq += (quantized != 0).sum(axis=0)
+            
+            if new_names:
+                with open(self._file("names.txt"), "a", encoding="utf-8") as handle:
+                    handle.write("".join(name + "\n" for name in new_names))
+                self._names.extend(new_names)
+            self._save_meta()
+        return len(rows)
+    
+    def sync(self, repo_index) -> int:
+        """
+        Encode repositories added or changed in the local index since the last sync.
+        
+        The cursor is the index's change sequence, advanced after each batch
+        of 500; one sync runs at a time, so reading the changes and moving
+        the cursor past them happen under the same lock.
+        
+        Args:
+            repo_index: RepoIndex to read documents from
+            
+        Returns:
+            Number of vectors written
+        """
+        if not self.enabled or not repo_index.enabled:
+            return 0
+        
+        written = 0
+        with self._sync_lock:
+            documents = repo_index.documents_since(self._synced_at)
+            for start in range(0, len(documents), 500):
+                batch = documents[start:start + 500]
+                written += self.add([(full_name, text[:self.DOCUMENT_CHARS]) for full_name, text, _ in batch])
+                with self._lock:
+                    self._synced_at = batch[-1][2]
+                    self._save_meta()
+        return written
+    
+    def search(self, text: str, k: int = 20) -> list[tuple[str, float]]:
+        """
+        Find the repositories most similar to a query.
+        
+        Args:
+            text: Free-text query (the user's own words work best)
+            k: Number of results
+            
+        Returns:
+            (full_name, cosine similarity) pairs with a positive score, best first
+        """
+        if not self.enabled or not self._names:
+            return []
+        
+        count = len(self._names)
+        idf = np.log((1.0 + count) / (1.0 + self._doc_freq)).astype(np.float32) + 1.0
+        query = self.encode(text) * idf
+        norm = np.linalg.norm(query)
+        if not norm:
+            return []
+        query /= norm * self.SCALE
+        
+        # Only the query's non-zero buckets contribute to the dot products
+        buckets = np.flatnonzero(query)
+        weights = query[buckets]
+        scores = np.empty(count, dtype=np.float32)
+        for block in range(-(-count // self.BLOCK_ROWS)):
+            start = block * self.BLOCK_ROWS
+            end = min(start + self.BLOCK_ROWS, count)
+            scores[start:end] = weights @ self._matrix[block, buckets, :end - start].astype(np.float32)
+        
+        k = min(k, count)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._names[row], float(scores[row])) for row in top if scores[row] > 0]
+    
+    def stats(self) -> dict:
+        """Get the number of vectors and the on-disk size."""
+        if not self.enabled:
+            return {"enabled": False, "reason": "numpy not installed" if np is None else "disabled"}
+        return {
+            "enabled": True,
+            "vectors": len(self._names),
+            "dim": self.dim,
+            "bytes": os.path.getsize(self._file("vectors.i8")),
+            "capacity": self.capacity,
+            "used_buckets": int((self._doc_freq > 0).sum())
+        }
+
+
+# Global instance (built on first use)
+vector_index = LazyObject(VectorIndex)
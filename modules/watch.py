@@ -0,0 +1,199 @@
+"""
+RepoHunter - Watchlists
+Saved queries re-run incrementally, reporting what changed since the last run.
+"""
+
+import calendar
+import json
+import os
+import re
+import threading
+import time
+from typing import Optional
+
+from .config import config
+from .lazy import LazyObject
+from .models import Repo
+from .text import normalize_query
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Candidates remembered per query (the best by local score)
+MAX_POOL = 100
+
+# GitHub's search index trails pushes by a few minutes: look back this far
+# before the previous run so nothing falls between two runs
+OVERLAP_SECONDS = 60 * 60
+
+_DATE_QUALIFIER_RE = re.compile(r"\s*\b(?:pushed|created):\S+", re.IGNORECASE)
+
+
+def delta_queries(queries: list[str], since: str) -> list[str]:
+    """
+    Restrict search expressions to repositories pushed after a point in time.
+    
+    A new repository's first push is its creation, so ``pushed:>`` also
+    finds repositories created since then. Date qualifiers already in a
+    query are replaced.
+    
+    Args:
+        queries: GitHub search expressions (see build_search_queries)
+        since: UTC timestamp (YYYY-MM-DDTHH:MM:SSZ)
+        
+    Returns:
+        Unique delta expressions, in order
+    """
+    unique = []
+    for query in queries:
+        delta = f"{_DATE_QUALIFIER_RE.sub('', query).strip()} pushed:>{since}".strip()
+        if delta not in unique:
+            unique.append(delta)
+    return unique
+
+
+def merge_pool(pool: list[Repo], changed: list[Repo]) -> tuple[list[Repo], int]:
+    """
+    Update a candidate pool with fresh records of changed repositories.
+    
+    Returns:
+        (merged pool, number of repositories that were not in it)
+    """
+    merged = {repo.full_name.lower(): repo for repo in pool}
+    added = 0
+    for repo in changed:
+        previous = merged.get(repo.full_name.lower())
+        if previous is None:
+            added += 1
+        else:
+            # A delta search only sees a few of the query's variants
+            repo.matched_queries = max(repo.matched_queries, previous.matched_queries)
+            repo.latest_release = repo.latest_release or previous.latest_release
+            if repo.commits_recent is None:
+                repo.commits_recent = previous.commits_recent
+        merged[repo.full_name.lower()] = repo
+    return list(merged.values()), added
+
+
+def diff_rankings(old: list[dict], new: list[dict]) -> dict:
+    """
+    Compare two ranked lists by repository name.
+    
+    Args:
+        old: Ranked entries of the previous run
+        new: Ranked entries of this run
+        
+    Returns:
+        dict with "new" and "moved" entries of this run (moved ones carry
+        "previous_rank"), "dropped" entries of the previous run and the
+        "unchanged" count
+    """
+    before = {str(entry.get("name", "")).lower(): entry for entry in old}
+    after = {str(entry.get("name", "")).lower() for entry in new}
+    diff = {"new": [], "moved": [], "dropped": [], "unchanged": 0}
+    for entry in new:
+        previous = before.get(str(entry.get("name", "")).lower())
+        if previous is None:
+            diff["new"].append(entry)
+        elif previous.get("rank") != entry.get("rank"):
+            diff["moved"].append({**entry, "previous_rank": previous.get("rank")})
+        else:
+            diff["unchanged"] += 1
+    diff["dropped"] = [entry for name, entry in before.items() if name not in after]
+    return diff
+
+
+def since_last_run(entry: dict) -> str:
+    """The ``pushed:>`` timestamp for an entry's next delta search."""
+    last_run = calendar.timegm(time.strptime(entry["last_run"], TIME_FORMAT))
+    return time.strftime(TIME_FORMAT, time.gmtime(last_run - OVERLAP_SECONDS))
+
+
+class Watchlist:
+    """
+    Saved queries and the state of their last run, in one JSON file.
+    
+    Each entry keeps the query, the profile its searches were built from,
+    the candidate pool, the names last sent to the ranker ("top") and the
+    ranking shown, so a later run can fetch only what changed and skip
+    the LLM when the ranker would see the same candidates.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or config.watch_path
+        self._lock = threading.Lock()
+        self.entries = self._load()
+    
+    def _load(self) -> list[dict]:
+        """Read the saved entries (a missing or unreadable file is an empty list)."""
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return []
+        entries = data.get("queries") if isinstance(data, dict) else None
+        if not isinstance(entries, list):
+            return []
+        return [entry for entry in entries if isinstance(entry, dict) and entry.get("query")]
+    
+    def save(self):
+        """Write every entry (atomically: a crash never leaves half a file)."""
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                json.dump({"version": 1, "queries": self.entries}, handle, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+    
+    def add(self, query: str) -> tuple[dict, bool]:
+        """
+        Save a query unless an equivalent one is already watched.
+        
+        Returns:
+            (entry, True if it was added)
+        """
+        query = query.strip()[:500]  # Security: same limit as search history
+        key = normalize_query(query)
+        for entry in self.entries:
+            if normalize_query(entry["query"]) == key:
+                return entry, False
+        entry = {
+            "query": query,
+            "added": time.strftime(TIME_FORMAT, time.gmtime()),
+            "last_run": None,
+            "profile": None,
+            "pool": [],
+            "top": [],
+            "ranked": None
+        }
+        self.entries.append(entry)
+        self.save()
+        return entry, True
+    
+    def remove(self, number: int) -> Optional[dict]:
+        """Stop watching entry ``number`` (1-based); returns it, or None if out of range."""
+        if not 1 <= number <= len(self.entries):
+            return None
+        entry = self.entries.pop(number - 1)
+        self.save()
+        return entry
+    
+    @staticmethod
+    def pool(entry: dict) -> list[Repo]:
+        """The entry's stored candidates as Repo records."""
+        return [repo for repo in map(Repo.from_api, entry.get("pool") or []) if repo is not None]
+    
+    def record_run(self, entry: dict, run_at: str, profile: dict, pool: list[Repo],
+                   top: list[str], ranked: dict):
+        """Store the outcome of a run and save."""
+        entry.update({
+            "last_run": run_at,
+            "profile": profile,
+            "pool": [repo.to_dict() for repo in pool[:MAX_POOL]],
+            "top": top,
+            "ranked": ranked
+        })
+        self.save()
+
+
+# Global instance (reads the file on first use)
+watchlist = LazyObject(Watchlist)
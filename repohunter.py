@@ -9,14 +9,27 @@ for cybersecurity and development use cases.
 
 import sys
 import re
+import time
 import argparse
 import subprocess
 
 from modules import __version__
+from modules import cache
+from modules.batch import BatchRunner, read_queries
+from modules.client import ServiceClient
 from modules.config import config
 from modules.ui import UI
 from modules.github_api import github
 from modules.groq_ai import groq_ai
+from modules.index import repo_index
+from modules.lazy import warm_up
+from modules.metrics import tracer
+from modules.models import ground_ranking
+from modules.vectors import vector_index
+from modules.prefetch import Prefetcher
+from modules.ranking import collect_candidates, local_ranking, prerank
+from modules.search import build_search_queries, heuristic_profile
+from modules.watch import MAX_POOL, TIME_FORMAT, delta_queries, diff_rankings, merge_pool, since_last_run, watchlist
 
 
 class RepoHunter:
@@ -24,11 +37,24 @@ class RepoHunter:
     
     VERSION = __version__
     
-    def __init__(self):
+    PIPELINES = ("two-call", "fused")
+    
+    def __init__(self, ai_rank: bool = True, remote: ServiceClient = None, pipeline: str = None):
+        self.ai_rank = ai_rank  # False: rank with the local scorer only
+        # "two-call": analyze, search, rank; "fused": search the raw query, then one AI call
+        self.pipeline = pipeline or config.pipeline
+        self.remote = remote  # Thin-client mode: searches run on a RepoHunter service
         self.last_results = []  # Store last search results for install command
         self.last_ranked = []   # Store ranked repos
         self.search_history = []  # Store search history (limited to 50)
+        self.last_timings = {}  # ms per stage of the last search/install
         self.MAX_HISTORY = 50  # Security: limit history size
+        self.prefetcher = Prefetcher(github, groq_ai)
+    
+    def warm_up(self):
+        """Build the API clients and local indexes on a background thread."""
+        if not self.remote:
+            warm_up([github, groq_ai, repo_index, vector_index])
     
     def validate_config(self) -> bool:
         """Validate required configuration."""
@@ -42,40 +68,460 @@ class RepoHunter:
             return False
         return True
     
+    def find_candidates(self, profile: dict, query: str) -> dict:
+        """
+        Find candidates in the local index, falling back to GitHub searches
+        with several query variants, and pre-rank the results.
+        
+        Args:
+            profile: Analyzed profile
+            query: Original user query
+            
+        Returns:
+            Search response with pre-ranked "items" (Repo records),
+            "subqueries" stats and "readmes" (from the bulk metadata fetch)
+        """
+        # The local indexes answer well-covered queries without touching GitHub
+        local = self._search_local(profile, query)
+        
+        if repo_index.enabled and local["matched"] >= config.index_min_results:
+            results = {"items": local["items"], "subqueries": local["subqueries"]}
+        else:
+            queries = build_search_queries(profile, query)
+            # A deep scan pages through the main variant in place of its first page
+            deep = self._search_deep(profile, query, queries[0]) if config.deep_search else None
+            results = github.search_many(queries[1:] if deep else queries, per_page=15)
+            if deep:
+                results = self._merge_items(results, deep["items"])
+                results["subqueries"].insert(0, deep["subquery"])
+                if deep["subquery"]["error"] and not results["items"]:
+                    results["error"] = deep["subquery"]["error"]
+            if repo_index.enabled:
+                results = self._merge_items(results, local["items"])
+                results["subqueries"][:0] = local["subqueries"]
+        repos = prerank(results.get("items", []), profile, query)
+        
+        # One GraphQL query adds release/activity data and READMEs for the
+        # candidates the AI will see (no-op without a GitHub token)
+        details = github.get_repositories_bulk([repo.full_name for repo in repos[:config.rank_top_k]])
+        results["readmes"] = {}
+        for repo in repos[:config.rank_top_k]:
+            extra = details.get(repo.full_name)
+            if extra:
+                repo.latest_release = extra.get("latest_release")
+                repo.commits_recent = extra.get("commits_recent")
+                results["readmes"][repo.full_name] = extra.get("readme")
+        for full_name, readme in local["readmes"].items():
+            results["readmes"].setdefault(full_name, readme)
+        
+        # Remember candidates so the next similar query can stay local
+        repo_index.upsert(repos, results["readmes"])
+        vector_index.sync(repo_index)
+        
+        results["items"] = repos
+        return results
+    
+    @staticmethod
+    def _search_local(profile: dict, query: str) -> dict:
+        """
+        Search the full-text index with the profile keywords and the vector
+        index with the user's own words.
+        
+        Returns:
+            dict with merged "items", "readmes", "subqueries" stats and
+            "matched" (keyword matches plus close semantic matches)
+        """
+        keyword = repo_index.search(profile.get("search_terms") or query)
+        subqueries = [{
+            "query": "local index",
+            "count": len(keyword["items"]),
+            "ms": round(keyword["ms"], 1),
+            "error": None
+        }]
+        items = keyword["items"]
+        readmes = keyword["readmes"]
+        strong = {repo.full_name for repo in items[:keyword["matched_all"]]}
+        
+        if vector_index.enabled:
+            started = time.perf_counter()
+            similar = vector_index.search(query)
+            known = {repo.full_name for repo in items}
+            extra = repo_index.get([name for name, _ in similar if name not in known])
+            items = items + extra["items"]
+            readmes = {**readmes, **extra["readmes"]}
+            strong.update(name for name, score in similar if score >= config.vector_min_score)
+            subqueries.append({
+                "query": "semantic index",
+                "count": len(similar),
+                "ms": round((time.perf_counter() - started) * 1000, 1),
+                "error": None
+            })
+        
+        return {"items": items, "readmes": readmes, "subqueries": subqueries, "matched": len(strong)}
+    
+    @staticmethod
+    def _search_deep(profile: dict, query: str, search_query: str) -> dict:
+        """
+        Page through a search until enough candidates closely match the query
+        (or config.deep_search results were seen).
+        
+        Returns:
+            dict with "items" (Repo records) and "subquery" stats
+        """
+        started = time.perf_counter()
+        pager = github.iter_search(search_query, max_results=config.deep_search)
+        items, good = collect_candidates(pager, profile, query, enough=config.rank_top_k)
+        return {
+            "items": items,
+            "subquery": {
+                "query": f"{search_query} (deep: {pager.pages} pages, {good} good)",
+                "count": len(items),
+                "ms": round((time.perf_counter() - started) * 1000),
+                "error": pager.error
+            }
+        }
+    
+    @staticmethod
+    def _search_changed(queries: list[str]) -> dict:
+        """
+        Page through each delta search until it runs out.
+        
+        Returns:
+            dict with merged "items" (Repo records, each with a
+            matched_queries count), per-query "subqueries" stats, "complete"
+            (False when a search failed or had more results than GitHub
+            serves) and "error" when every search failed
+        """
+        merged = {}
+        subqueries = []
+        errors = []
+        complete = True
+        for search_query in queries:
+            started = time.perf_counter()
+            pager = github.iter_search(search_query)
+            for repo in pager:
+                if repo.full_name in merged:
+                    merged[repo.full_name].matched_queries += 1
+                else:
+                    merged[repo.full_name] = repo
+            if pager.error:
+                errors.append(pager.error)
+            if pager.error or pager.incomplete_results or (pager.total_count or 0) > pager.max_results:
+                complete = False
+            subqueries.append({
+                "query": f"{search_query} ({pager.pages} pages)",
+                "count": pager.fetched,
+                "ms": round((time.perf_counter() - started) * 1000),
+                "error": pager.error
+            })
+        
+        response = {"items": list(merged.values()), "subqueries": subqueries, "complete": complete}
+        if errors and len(errors) == len(queries):
+            response["error"] = errors[0]
+        return response
+    
+    @staticmethod
+    def _merge_items(results: dict, extra_items: list) -> dict:
+        """Add hits from another source (local index, deep scan) to search results, counting as one more match."""
+        merged = {repo.full_name: repo for repo in results.get("items", [])}
+        for repo in extra_items:
+            if repo.full_name in merged:
+                merged[repo.full_name].matched_queries += 1
+            else:
+                merged[repo.full_name] = repo
+        response = {**results, "items": list(merged.values())}
+        # Extra hits are still usable when every live search failed
+        if "error" in response and response["items"]:
+            del response["error"]
+        return response
+    
+    @property
+    def fused(self) -> bool:
+        """Check if searches use the fused single-call pipeline."""
+        return self.pipeline == "fused" and self.ai_rank
+    
+    @property
+    def stage_prefix(self) -> str:
+        """Span name prefix for stage timings, so both pipelines can be compared in `stats`."""
+        return "stage.fused." if self.fused else "stage."
+    
+    def profile_query(self, query: str) -> dict:
+        """
+        Get the profile used to retrieve candidates: the AI analysis in the
+        two-call pipeline, a keyword heuristic in the fused one.
+        
+        Args:
+            query: User's search query
+            
+        Returns:
+            Profile dict (see GroqAI.analyze_query)
+        """
+        return heuristic_profile(query) if self.fused else groq_ai.analyze_query(query)
+    
+    def rank(self, query: str, profile: dict, repos: list) -> dict:
+        """
+        Rank candidates with AI (or locally), falling back to local ranking.
+        
+        Args:
+            query: Original user query
+            profile: Analyzed profile
+            repos: Pre-ranked candidates
+            
+        Returns:
+            dict with ranked_repos, notes, recommendation (and the AI
+            profile in the fused pipeline)
+        """
+        if not self.ai_rank:
+            return local_ranking(repos, profile, query)
+        
+        ranked = groq_ai.rank_repositories(query, profile, repos, fused=self.fused)
+        # An empty list is a valid "nothing fits" answer; failed calls and
+        # unparseable answers are already ranked locally by GroqAI
+        if "ranked_repos" in ranked:
+            return ranked
+        
+        ranked = local_ranking(repos, profile, query)
+        ranked["notes"] = ["AI ranking unavailable, ranked locally instead"]
+        return ranked
+    
+    def hunt(self, query: str) -> dict:
+        """
+        Run the full pipeline without any display (batch and API use).
+        
+        Safe to call from several threads: it doesn't touch history or
+        the interactive state.
+        
+        Args:
+            query: User's search query
+            
+        Returns:
+            dict with query, profile, subqueries, candidates, ranked,
+            timings (ms per stage) and error (if any)
+        """
+        timings = {}
+        result = {"query": query}
+        started = time.perf_counter()
+        
+        stage_start = time.perf_counter()
+        profile = self.profile_query(query)
+        if not self.fused:
+            timings["analyze"] = (time.perf_counter() - stage_start) * 1000
+        result["profile"] = profile
+        
+        stage_start = time.perf_counter()
+        results = self.find_candidates(profile, query)
+        timings["search"] = (time.perf_counter() - stage_start) * 1000
+        repos = results.get("items", [])
+        result["subqueries"] = results.get("subqueries", [])
+        result["candidates"] = [repo.full_name for repo in repos]
+        
+        if "error" in results:
+            result["error"] = results["error"]
+        elif repos:
+            stage_start = time.perf_counter()
+            ranked = self.rank(query, profile, repos)
+            timings["rank"] = (time.perf_counter() - stage_start) * 1000
+            # The fused call's own analysis replaces the heuristic profile
+            result["profile"] = ranked.get("profile") or profile
+            result["ranked"] = {key: value for key, value in ranked.items() if key != "profile"}
+        
+        timings["total"] = (time.perf_counter() - started) * 1000
+        tracer.record_stages(timings, self.stage_prefix)
+        result["timings"] = {stage: round(ms, 1) for stage, ms in timings.items()}
+        return result
+    
+    def refresh_watch(self, entry: dict) -> dict:
+        """
+        Re-run a watched query, fetching only what changed since its last run.
+        
+        The first run is a full candidate search. Later runs page through
+        the same query variants restricted to repositories pushed since the
+        previous run, merge them into the stored pool, and call the ranker
+        only when the candidates it would see have changed; otherwise the
+        stored ranking is kept, with fresh data for the repositories that
+        changed (unchanged ones keep what their last fetch returned). When a
+        variant fails or has more results than GitHub serves, the run time
+        is not advanced, so the next run covers this window again.
+        
+        Args:
+            entry: Watchlist entry (updated and saved unless the search fails)
+            
+        Returns:
+            dict with query, first, fetched (repos returned by the search),
+            added (new to the pool), complete (every search ran out),
+            reranked, ranked, diff, subqueries, timings and error (if any)
+        """
+        timings = {}
+        started = time.perf_counter()
+        run_at = time.strftime(TIME_FORMAT, time.gmtime())
+        query = entry["query"]
+        result = {"query": query, "first": not entry.get("last_run")}
+        
+        stage_start = time.perf_counter()
+        profile = entry.get("profile") or self.profile_query(query)
+        if result["first"]:
+            results = self.find_candidates(profile, query)
+            pool = results.get("items", [])
+            result["fetched"] = result["added"] = len(pool)
+        else:
+            queries = delta_queries(build_search_queries(profile, query), since_last_run(entry))
+            results = self._search_changed(queries)
+            changed = results.get("items", [])
+            pool, result["added"] = merge_pool(watchlist.pool(entry), changed)
+            result["fetched"] = len(changed)
+        timings["search"] = (time.perf_counter() - stage_start) * 1000
+        result["subqueries"] = results.get("subqueries", [])
+        result["complete"] = results.get("complete", True)
+        
+        if "error" in results:
+            # last_run stays put, so the next run covers this one's window
+            result["error"] = results["error"]
+            timings["total"] = (time.perf_counter() - started) * 1000
+            result["timings"] = {stage: round(ms, 1) for stage, ms in timings.items()}
+            return result
+        
+        pool = prerank(pool, profile, query)[:MAX_POOL]
+        top = [repo.full_name for repo in pool[:config.rank_top_k]]
+        if not result["first"]:
+            # Release/activity data for changed candidates the ranker sees
+            details = github.get_repositories_bulk([repo.full_name for repo in changed if repo.full_name in top])
+            for repo in changed:
+                extra = details.get(repo.full_name)
+                if extra:
+                    repo.latest_release = extra.get("latest_release")
+                    repo.commits_recent = extra.get("commits_recent")
+            repo_index.upsert(changed)
+            vector_index.sync(repo_index)
+        
+        previous = entry.get("ranked") or {}
+        stage_start = time.perf_counter()
+        result["reranked"] = not previous.get("ranked_repos") or set(top) != set(entry.get("top") or [])
+        if result["reranked"]:
+            ranked = self.rank(query, profile, pool) if pool else {"ranked_repos": []}
+            # The fused call's own analysis replaces the heuristic profile
+            profile = ranked.get("profile") or profile
+            ranked = {key: value for key, value in ranked.items() if key != "profile"}
+            timings["rank"] = (time.perf_counter() - stage_start) * 1000
+        else:
+            ranked = ground_ranking(previous, pool)
+        
+        result["ranked"] = ranked
+        result["diff"] = diff_rankings(previous.get("ranked_repos", []), ranked.get("ranked_repos", []))
+        # A partial delta keeps last_run put, so the next run covers this window again
+        watchlist.record_run(entry, run_at if result["complete"] else entry["last_run"],
+                             profile, pool, top, ranked)
+        
+        timings["total"] = (time.perf_counter() - started) * 1000
+        tracer.record_stages(timings, "stage.watch.")
+        result["timings"] = {stage: round(ms, 1) for stage, ms in timings.items()}
+        return result
+    
+    def watch(self, action: str = "list", target: str = ""):
+        """
+        Manage and run saved queries.
+        
+        Args:
+            action: "list", "add", "run" or "remove"
+            target: Query to add, or entry number to run/remove (run: all when empty)
+        """
+        if self.remote:
+            UI.warning("Watchlists run locally - start RepoHunter without --server to use them.")
+            return
+        target = (target or "").strip().strip('"').strip()
+        
+        if action == "add":
+            if not target:
+                UI.error('Usage: watch add "<query>"')
+                return
+            entry, added = watchlist.add(target)
+            if added:
+                UI.success(f"Watching \"{entry['query']}\" - run it with 'watch run'")
+            else:
+                UI.warning(f"Already watching \"{entry['query']}\"")
+            return
+        
+        if action in ("run", "remove") and target and not target.isdigit():
+            UI.error(f"Usage: watch {action} [N]" if action == "run" else "Usage: watch remove N")
+            return
+        
+        if action == "remove":
+            entry = watchlist.remove(int(target)) if target else None
+            if entry is None:
+                UI.error(f"Invalid watch number. Choose 1-{len(watchlist.entries)}" if watchlist.entries
+                         else "Nothing is watched yet.")
+            else:
+                UI.success(f"Stopped watching \"{entry['query']}\"")
+            return
+        
+        if action == "run":
+            entries = watchlist.entries
+            if target:
+                number = int(target)
+                if not 1 <= number <= len(entries):
+                    UI.error(f"Invalid watch number. Choose 1-{len(entries)}" if entries
+                             else "Nothing is watched yet.")
+                    return
+                entries = [entries[number - 1]]
+            if not entries:
+                UI.warning('Nothing is watched yet. Add a query with: watch add "<query>"')
+                return
+            for entry in entries:
+                UI.loading(f"Checking \"{entry['query']}\"")
+                result = self.refresh_watch(entry)
+                UI.clear_line()
+                UI.watch_result(result)
+            return
+        
+        UI.watch_list(watchlist.entries)
+    
     def search(self, query: str):
         """
         Execute a search query and display results.
         
+        Per-stage timings are kept in last_timings and recorded with the
+        tracer, including for searches that end early.
+        
         Args:
             query: User's search query
         """
+        self.last_timings = {}
+        try:
+            if self.remote:
+                self._search_remote(query)
+            else:
+                self._search(query)
+        finally:
+            tracer.record_stages(self.last_timings, self.stage_prefix)
+    
+    def _search(self, query: str):
+        """Run and display one search (see search())."""
         # Save to history (with size limit for memory safety)
         if len(self.search_history) >= self.MAX_HISTORY:
             self.search_history.pop(0)  # Remove oldest
         self.search_history.append(query[:500])  # Limit query length
         
-        # Step 1: Analyze query with AI
-        UI.loading("Analyzing query with AI")
-        profile = groq_ai.analyze_query(query)
-        UI.clear_line()
-        
-        # Display query summary
-        UI.query(profile.get("query_summary", query))
-        
-        # Display detected profile
-        UI.profile(
-            domain=profile.get("domain", "general"),
-            tool_type=profile.get("tool_type", "cli"),
-            language=profile.get("language", "multi"),
-            skill_tier=profile.get("skill_tier", "intermediate")
-        )
+        # Drop background work for the previous query
+        self.prefetcher.reset()
+        timings = self.last_timings
+        started = time.perf_counter()
         
-        # Step 2: Search GitHub
-        search_terms = profile.get("search_terms", query)
-        UI.loading(f"Searching GitHub for '{search_terms}'")
+        # Step 1: Analyze query with AI (the fused pipeline searches the raw
+        # query instead and gets the analysis from the ranking call)
+        if not self.fused:
+            UI.loading("Analyzing query with AI")
+        profile = self.profile_query(query)
+        if not self.fused:
+            UI.clear_line()
+            timings["analyze"] = (time.perf_counter() - started) * 1000
+            self._show_profile(profile, query)
         
-        results = github.search_repositories(search_terms, per_page=15)
+        # Step 2: Search GitHub with several query variants
+        UI.loading("Searching GitHub")
+        stage_start = time.perf_counter()
+        results = self.find_candidates(profile, query)
         UI.clear_line()
+        timings["search"] = (time.perf_counter() - stage_start) * 1000
+        UI.subqueries(results.get("subqueries", []))
         
         if "error" in results:
             UI.error(f"GitHub API error: {results['error']}")
@@ -88,44 +534,105 @@ class RepoHunter:
         
         self.last_results = repos
         
-        # Step 3: Rank with AI
-        UI.loading("AI ranking repositories by practical value")
-        ranked = groq_ai.rank_repositories(query, profile, repos)
+        # Fetch READMEs in the background while the AI ranks
+        self.prefetcher.seed_readmes(results.get("readmes", {}))
+        self.prefetcher.prefetch_readmes([repo.full_name for repo in repos])
+        
+        # Step 3: Rank with AI (or locally), showing entries as they arrive
+        stage_start = time.perf_counter()
+        ranked_repos = []
+        if self.ai_rank and config.stream_ranking:
+            UI.loading("AI ranking repositories by practical value")
+            ranked = {}
+            for kind, payload in groq_ai.rank_repositories_stream(query, profile, repos, fused=self.fused):
+                if kind == "profile":
+                    UI.clear_line()
+                    self._show_profile(payload, query)
+                    continue
+                if kind == "result":
+                    ranked = payload
+                    continue
+                if not ranked_repos:
+                    UI.clear_line()
+                    timings["first_result"] = (time.perf_counter() - started) * 1000
+                    UI.section("Top Matching Repositories", "🔥")
+                ranked_repos.append(payload)
+                self._show_repository(payload)
+            
+            if not ranked_repos:
+                UI.clear_line()
+            if "ranked_repos" not in ranked:
+                ranked = local_ranking(repos, profile, query)
+                ranked["notes"] = ["AI ranking unavailable, ranked locally instead"]
+        else:
+            if self.ai_rank:
+                UI.loading("AI ranking repositories by practical value")
+            ranked = self.rank(query, profile, repos)
+            UI.clear_line()
+            if self.fused:
+                self._show_profile(ranked.get("profile") or profile, query)
+        timings["rank"] = (time.perf_counter() - stage_start) * 1000
+        
+        # Step 4: Display results (unless they were already streamed)
+        if not ranked_repos:
+            ranked_repos = ranked.get("ranked_repos", [])
+            UI.section("Top Matching Repositories", "🔥")
+            for repo in ranked_repos:
+                self._show_repository(repo)
+            if not ranked_repos:
+                UI.warning("None of the candidates is a good match. Try different keywords.")
+        
+        self.last_ranked = ranked_repos
+        timings.setdefault("first_result", (time.perf_counter() - started) * 1000)
+        timings["total"] = (time.perf_counter() - started) * 1000
+        # Prepare install steps for the likely picks while the user reads
+        self.prefetcher.speculate_installs(ranked_repos)
+        self._show_footer(ranked)
+    
+    def _search_remote(self, query: str):
+        """Run one search on the RepoHunter service and display it (see search())."""
+        if len(self.search_history) >= self.MAX_HISTORY:
+            self.search_history.pop(0)
+        self.search_history.append(query[:500])
+        
+        UI.loading("Searching via RepoHunter service")
+        record = self.remote.search(query[:500])
         UI.clear_line()
+        self.last_timings.update(record.get("timings", {}))
         
-        # Step 4: Display results
-        UI.section("Top Matching Repositories", "🔥")
+        if record.get("profile"):
+            self._show_profile(record["profile"], query)
+        UI.subqueries(record.get("subqueries", []))
         
+        if "error" in record:
+            UI.error(f"Search failed: {record['error']}")
+            return
+        
+        ranked = record.get("ranked") or {}
         ranked_repos = ranked.get("ranked_repos", [])
         if not ranked_repos:
-            UI.warning("Could not rank repositories. Showing raw results.")
-            for i, repo in enumerate(repos[:5]):
-                UI.repository(
-                    rank=i + 1,
-                    name=repo.get("name", "Unknown"),
-                    url=repo.get("html_url", ""),
-                    language=repo.get("language", "Unknown"),
-                    summary=repo.get("description", "No description")[:100] if repo.get("description") else "No description",
-                    why="Shown by star count",
-                    stars=repo.get("stargazers_count", 0),
-                    forks=repo.get("forks_count", 0),
-                    updated=repo.get("updated_at", "")[:10] if repo.get("updated_at") else ""
-                )
-        else:
-            self.last_ranked = ranked_repos
-            for repo in ranked_repos:
-                UI.repository(
-                    rank=repo.get("rank", 0),
-                    name=repo.get("name", "Unknown"),
-                    url=repo.get("url", ""),
-                    language=repo.get("language", "Unknown"),
-                    summary=repo.get("summary", "No description"),
-                    why=repo.get("why", ""),
-                    stars=repo.get("stars", 0),
-                    forks=repo.get("forks", 0),
-                    updated=repo.get("updated", "")
-                )
+            UI.warning("No repositories found. Try different keywords.")
+            return
         
+        UI.section("Top Matching Repositories", "🔥")
+        for repo in ranked_repos:
+            self._show_repository(repo)
+        self.last_ranked = ranked_repos
+        self._show_footer(ranked)
+    
+    @staticmethod
+    def _show_profile(profile: dict, query: str):
+        """Display the query summary and detected profile."""
+        UI.query(profile.get("query_summary", query))
+        UI.profile(
+            domain=profile.get("domain", "general"),
+            tool_type=profile.get("tool_type", "cli"),
+            language=profile.get("language", "multi"),
+            skill_tier=profile.get("skill_tier", "intermediate")
+        )
+    
+    def _show_footer(self, ranked: dict):
+        """Display install options, notes and the recommendation of a ranking."""
         # Install options
         UI.section("Install Options", "📦")
         UI.install_options()
@@ -142,6 +649,20 @@ class RepoHunter:
             UI.section("Expert Recommendation", "✅")
             UI.recommendation(recommendation)
     
+    def _show_repository(self, repo: dict):
+        """Display one ranked repository entry."""
+        UI.repository(
+            rank=repo.get("rank", 0),
+            name=repo.get("name", "Unknown"),
+            url=repo.get("url", ""),
+            language=repo.get("language", "Unknown"),
+            summary=repo.get("summary", "No description"),
+            why=repo.get("why", ""),
+            stars=repo.get("stars", 0),
+            forks=repo.get("forks", 0),
+            updated=repo.get("updated", "")
+        )
+    
     def install(self, repo_number: int):
         """
         Show installation instructions for a repository.
@@ -162,17 +683,22 @@ class RepoHunter:
         repo_url = repo.get("url", "")
         language = repo.get("language", "Unknown")
         
-        # Try to get README for better install instructions
-        if "/" in repo_name:
-            owner, name = repo_name.split("/", 1)
-            readme = github.get_readme(owner, name)
-        else:
-            readme = None
-            name = repo_name
+        name = repo_name.split("/", 1)[1] if "/" in repo_name else repo_name
         
-        # Get AI-generated install steps
+        # Get AI-generated install steps (usually prepared in the background)
         UI.loading("Generating install instructions")
-        steps = groq_ai.get_install_steps(repo_name, language, readme)
+        started = time.perf_counter()
+        if self.remote:
+            answer = self.remote.install_steps(repo_name, language)
+            if "error" in answer:
+                UI.clear_line()
+                UI.error(answer["error"])
+                return
+            steps = answer.get("steps", [])
+        else:
+            steps = self.prefetcher.install_steps(repo_name, language)
+        self.last_timings["install"] = (time.perf_counter() - started) * 1000
+        tracer.record("stage.install", self.last_timings["install"])
         UI.clear_line()
         
         # Display
@@ -193,6 +719,103 @@ class RepoHunter:
         for i, query in enumerate(self.search_history[-10:], 1):  # Last 10
             print(f"  {i}. {query}")
     
+    def show_cache(self, clear: bool = False):
+        """Display cache statistics, optionally clearing every cache first."""
+        # Caches register when their client is built: build both so every cache is listed (and cleared)
+        github.resolve()
+        groq_ai.resolve()
+        if clear:
+            cache.clear_all()
+            UI.success("Cache cleared.")
+        UI.cache_stats(cache.all_stats())
+    
+    def show_stats(self, reset: bool = False):
+        """Display latency percentiles, cache outcomes and token usage for this session (or service)."""
+        if self.remote:
+            stats = self.remote.stats()
+            if "error" in stats:
+                UI.error(stats["error"])
+                return
+            UI.trace_stats(stats["trace"])
+            UI.coalescing_stats(stats.get("coalescing", {}))
+            if reset:
+                self.remote.reset_stats()
+                UI.success("Service statistics reset.")
+            return
+        UI.trace_stats(tracer.summary())
+        if reset:
+            tracer.reset()
+            UI.success("Statistics reset.")
+    
+    def serve(self, host: str, port: int) -> bool:
+        """
+        Serve the pipeline over HTTP until interrupted (see modules/server.py).
+        
+        Args:
+            host: Interface to bind
+            port: TCP port
+            
+        Returns:
+            True on a clean shutdown
+        """
+        from modules.server import RepoHunterService
+        
+        if not self.validate_config():
+            return False
+        self.warm_up()
+        try:
+            server = RepoHunterService(self).serve(port, host)
+        except OSError:
+            UI.error(f"Cannot listen on {host}:{port} (already in use?)")
+            return False
+        if host not in ("127.0.0.1", "localhost", "::1") and not config.server_token:
+            UI.warning("Listening beyond loopback without REPOHUNTER_SERVER_TOKEN - anyone can use your API keys.")
+        UI.success(f"RepoHunter service on http://{host}:{port} (/search, /install-steps, /stats)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n\n🐺 Service stopped.")
+        finally:
+            server.server_close()
+            self.prefetcher.shutdown()
+        return True
+    
+    def set_pipeline(self, pipeline: str = None):
+        """
+        Show or switch the search pipeline.
+        
+        Args:
+            pipeline: "two-call" or "fused" (None just shows the current one)
+        """
+        if pipeline:
+            pipeline = pipeline.lower()
+            if pipeline not in self.PIPELINES:
+                UI.error(f"Unknown mode. Choose {' or '.join(self.PIPELINES)}.")
+                return
+            self.pipeline = pipeline
+            UI.success(f"Pipeline: {pipeline}")
+        else:
+            print(f"\n{UI.CYAN}Pipeline:{UI.RESET} {self.pipeline}")
+        if self.pipeline == "fused" and not self.ai_rank:
+            UI.warning("Fused mode needs AI ranking - running two-call with local ranking.")
+        print("  Compare both with `stats`: fused stages are listed as fused.<stage>.")
+    
+    def update_index(self, pages: int = 3):
+        """
+        Crawl the domain topics into the local index (incremental after the first run).
+        
+        Args:
+            pages: Maximum result pages (of 100) per topic
+        """
+        if not repo_index.enabled:
+            UI.warning("Local index is disabled (REPOHUNTER_INDEX=0 or SQLite without FTS5).")
+            return
+        
+        print(f"\n{UI.CYAN}Refreshing local index:{UI.RESET}")
+        repo_index.refresh(github, pages=pages, on_topic=UI.index_topic)
+        vector_index.sync(repo_index)
+        UI.index_stats(repo_index.stats(), vector_index.stats())
+    
     def clear_screen(self):
         """Clear the terminal screen (secure implementation)."""
         # Security: Use subprocess instead of os.system to prevent command injection
@@ -204,17 +827,22 @@ class RepoHunter:
     
     def run(self):
         """Main application loop."""
+        # Clients are created while the header and config check are on screen
+        self.warm_up()
+        
         # Show header
         UI.header()
         
         # Show version
         print(f"{UI.CYAN}Version {self.VERSION}{UI.RESET}")
         
-        # Validate config
-        if not self.validate_config():
+        # Validate config (a thin client uses the service's keys)
+        if self.remote:
+            UI.success(f"Connected to RepoHunter service at {self.remote.base_url}")
+        elif not self.validate_config():
             return
-        
-        UI.success("Configuration OK - Ready to hunt!")
+        else:
+            UI.success("Configuration OK - Ready to hunt!")
         
         # Main loop
         while True:
@@ -246,6 +874,49 @@ class RepoHunter:
                     self.show_history()
                     continue
                 
+                # Check for cache command
+                if user_input.lower() in ["cache", "cache clear"]:
+                    self.show_cache(clear=user_input.lower() == "cache clear")
+                    continue
+                
+                # Check for index commands
+                if user_input.lower() in ["index", "index stats"]:
+                    UI.index_stats(repo_index.stats(), vector_index.stats())
+                    continue
+                if user_input.lower() == "index refresh":
+                    self.update_index()
+                    continue
+                
+                # Check for stats command
+                if user_input.lower() in ["stats", "stats reset"]:
+                    self.show_stats(reset=user_input.lower() == "stats reset")
+                    continue
+                
+                # Check for watchlist commands
+                watch_match = re.fullmatch(r"watch(?:\s+(list|add|run|remove)(?:\s+(.+))?)?",
+                                           user_input.strip(), re.IGNORECASE)
+                if watch_match:
+                    self.watch((watch_match.group(1) or "list").lower(), watch_match.group(2))
+                    continue
+                
+                # Check for pipeline mode command
+                mode_match = re.fullmatch(r"mode(?:\s+(\S+))?", user_input.strip(), re.IGNORECASE)
+                if mode_match:
+                    self.set_pipeline(mode_match.group(1))
+                    continue
+                
+                # Check for rate limit command
+                if user_input.lower() == "limits":
+                    if self.remote:
+                        stats = self.remote.stats()
+                        if "error" in stats:
+                            UI.error(stats["error"])
+                        else:
+                            UI.rate_limits(stats["rate_limits"])
+                    else:
+                        UI.rate_limits(github.budget())
+                    continue
+                
                 # Check for clear command
                 if user_input.lower() in ["clear", "cls"]:
                     self.clear_screen()
@@ -258,13 +929,51 @@ class RepoHunter:
                 
                 # Regular search
                 self.search(user_input)
-                
+            
             except KeyboardInterrupt:
                 print("\n\n🐺 Interrupted. Goodbye!")
                 break
             except Exception as e:
                 # Security: Don't expose internal error details
                 UI.error("An unexpected error occurred. Please try again.")
+        
+        self.prefetcher.shutdown()
+    
+    def run_batch(self, queries_path: str, out_path: str, concurrency: int) -> bool:
+        """
+        Run a file of queries non-interactively, streaming JSONL results.
+        
+        Args:
+            queries_path: Text file with one query per line
+            out_path: JSONL results file (also used to resume)
+            concurrency: Number of queries processed in parallel
+            
+        Returns:
+            True if every query succeeded
+        """
+        if not self.validate_config():
+            return False
+        
+        try:
+            queries = read_queries(queries_path)
+        except OSError:
+            UI.error(f"Cannot read queries file: {queries_path}")
+            return False
+        
+        runner = BatchRunner(self.hunt, out_path, concurrency)
+        print(f"{UI.CYAN}Running {len(queries)} queries with concurrency {runner.concurrency}{UI.RESET}")
+        try:
+            summary = runner.run(queries, on_result=UI.batch_result)
+        except OSError:
+            UI.error(f"Cannot write results file: {out_path}")
+            return False
+        finally:
+            self.prefetcher.shutdown()
+        
+        UI.batch_summary(summary)
+        UI.rate_limits(github.budget())
+        print(f"\nResults written to {out_path}")
+        return summary["failed"] == 0
     
     def show_help(self):
         """Display help information."""
@@ -273,6 +982,15 @@ class RepoHunter:
   <query>              Search for tools (e.g., "web vulnerability scanner")
   install -repo "N"    Install repository number N from last search
   history              Show search history
+  cache [clear]        Show cache statistics (or clear the cache)
+  limits               Show remaining GitHub API rate limits
+  stats [reset]        Show p50/p95 per stage and call, cache hits and tokens
+  mode [NAME]          Show or switch the pipeline: two-call or fused (one AI call)
+  index [refresh]      Show the local repository index (or crawl new repos)
+  watch [list]         Show saved queries
+  watch add "<query>"  Save a query to re-check later
+  watch run [N]        Re-run saved queries (all, or number N): new, dropped and moved repos
+  watch remove N       Stop watching query number N
   clear                Clear screen
   version              Show version
   help                 Show this help message
@@ -294,6 +1012,13 @@ def main():
         epilog="""
 Examples:
   python repohunter.py                    # Start interactive mode
+  python repohunter.py --no-ai-rank       # Rank results locally, no AI ranking call
+  python repohunter.py batch queries.txt --concurrency 4 --out results.jsonl
+  python repohunter.py index refresh      # Update the local repository index
+  python repohunter.py watch add "osint telegram"   # Save a query
+  python repohunter.py watch run          # What changed since the last run
+  python repohunter.py serve --port 8765  # Share one warm pipeline over HTTP
+  python repohunter.py --server http://127.0.0.1:8765   # REPL as a client of it
   python repohunter.py --version          # Show version
   python repohunter.py --help             # Show this help
 
@@ -306,9 +1031,95 @@ Powered by Groq Cloud (100% Free AI)
         version=f"🐺 RepoHunter v{__version__}"
     )
     
+    parser.add_argument(
+        "--no-ai-rank",
+        action="store_true",
+        help="rank results with the local scorer only (no AI ranking call)"
+    )
+    
+    parser.add_argument(
+        "--fused",
+        action="store_true",
+        help="fused pipeline: search the raw query, then analyze and rank in one AI call"
+    )
+    
+    parser.add_argument(
+        "--server",
+        default=config.server_url,
+        metavar="URL",
+        help="run the REPL as a thin client of a `serve` instance (default: $REPOHUNTER_SERVER_URL)"
+    )
+    
+    subparsers = parser.add_subparsers(dest="command")
+    batch = subparsers.add_parser(
+        "batch",
+        help="run a file of queries non-interactively (JSONL output, resumable)"
+    )
+    batch.add_argument("queries", help="text file with one query per line")
+    batch.add_argument(
+        "--concurrency", type=int, default=config.max_workers,
+        help=f"queries processed in parallel (default: {config.max_workers})"
+    )
+    batch.add_argument(
+        "--out", default="results.jsonl",
+        help="JSONL results file; existing results are skipped (default: results.jsonl)"
+    )
+    
+    index = subparsers.add_parser(
+        "index",
+        help="show or refresh the local repository index"
+    )
+    index.add_argument("action", nargs="?", choices=["stats", "refresh"], default="stats")
+    index.add_argument(
+        "--pages", type=int, default=3,
+        help="result pages of 100 repositories crawled per topic (default: 3)"
+    )
+    
+    watch = subparsers.add_parser(
+        "watch",
+        help="save queries and re-run them incrementally, showing what changed"
+    )
+    watch.add_argument("action", nargs="?", choices=["list", "add", "run", "remove"], default="list")
+    watch.add_argument("target", nargs="?", default="", help="query to add, or watch number to run/remove")
+    
+    serve = subparsers.add_parser(
+        "serve",
+        help="serve /search, /install-steps and /stats over HTTP with shared warm caches"
+    )
+    serve.add_argument("--host", default=config.server_host, help=f"interface (default: {config.server_host})")
+    serve.add_argument(
+        "--port", type=int, default=config.server_port,
+        help=f"TCP port (default: {config.server_port})"
+    )
+    
     args = parser.parse_args()
     
-    app = RepoHunter()
+    if config.metrics_port:
+        try:
+            tracer.serve(config.metrics_port, config.metrics_host)
+        except OSError:
+            UI.warning(f"Cannot serve metrics on port {config.metrics_port} (already in use?)")
+    
+    pipeline = "fused" if args.fused else None
+    if args.command == "serve":
+        sys.exit(0 if RepoHunter(ai_rank=not args.no_ai_rank, pipeline=pipeline).serve(args.host, args.port) else 1)
+    
+    remote = ServiceClient(args.server) if args.server and args.command is None else None
+    app = RepoHunter(ai_rank=not args.no_ai_rank, remote=remote, pipeline=pipeline)
+    if args.command == "batch":
+        sys.exit(0 if app.run_batch(args.queries, args.out, args.concurrency) else 1)
+    if args.command == "index":
+        if args.action == "refresh":
+            app.update_index(args.pages)
+        else:
+            UI.index_stats(repo_index.stats(), vector_index.stats())
+        return
+    if args.command == "watch":
+        if args.action == "run" and not app.validate_config():
+            sys.exit(1)
+        app.watch(args.action, args.target)
+        app.prefetcher.shutdown()
+        return
     app.run()
 
 